@@ -0,0 +1,6 @@
+"""
+Bulk evaluation engines for the worker eligibility rules.
+
+The scalar check_* functions in skeleton.py are the reference implementation;
+every engine in this package must give exactly the same answers.
+"""
@@ -0,0 +1,133 @@
+"""
+Vectorized NumPy evaluation of the full eligibility chain.
+
+One call takes column arrays for every worker input and returns a boolean
+mask per role, computed with the same predicates as the scalar functions:
+
+    basic     = safety_training and has_required_performance and has_safe_record
+    machine   = basic and certification and has_sufficient_training
+    supervisor= machine and first_aid and has_good_attendance
+    night     = basic and night_approved and is_qualified
+    trainer   = supervisor and has_trainer_qualification
+"""
+
+import numpy as np
+
+import skeleton
+
+# Input columns in the order the scalar chain consumes them
+COLUMNS = (
+    "safety_training", "safety_score", "experience", "incidents",
+    "certification", "training_score", "first_aid", "attendance",
+    "night_approved", "team_leader",
+)
+FLAG_COLUMNS = ("safety_training", "certification", "first_aid", "night_approved", "team_leader")
+# Upper bound per numeric column (None = unbounded), mirroring the scalar validation
+NUMERIC_LIMITS = {
+    "safety_score": 100,
+    "experience": None,
+    "incidents": None,
+    "training_score": 100,
+    "attendance": 100,
+}
+
+
+def _as_flag(name, values):
+    """Return values as a 1-D bool array or raise ValueError"""
+    arr = np.asarray(values)
+    if arr.dtype != np.bool_:
+        raise ValueError(f"{name} must be a boolean array")
+    return arr.reshape(-1)
+
+
+def _as_count(name, values, upper):
+    """Return values as a 1-D integer array within range or raise ValueError"""
+    arr = np.asarray(values)
+    if arr.dtype == np.bool_ or not np.issubdtype(arr.dtype, np.integer):
+        raise ValueError(f"{name} must be an integer array")
+    arr = arr.reshape(-1)
+    if arr.size and (arr.min() < 0 or (upper is not None and arr.max() > upper)):
+        raise ValueError(f"{name} out of range")
+    return arr
+
+
+def prepare_columns(columns, validate=True):
+    """Convert a mapping of column name -> sequence into validated 1-D arrays"""
+    missing = [name for name in COLUMNS if name not in columns]
+    if missing:
+        raise ValueError(f"missing columns: {', '.join(missing)}")
+
+    prepared = {}
+    for name in COLUMNS:
+        if not validate:
+            prepared[name] = np.asarray(columns[name]).reshape(-1)
+        elif name in FLAG_COLUMNS:
+            prepared[name] = _as_flag(name, columns[name])
+        else:
+            prepared[name] = _as_count(name, columns[name], NUMERIC_LIMITS[name])
+
+    lengths = {arr.shape[0] for arr in prepared.values()}
+    if len(lengths) > 1:
+        raise ValueError("all columns must have the same length")
+    return prepared
+
+
+def compute_predicates(cols):
+    """Return the intermediate predicates from the skeleton docstring as bool arrays"""
+    incidents = cols["incidents"]
+    team_leader = cols["team_leader"]
+    experience = cols["experience"]
+    return {
+        "has_required_performance": (cols["safety_score"] >= skeleton.MIN_SAFETY_SCORE)
+                                    | (experience >= skeleton.MIN_EXPERIENCE),
+        "has_safe_record": incidents <= skeleton.MAX_INCIDENTS,
+        "has_sufficient_training": cols["training_score"] >= skeleton.MIN_TRAINING_SCORE,
+        "has_good_attendance": cols["attendance"] >= skeleton.MIN_ATTENDANCE,
+        "is_qualified": team_leader | (experience >= skeleton.QUALIFYING_EXPERIENCE),
+        "has_trainer_qualification": (incidents == 0) | team_leader,
+    }
+
+
+def evaluate_columns(columns, validate=True, planner=None):
+    """Evaluate all five roles for a mapping of column arrays
+
+    Returns a dict keyed by skeleton.ROLES with one bool array per role.
+    planner is an optional eligibility.planner.AdaptiveEngine that orders
+    and filters the terms by observed selectivity; results are the same.
+    """
+    if planner is not None:
+        return planner.evaluate_columns(columns, validate)
+    cols = prepare_columns(columns, validate)
+    return combine_roles(cols, compute_predicates(cols))
+
+
+def combine_roles(cols, p):
+    """Return {role: bool array} from prepared columns and their compute_predicates"""
+    basic = cols["safety_training"] & p["has_required_performance"] & p["has_safe_record"]
+    machine = basic & cols["certification"] & p["has_sufficient_training"]
+    supervisor = machine & cols["first_aid"] & p["has_good_attendance"]
+    night = basic & cols["night_approved"] & p["is_qualified"]
+    trainer = supervisor & p["has_trainer_qualification"]
+
+    return dict(zip(skeleton.ROLES, (basic, machine, supervisor, night, trainer)))
+
+
+def evaluate_batch(safety_training, safety_score, experience, incidents, certification,
+                   training_score, first_aid, attendance, night_approved, team_leader,
+                   validate=True):
+    """Evaluate all five roles for column arrays given as arguments
+
+    Same answers as running check_basic_eligibility -> check_trainer per worker.
+    """
+    return evaluate_columns({
+        "safety_training": safety_training,
+        "safety_score": safety_score,
+        "experience": experience,
+        "incidents": incidents,
+        "certification": certification,
+        "training_score": training_score,
+        "first_aid": first_aid,
+        "attendance": attendance,
+        "night_approved": night_approved,
+        "team_leader": team_leader,
+    }, validate)
@@ -0,0 +1,268 @@
+"""
+Benchmark suite for the eligibility engines.
+
+    python -m eligibility.bench --sizes 1000,1000000 --modes scalar,batch \
+        --out results.json --baseline baseline.json --threshold 0.10
+
+Every run generates a synthetic roster, evaluates it in one mode and
+records ns/worker, the peak RSS of a child process that ran only that
+benchmark and the peak size of traced allocations (from a separate
+tracemalloc pass). Results are written as JSON and
+compared against a saved baseline: a run regresses when its ns/worker
+exceeds the baseline's by more than the threshold.
+
+Distributions:
+    uniform     every input uniform over its plausible range
+    skewed      realistic mix clustered around the thresholds
+    all_pass    every worker eligible for every role
+    all_fail    every worker fails basic eligibility
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import skeleton
+from eligibility import batch, classes, parallel, planner, stream, tables
+
+DISTRIBUTIONS = ("uniform", "skewed", "all_pass", "all_fail")
+MODES = ("scalar", "batch", "planner", "tables", "classes", "parallel")
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+DEFAULT_SCALAR_LIMIT = 200_000
+DEFAULT_THRESHOLD = 0.10
+
+
+def generate_roster(size, distribution="skewed", seed=0):
+    """Return a dict of column arrays in the smallest fitting dtypes"""
+    rng = np.random.default_rng(seed)
+    if distribution == "uniform":
+        cols = {
+            "safety_score": rng.integers(0, 101, size),
+            "experience": rng.integers(0, 31, size),
+            "incidents": rng.integers(0, 11, size),
+            "training_score": rng.integers(0, 101, size),
+            "attendance": rng.integers(0, 101, size),
+        }
+        cols.update({name: rng.random(size) < 0.5 for name in batch.FLAG_COLUMNS})
+    elif distribution == "skewed":
+        cols = {
+            "safety_training": rng.random(size) < 0.6,
+            "safety_score": np.clip(rng.normal(78, 10, size).round(), 0, 100),
+            "experience": np.minimum(rng.geometric(0.25, size) - 1, 40),
+            "incidents": np.minimum(rng.poisson(1.2, size), 20),
+            "certification": rng.random(size) < 0.7,
+            "training_score": np.clip(rng.normal(82, 8, size).round(), 0, 100),
+            "first_aid": rng.random(size) < 0.5,
+            "attendance": np.clip(rng.normal(91, 5, size).round(), 0, 100),
+            "night_approved": rng.random(size) < 0.4,
+            "team_leader": rng.random(size) < 0.1,
+        }
+    elif distribution == "all_pass":
+        cols = {name: np.ones(size, dtype=np.bool_) for name in batch.FLAG_COLUMNS}
+        cols.update(safety_score=np.full(size, 100), experience=np.full(size, 10), incidents=np.zeros(size),
+                    training_score=np.full(size, 100), attendance=np.full(size, 100))
+    elif distribution == "all_fail":
+        cols = {name: np.zeros(size, dtype=np.bool_) for name in batch.FLAG_COLUMNS}
+        cols.update(safety_score=np.zeros(size), experience=np.zeros(size), incidents=np.full(size, 10),
+                    training_score=np.zeros(size), attendance=np.zeros(size))
+    else:
+        raise ValueError(f"unknown distribution: {distribution}")
+
+    for name in batch.NUMERIC_LIMITS:
+        cols[name] = cols[name].astype(np.uint8)
+    return {name: cols[name] for name in batch.COLUMNS}
+
+
+def _rows(cols, limit):
+    """Worker tuples for the scalar chain, converted to Python bools/ints"""
+    lists = [cols[name][:limit].tolist() for name in stream.FIELDS]
+    return list(zip(*lists))
+
+
+def _runner(mode, cols, scalar_limit, workers):
+    """Return (callable, rows it evaluates)"""
+    size = len(cols["safety_training"])
+    if mode == "scalar":
+        rows = _rows(cols, min(size, scalar_limit))
+        return (lambda: [stream.run_chain(row) for row in rows]), len(rows)
+    if mode == "batch":
+        return (lambda: batch.evaluate_columns(cols)), size
+    if mode == "planner":
+        engine = planner.AdaptiveEngine()
+        return (lambda: batch.evaluate_columns(cols, planner=engine)), size
+    if mode == "tables":
+        return (lambda: tables.evaluate_role_masks(cols)), size
+    if mode == "classes":
+        return (lambda: classes.evaluate_role_masks(cols)), size
+    if mode == "parallel":
+        return (lambda: parallel.evaluate_columns_parallel(cols, workers)), size
+    raise ValueError(f"unknown mode: {mode}")
+
+
+def peak_rss_bytes():
+    """High-water RSS of this process so far (not of the last run alone)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_one(mode, distribution, size, repeat=3, scalar_limit=DEFAULT_SCALAR_LIMIT, workers=None, seed=0):
+    """Benchmark one (mode, distribution, size) combination and return a result dict
+
+    peak_rss_bytes is the high-water mark of the calling process; it only
+    describes this run when the process ran nothing bigger before, which is
+    why run_suite() gives every run a fresh process.
+    """
+    cols = generate_roster(size, distribution, seed)
+    run, measured = _runner(mode, cols, scalar_limit, workers)
+    run()  # warm-up
+
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter_ns()
+        run()
+        best = min(best, time.perf_counter_ns() - started)
+
+    tracemalloc.start()
+    try:
+        run()
+        _, traced_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "mode": mode,
+        "distribution": distribution,
+        "size": size,
+        "rows_measured": measured,
+        "best_ns": best,
+        "ns_per_worker": best / measured if measured else 0.0,
+        "peak_rss_bytes": peak_rss_bytes(),
+        "traced_peak_bytes": traced_peak,
+    }
+
+
+def check_options(modes, distributions):
+    """Raise ValueError for unknown modes or distributions"""
+    for kind, names, known in (("mode", modes, MODES), ("distribution", distributions, DISTRIBUTIONS)):
+        for name in names:
+            if name not in known:
+                raise ValueError(f"unknown {kind}: {name}")
+
+
+def run_suite(sizes=DEFAULT_SIZES, modes=MODES, distributions=DISTRIBUTIONS, isolate=True, **options):
+    """Run every combination; returns the JSON-ready report
+
+    With isolate (the default) each run happens in a fresh child process,
+    so its peak RSS is its own rather than the largest so far.
+    Without it peak_rss_bytes is None.
+    """
+    check_options(modes, distributions)
+    combinations = [(mode, distribution, size)
+                    for size in sizes for distribution in distributions for mode in modes]
+    if isolate:
+        results = []
+        for combination in combinations:
+            # One short-lived child per run: its high-water mark is its own
+            with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context()) as pool:
+                results.append(pool.submit(run_one, *combination, **options).result())
+    else:
+        results = [dict(run_one(*combination, **options), peak_rss_bytes=None) for combination in combinations]
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "cpu_count": os.cpu_count(),
+        "thresholds": dict(zip(("MIN_EXPERIENCE", "MIN_SAFETY_SCORE", "MAX_INCIDENTS",
+                                "MIN_TRAINING_SCORE", "MIN_ATTENDANCE"), skeleton.current_thresholds())),
+        "results": results,
+    }
+
+
+def _key(result):
+    return result["mode"], result["distribution"], result["size"]
+
+
+def compare(report, baseline, threshold=DEFAULT_THRESHOLD):
+    """Return a list of regressions: runs slower than baseline by more than threshold"""
+    previous = {_key(result): result for result in baseline.get("results", [])}
+    regressions = []
+    for result in report["results"]:
+        old = previous.get(_key(result))
+        if old is None or not old["ns_per_worker"]:
+            continue
+        ratio = result["ns_per_worker"] / old["ns_per_worker"]
+        if ratio > 1 + threshold:
+            regressions.append(dict(result, baseline_ns_per_worker=old["ns_per_worker"], ratio=ratio))
+    return regressions
+
+
+def format_report(report):
+    lines = [f"{'mode':<9} {'distribution':<12} {'size':>10} {'ns/worker':>11} {'peak RSS MiB':>13} "
+             f"{'traced peak MiB':>16}"]
+    for r in report["results"]:
+        rss = "-" if r["peak_rss_bytes"] is None else f"{r['peak_rss_bytes'] / 2**20:.1f}"
+        lines.append(f"{r['mode']:<9} {r['distribution']:<12} {r['size']:>10} {r['ns_per_worker']:>11.1f} "
+                     f"{rss:>13} {r['traced_peak_bytes'] / 2**20:>16.1f}")
+    return "\n".join(lines)
+
+
+def _csv_list(text, convert=str):
+    return [convert(item) for item in text.split(",") if item]
+
+
+def build_parser(parser=None):
+    parser = parser or argparse.ArgumentParser(description="Benchmark the eligibility engines")
+    parser.add_argument("--sizes", type=lambda s: _csv_list(s, int), default=list(DEFAULT_SIZES))
+    parser.add_argument("--modes", type=_csv_list, default=list(MODES))
+    parser.add_argument("--distributions", type=_csv_list, default=list(DISTRIBUTIONS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--scalar-limit", type=int, default=DEFAULT_SCALAR_LIMIT,
+                        help="rows actually timed in scalar mode")
+    parser.add_argument("--workers", type=int, help="processes for parallel mode")
+    parser.add_argument("--no-isolate", dest="isolate", action="store_false",
+                        help="run everything in this process (no per-run peak RSS)")
+    parser.add_argument("--out", help="write the JSON report here")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed ns/worker slowdown before a run counts as a regression")
+    return parser
+
+
+def run_from_args(args):
+    """Run the suite for parsed arguments; returns the process exit code"""
+    try:
+        check_options(args.modes, args.distributions)
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from None
+    report = run_suite(args.sizes, args.modes, args.distributions, args.isolate, repeat=args.repeat,
+                       scalar_limit=args.scalar_limit, workers=args.workers)
+    print(format_report(report))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r['mode']}/{r['distribution']}/{r['size']}: "
+                  f"{r['ns_per_worker']:.1f} ns vs {r['baseline_ns_per_worker']:.1f} ns "
+                  f"(x{r['ratio']:.2f})", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+def main(argv=None):
+    return run_from_args(build_parser().parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
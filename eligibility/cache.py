@@ -0,0 +1,90 @@
+"""
+Memoizing LRU cache in front of the full role chain.
+
+Many workers share the same inputs, so ProfileCache evaluates each distinct
+profile once (via skeleton.evaluate_worker) and serves repeats from a
+bounded LRU map keyed on the raw input tuple plus its value types (as in
+eligibility.dedup), so a hit costs one dict lookup and inputs are only
+validated on a miss. The cache empties itself whenever a threshold
+constant changes.
+
+    cache = ProfileCache(maxsize=100_000)
+    result = cache.evaluate(True, 80, 3, 0, True, 85, True, 95, False, True)
+    cache.stats()  # {"hits": ..., "misses": ..., ...}
+"""
+
+from collections import OrderedDict
+
+import skeleton
+from eligibility import stream
+from eligibility.dedup import profile_key
+
+DEFAULT_MAXSIZE = 1 << 16
+
+
+class ProfileCache:
+    """Bounded LRU memo of EligibilityResult per worker profile"""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, evaluate=None):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self._evaluate = evaluate or skeleton.evaluate_worker
+        self._entries = OrderedDict()
+        self._thresholds = skeleton.rule_constants()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def evaluate(self, *worker):
+        """Return the EligibilityResult for one worker (arguments in stream.FIELDS order)
+
+        Invalid inputs raise ValueError exactly like skeleton.evaluate_worker
+        and are never cached: the evaluate function (skeleton.evaluate_worker
+        by default) validates every miss, and since value types are part of
+        the key an invalid profile never matches a cached valid one.
+        """
+        thresholds = skeleton.rule_constants()
+        if thresholds != self._thresholds:
+            self.clear()
+            self._thresholds = thresholds
+            self.invalidations += 1
+
+        key = profile_key(worker)
+        entries = self._entries
+        result = entries.get(key)
+        if result is not None:
+            entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+        self.misses += 1
+        result = self._evaluate(*worker)
+        entries[key] = result
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+            self.evictions += 1
+        return result
+
+    def evaluate_record(self, record):
+        """Same as evaluate() for a mapping keyed by field name"""
+        return self.evaluate(*(record[name] for name in stream.FIELDS))
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
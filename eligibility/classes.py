@@ -0,0 +1,284 @@
+"""
+Equivalence classes of the check_* input space.
+
+The rules only ever compare a numeric input with a constant, so each
+numeric field splits into a few intervals, and every comparison gives the
+same answer anywhere inside one interval:
+
+    safety_score    [0, 75)  [75, 100]
+    experience      [0, 2)   [2, 5)   [5, ...)
+    incidents       {0}      [1, 3]   [4, ...)
+    training_score  [0, 80)  [80, 100]
+    attendance      [0, 90)  [90, 100]
+
+Together with the five flags this is 2 * 3 * 3 * 2 * 2 * 2**5 = 2304
+classes with the default constants. The cut points are derived from the
+rule file (eligibility/default_rules.json) and the live skeleton constants,
+not hard-coded.
+
+    python -m eligibility.classes            # enumerate and verify every class
+
+ClassSpace evaluates one representative per class through the scalar
+check_* chain, which gives a verdict map from class id to role mask. verify()
+re-runs the reference at every corner of every class, which proves the map
+is constant within each class, and then checks each engine against the map.
+classify() and evaluate_role_masks() then look up any worker, or a whole
+column batch, in O(1) per worker.
+"""
+
+import itertools
+import json
+import sys
+from bisect import bisect_right
+
+import skeleton
+from eligibility import rules, stream
+
+try:
+    import numpy as np
+except ImportError:  # classify() and verification of the reference are stdlib-only
+    np = None
+
+# Stand-in upper end for fields without a maximum when probing class corners;
+# small enough to stay inside the packed WorkerRoster ranges
+UNBOUNDED_SPAN = 200
+FLIPPED = {"ge": "le", "gt": "lt", "le": "ge", "lt": "gt", "eq": "eq"}
+
+
+def _constant(value):
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    return getattr(skeleton, value)
+
+
+def _comparisons(node):
+    """Yield (op, lhs, rhs) for every comparison in a rule condition"""
+    if isinstance(node, str):
+        return
+    (op, args), = node.items()
+    if op in ("all", "any"):
+        for arg in args:
+            yield from _comparisons(arg)
+    elif op == "not":
+        yield from _comparisons(args)
+    elif op in rules.COMPARISONS:
+        yield op, args[0], args[1]
+
+
+def cut_points(spec):
+    """Return {count field: sorted interval starts above 0} for a rule spec
+
+    A comparison "x op c" can only change its answer where x crosses c, so
+    the interval starts are c for >= and <, c + 1 for > and <=, and both for
+    ==. Fields compared with each other cannot be split this way and raise
+    RuleError.
+    """
+    fields = spec["fields"]
+    cuts = {name: set() for name, field in fields.items() if field["type"] == "count"}
+    for role in spec["roles"]:
+        for op, lhs, rhs in _comparisons(role["when"]):
+            if lhs not in cuts:
+                if rhs not in cuts:
+                    continue
+                op, lhs, rhs = FLIPPED[op], rhs, lhs
+            if rhs in fields:
+                raise rules.RuleError(f"cannot partition {lhs} compared with field {rhs}")
+            value = _constant(rhs)
+            starts = {"ge": (value,), "lt": (value,), "gt": (value + 1,), "le": (value + 1,),
+                      "eq": (value, value + 1)}[op]
+            upper = fields[lhs].get("max")
+            cuts[lhs].update(s for s in starts if 0 < s and (upper is None or s <= upper))
+    return {name: sorted(values) for name, values in cuts.items()}
+
+
+def _reference_mask(worker):
+    return sum(int(bit) for bit, verdict in zip(skeleton.ROLE_FLAGS.values(), stream.run_chain(worker))
+               if verdict == skeleton.ELIGIBLE)
+
+
+class ClassSpace:
+    """Enumeration of the equivalence classes plus their verdict map
+
+    A class id is a mixed-radix number with one digit per field in
+    stream.FIELDS order: the flag value, or the index of the interval a
+    count falls into.
+    """
+
+    def __init__(self, spec):
+        self.thresholds = skeleton.rule_constants()
+        cuts = cut_points(spec)
+        self.starts = {}
+        self.upper = {}
+        for name in stream.FIELDS:
+            if spec["fields"][name]["type"] == "flag":
+                self.starts[name] = [0, 1]
+                self.upper[name] = 1
+            else:
+                self.starts[name] = [0] + cuts[name]
+                self.upper[name] = spec["fields"][name].get("max")
+        self.radix = tuple(len(self.starts[name]) for name in stream.FIELDS)
+        self.strides = []
+        stride = 1
+        for radix in reversed(self.radix):
+            self.strides.insert(0, stride)
+            stride *= radix
+        self.size = stride
+        self._lookup = None
+        self.verdicts = bytes(_reference_mask(self.representative(i)) for i in range(self.size))
+
+    def digits(self, class_id):
+        return tuple((class_id // stride) % radix for stride, radix in zip(self.strides, self.radix))
+
+    def interval(self, name, digit):
+        """Return (low, high) of one field's interval; high is None when unbounded"""
+        starts = self.starts[name]
+        if digit + 1 < len(starts):
+            return starts[digit], starts[digit + 1] - 1
+        return starts[digit], self.upper[name]
+
+    def _value(self, name, value):
+        return bool(value) if name in stream.FLAG_FIELDS else value
+
+    def representative(self, class_id):
+        """Smallest worker in the class, as a tuple in stream.FIELDS order"""
+        return tuple(self._value(name, self.starts[name][digit])
+                     for name, digit in zip(stream.FIELDS, self.digits(class_id)))
+
+    def corners(self, class_id):
+        """Every worker at a corner of the class (each count at its interval's low or high end)"""
+        ends = []
+        for name, digit in zip(stream.FIELDS, self.digits(class_id)):
+            low, high = self.interval(name, digit)
+            if high is None:
+                high = low + UNBOUNDED_SPAN
+            ends.append(sorted({self._value(name, low), self._value(name, high)}))
+        return itertools.product(*ends)
+
+    def class_index(self, worker):
+        """Class id of a worker tuple (not validated)"""
+        return sum(stride * (bisect_right(self.starts[name], int(value)) - 1)
+                   for name, value, stride in zip(stream.FIELDS, worker, self.strides))
+
+    def _lookups(self):
+        """Per field, a table from (capped) value to digit * stride"""
+        if self._lookup is None:
+            dtype = np.uint16 if self.size <= 1 << 16 else np.int64
+            self._lookup = {}
+            for name, stride in zip(stream.FIELDS, self.strides):
+                starts = self.starts[name]
+                digits = np.repeat(np.arange(len(starts)), np.diff(starts + [starts[-1] + 1]))
+                self._lookup[name] = (digits * stride).astype(dtype)
+        return self._lookup
+
+    def class_ids(self, cols):
+        """Class id per worker for prepared column arrays"""
+        lookup = self._lookups()
+        ids = None
+        for name in stream.FIELDS:
+            table = lookup[name]
+            column = cols[name]
+            if column.dtype == np.bool_:
+                column = column.view(np.uint8)
+            part = table[np.minimum(column, len(table) - 1)]
+            ids = part if ids is None else ids + part
+        return ids
+
+    def role_table(self):
+        """The verdict map as a uint8 array indexed by class id"""
+        return np.frombuffer(self.verdicts, dtype=np.uint8)
+
+
+_space = None
+
+
+def get_space():
+    """ClassSpace for the default rules and current constants, rebuilt when they change"""
+    global _space
+    if _space is None or _space.thresholds != skeleton.rule_constants():
+        with open(rules.DEFAULT_RULES, encoding="utf-8") as f:
+            _space = ClassSpace(json.load(f))
+    return _space
+
+
+def classify(*worker):
+    """Role mask for one worker (arguments in stream.FIELDS order) via the verdict map"""
+    stream.validate_worker(worker)
+    space = get_space()
+    return space.verdicts[space.class_index(worker)]
+
+
+def evaluate_role_masks(columns, validate=True):
+    """One uint8 role mask per worker, looked up in the verdict map"""
+    from eligibility.batch import prepare_columns
+
+    cols = prepare_columns(columns, validate)
+    space = get_space()
+    return space.role_table()[space.class_ids(cols)]
+
+
+def verify(engines=None, space=None):
+    """Check the verdict map against the reference and the engines
+
+    Returns a report with the classes whose corners disagree with their
+    representative under the reference chain (the partition is wrong), and
+    for each engine the class ids where it disagrees with the map on any
+    corner.
+    """
+    space = space or get_space()
+    workers = []
+    owners = []
+    inconsistent = []
+    for class_id in range(space.size):
+        expected = space.verdicts[class_id]
+        for corner in space.corners(class_id):
+            workers.append(corner)
+            owners.append(class_id)
+            if _reference_mask(corner) != expected:
+                inconsistent.append(class_id)
+    report = {
+        "classes": space.size,
+        "radix": dict(zip(stream.FIELDS, space.radix)),
+        "corners": len(workers),
+        "inconsistent_classes": sorted(set(inconsistent)),
+        "engines": {},
+    }
+    if engines:
+        from eligibility import differential
+
+        cols = {name: np.array(column) for name, column in zip(stream.FIELDS, zip(*workers))}
+        expected = space.role_table()[np.array(owners)]
+        for engine in engines:
+            masks = differential._engine_masks(engine, cols, workers)
+            if isinstance(masks, Exception):
+                report["engines"][engine] = f"{type(masks).__name__}: {masks}"
+            else:
+                report["engines"][engine] = sorted(set(np.array(owners)[masks != expected].tolist()))
+    return report
+
+
+def main(argv=None):
+    space = get_space()
+    engines = None
+    if np is not None:
+        from eligibility import differential
+
+        engines = differential.ENGINES
+    report = verify(engines, space)
+    fields = ", ".join(f"{name} {radix}" for name, radix in report["radix"].items()
+                       if name not in stream.FLAG_FIELDS)
+    print(f"{report['classes']:,} classes ({fields}, 2 per flag); {report['corners']:,} corners checked")
+    failed = bool(report["inconsistent_classes"])
+    if failed:
+        print(f"reference is not constant on {len(report['inconsistent_classes'])} classes, "
+              f"e.g. {space.representative(report['inconsistent_classes'][0])}")
+    for engine, bad in report["engines"].items():
+        if bad:
+            failed = True
+            print(f"{engine}: {bad if isinstance(bad, str) else f'disagrees on {len(bad)} classes'}")
+        else:
+            print(f"{engine}: agrees on every class")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,268 @@
+"""
+Non-interactive command line for the eligibility checker.
+
+    python -m eligibility.cli evaluate --safety-training yes --safety-score 80 ...
+    python -m eligibility.cli evaluate --json '{"safety_training": "yes", ...}'
+    python -m eligibility.cli batch roster.csv --output-format binary -o verdicts.wsev
+    cat roster.jsonl | python -m eligibility.cli batch - --input-format jsonl
+    python -m eligibility.cli sweep roster.wsec --min-attendance 80:95:5
+    python -m eligibility.cli bench --sizes 1000 --modes batch
+    python -m eligibility.cli differential --rows 10000000
+
+`python skeleton.py <subcommand> ...` forwards here, as does the older
+`python skeleton.py --batch ROSTER` form. Only the standard library,
+skeleton and eligibility.stream are imported at startup; NumPy-backed
+modules are imported by the subcommands that need them, so a single
+`evaluate` call costs little more than interpreter start-up.
+"""
+
+import argparse
+import json
+import sys
+
+import skeleton
+from eligibility import stream
+
+LABELS = ("Basic Eligibility", "Machine Operator", "Safety Supervisor", "Night Shift", "Trainer")
+INPUT_FORMATS = ("csv", "jsonl", "columnar")
+SWEEP_OUTPUT_FORMATS = ("csv", "jsonl")
+
+
+def _option(name):
+    return "--" + name.replace("_", "-")
+
+
+def parse_range(text):
+    """Parse a sweep range: 'start:stop[:step]' (inclusive) or a comma list"""
+    try:
+        if ":" in text:
+            parts = [int(p) for p in text.split(":")]
+            if len(parts) not in (2, 3):
+                raise ValueError
+            start, stop = parts[:2]
+            step = parts[2] if len(parts) == 3 else 1
+            if step <= 0:
+                raise ValueError
+            return list(range(start, stop + 1, step))
+        return [int(p) for p in text.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a range or list of integers: {text!r}") from None
+
+
+def _read_record(args):
+    if args.json is None:
+        record = {name: getattr(args, name) for name in stream.FIELDS if getattr(args, name) is not None}
+    else:
+        text = sys.stdin.read() if args.json == "-" else args.json
+        try:
+            record = json.loads(text)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"invalid JSON: {exc}") from None
+        if not isinstance(record, dict):
+            raise ValueError("--json must be a JSON object")
+    return record
+
+
+def cmd_evaluate(args):
+    """Evaluate one worker given as flags or a JSON object"""
+    try:
+        record = _read_record(args)
+        worker = stream.parse_record(record)
+        verdicts = stream.run_chain(worker)
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    if args.format == "text":
+        for label, verdict in zip(LABELS, verdicts):
+            print(f"{label}: {verdict}")
+        return 0
+    sink, close_sink = stream.open_sink(args.output, args.format)
+    try:
+        writer = stream.VerdictWriter(sink, args.format)
+        writer.write_chunk([(1, stream.explicit_worker_id(record), verdicts)])
+    finally:
+        if close_sink is not None:
+            close_sink()
+        else:
+            sink.flush()
+    return 0
+
+
+def _batch_columnar(args, out_format):
+    from eligibility import columnar
+
+    stats = stream.StreamStats()
+    sink, close_sink = stream.open_sink(args.output, out_format)
+    try:
+        with columnar.ColumnarRoster.open(args.roster) as roster:
+            engine = None
+            if args.adaptive:
+                from eligibility.planner import AdaptiveEngine
+                engine = AdaptiveEngine()
+            roles = roster.evaluate(engine)
+            numbers = roster.source_rows().tolist()
+            ids = roster.worker_ids() or [None] * len(numbers)
+        writer = stream.VerdictWriter(sink, out_format)
+        verdict = (skeleton.NOT_ELIGIBLE, skeleton.ELIGIBLE)
+        total = len(roles[skeleton.ROLES[0]])
+        for start in range(0, total, args.chunk_size):
+            stop = min(start + args.chunk_size, total)
+            rows = zip(numbers[start:stop], ids[start:stop],
+                       *(roles[role][start:stop].tolist() for role in skeleton.ROLES))
+            writer.write_chunk([(number, worker_id, tuple(verdict[v] for v in row))
+                                for number, worker_id, *row in rows])
+        stats.rows = total
+    finally:
+        if close_sink is not None:
+            close_sink()
+    stats.finish()
+    return stats
+
+
+def cmd_batch(args):
+    """Evaluate a roster file or stdin and write one verdict row per worker"""
+    in_format = args.input_format or stream.detect_format(args.roster)
+    out_format = args.output_format
+    if out_format is None:
+        out_format = stream.detect_format(args.output) if args.output != "-" else "csv"
+        if out_format not in stream.OUTPUT_FORMATS:
+            out_format = "csv"
+    if args.adaptive and in_format != "columnar":
+        raise SystemExit("error: --adaptive needs a columnar roster")
+    if in_format == "columnar":
+        if args.roster == "-":
+            raise SystemExit("error: columnar rosters must be read from a file")
+        stats = _batch_columnar(args, out_format)
+        if not args.quiet:
+            print(stats.summary(), file=sys.stderr)
+        return 0
+    report = None if args.quiet else sys.stderr
+    if args.workers > 1:
+        if args.roster == "-":
+            raise SystemExit("error: --workers needs a roster file, not stdin")
+        from eligibility.parallel import DEFAULT_CHUNK_BYTES, run_parallel
+        stats = run_parallel(args.roster, args.output, in_format, out_format,
+                             args.workers, args.chunk_bytes or DEFAULT_CHUNK_BYTES, report=report)
+    else:
+        stats = stream.run_batch(args.roster, args.output, in_format, out_format, args.chunk_size, report=report)
+    return 1 if args.strict and stats.errors else 0
+
+
+def cmd_sweep(args):
+    """Count eligible workers per role over a grid of threshold values"""
+    from eligibility import columnar, sweep
+
+    columns, _ = columnar.load_columns(args.roster, args.input_format)
+    ranges = {name: getattr(args, name.lower()) for name in sweep.AXES}
+    result = sweep.sweep(columns, **ranges)
+    sink, close_sink = stream.open_sink(args.output, args.format)
+    try:
+        if args.format == "csv":
+            sink.write(",".join(sweep.AXES + skeleton.ROLES) + "\n")
+        for point, counts in result.rows():
+            if args.format == "csv":
+                values = [point[name] for name in sweep.AXES] + [counts[role] for role in skeleton.ROLES]
+                sink.write(",".join(str(v) for v in values) + "\n")
+            else:
+                sink.write(json.dumps({**point, **counts}) + "\n")
+    finally:
+        if close_sink is not None:
+            close_sink()
+    return 0
+
+
+def cmd_bench(args):
+    """Run the benchmark suite (see eligibility.bench)"""
+    from eligibility import bench
+
+    return bench.run_from_args(args)
+
+
+def cmd_differential(args):
+    """Compare every engine with the check_* reference (see eligibility.differential)"""
+    from eligibility import differential
+
+    return differential.run_from_args(args)
+
+
+LAZY_COMMANDS = (
+    ("bench", "eligibility.bench", cmd_bench, "benchmark the engines"),
+    ("differential", "eligibility.differential", cmd_differential, "check every engine against check_*"),
+)
+
+
+def build_parser(lazy_command=None):
+    """Build the argument parser
+
+    Options of the LAZY_COMMANDS are only attached for lazy_command, the
+    subcommand main() is about to run.
+    """
+    parser = argparse.ArgumentParser(prog="eligibility", description="Worker Safety Eligibility Checker")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND", required=True)
+
+    evaluate = commands.add_parser("evaluate", help="evaluate a single worker")
+    for name in stream.FIELDS:
+        kind = "yes/no" if name in stream.FLAG_FIELDS else "integer"
+        evaluate.add_argument(_option(name), dest=name, metavar=kind.upper().replace("/", "|"),
+                              help=f"{name.replace('_', ' ')} ({kind})")
+    evaluate.add_argument("--json", metavar="OBJECT", help="worker as a JSON object ('-' to read stdin)")
+    evaluate.add_argument("--format", choices=("text",) + stream.OUTPUT_FORMATS, default="text")
+    evaluate.add_argument("-o", "--output", default="-", help="output path for csv/jsonl/binary (default: stdout)")
+    evaluate.set_defaults(handler=cmd_evaluate)
+
+    batch = commands.add_parser("batch", help="evaluate a roster")
+    batch.add_argument("roster", nargs="?", default="-", help="CSV, JSONL or columnar roster ('-' for stdin)")
+    batch.add_argument("-o", "--output", default="-", help="where to write verdicts (default: stdout)")
+    batch.add_argument("--input-format", choices=INPUT_FORMATS)
+    batch.add_argument("--output-format", choices=stream.OUTPUT_FORMATS)
+    batch.add_argument("--chunk-size", type=int, default=stream.DEFAULT_CHUNK_SIZE)
+    batch.add_argument("--workers", type=int, default=1,
+                       help="worker processes; above 1 the roster is split into byte-range shards")
+    batch.add_argument("--chunk-bytes", type=int, help="shard size in bytes for --workers")
+    batch.add_argument("--adaptive", action="store_true",
+                       help="order and filter checks by observed selectivity (columnar rosters)")
+    batch.add_argument("--quiet", action="store_true", help="do not print the summary line")
+    batch.add_argument("--strict", action="store_true", help="exit with status 1 if any row was rejected")
+    batch.set_defaults(handler=cmd_batch)
+
+    sweep = commands.add_parser("sweep", help="eligible counts over a grid of thresholds")
+    sweep.add_argument("roster", nargs="?", default="-", help="CSV, JSONL or columnar roster ('-' for stdin)")
+    sweep.add_argument("--input-format", choices=INPUT_FORMATS)
+    for name in ("min_experience", "min_safety_score", "max_incidents", "min_training_score", "min_attendance"):
+        sweep.add_argument(_option(name), dest=name, type=parse_range, metavar="RANGE",
+                           help="START:STOP[:STEP] or a comma list (default: current constant)")
+    sweep.add_argument("--format", choices=SWEEP_OUTPUT_FORMATS, default="csv")
+    sweep.add_argument("-o", "--output", default="-")
+    sweep.set_defaults(handler=cmd_sweep)
+
+    # These take their options from NumPy-backed modules, so only the one being run is imported
+    for command, module, handler, help_text in LAZY_COMMANDS:
+        sub = commands.add_parser(command, help=help_text, add_help=command == lazy_command)
+        if command == lazy_command:
+            __import__(module, fromlist=["build_parser"]).build_parser(sub)
+        sub.set_defaults(handler=handler)
+    return parser
+
+
+def _legacy_argv(argv):
+    """Rewrite `--batch ROSTER [options]` into `batch ROSTER [options]`"""
+    for i, arg in enumerate(argv):
+        if arg == "--batch" and i + 1 < len(argv):
+            return ["batch", argv[i + 1]] + argv[:i] + argv[i + 2:]
+        if arg.startswith("--batch="):
+            return ["batch", arg.split("=", 1)[1]] + argv[:i] + argv[i + 1:]
+    return argv
+
+
+def main(argv=None):
+    """Parse arguments and run a subcommand; returns the exit status"""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0].startswith("-"):
+        argv = _legacy_argv(argv)
+    parser = build_parser(argv[0] if argv else None)
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+"""
+Memory-mapped columnar worker store.
+
+Parsing text dominates repeated re-screening, so a roster can be converted
+once into a compact binary file and re-evaluated any number of times:
+
+    convert_roster("roster.csv", "roster.wsec")
+    with ColumnarRoster.open("roster.wsec") as roster:
+        masks = roster.evaluate()
+
+Layout (all integers little-endian):
+
+    header      magic b"WSEC", uint16 version, uint16 column count, uint64 rows
+    descriptors per column: 16-byte name, uint8 kind, 7 pad bytes,
+                uint64 offset, uint64 byte length
+    data        one 64-byte aligned block per column
+
+Flags are bit-packed (LSB first, 1 bit per worker); numerics are stored as
+uint8, uint32 or uint64. Numeric columns are read zero-copy from the mmap;
+flag columns are unpacked on access. Every file carries the source row
+number of each worker, and a worker_id text column (uint64 end offsets
+followed by UTF-8 bytes) when the source had ids, so verdicts can be
+joined back to the original roster.
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+
+import numpy as np
+
+from eligibility import batch, stream
+
+MAGIC = b"WSEC"
+VERSION = 2
+ALIGNMENT = 64
+
+KIND_BITS = 0
+KIND_UINT8 = 1
+KIND_UINT16 = 2
+KIND_UINT32 = 3
+KIND_UINT64 = 4
+KIND_TEXT = 5
+KIND_DTYPES = {KIND_UINT8: np.dtype("<u1"), KIND_UINT16: np.dtype("<u2"),
+               KIND_UINT32: np.dtype("<u4"), KIND_UINT64: np.dtype("<u8")}
+
+ROW_COLUMN = "row"
+ID_COLUMN = stream.ID_FIELD
+
+# Storage type of every input of the five check_* functions
+SCHEMA = (
+    ("safety_training", KIND_BITS),
+    ("safety_score", KIND_UINT8),
+    ("experience", KIND_UINT32),
+    ("incidents", KIND_UINT32),
+    ("certification", KIND_BITS),
+    ("training_score", KIND_UINT8),
+    ("first_aid", KIND_BITS),
+    ("attendance", KIND_UINT8),
+    ("night_approved", KIND_BITS),
+    ("team_leader", KIND_BITS),
+)
+
+HEADER = struct.Struct("<4sHHQ")
+DESCRIPTOR = struct.Struct("<16sB7xQQ")
+
+
+def _aligned(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _encode(name, kind, values, rows=None):
+    """Return the on-disk bytes for one column"""
+    if kind == KIND_BITS:
+        return np.packbits(values, bitorder="little").tobytes()
+    if kind == KIND_TEXT:
+        encoded = [("" if value is None else str(value)).encode("utf-8") for value in values]
+        ends = np.cumsum([0] + [len(value) for value in encoded], dtype=np.uint64)
+        return ends.astype(KIND_DTYPES[KIND_UINT64]).tobytes() + b"".join(encoded)
+    dtype = KIND_DTYPES[kind]
+    if values.size and values.max() > np.iinfo(dtype).max:
+        at = int(np.argmax(values > np.iinfo(dtype).max))
+        row = at + 1 if rows is None else int(rows[at])
+        raise ValueError(f"row {row}: {name} {values[at]} does not fit in {dtype.name}")
+    return values.astype(dtype).tobytes()
+
+
+def write_columnar(path, columns):
+    """Validate a mapping of column arrays and write it as a columnar file
+
+    columns may carry the source row numbers under ROW_COLUMN (1, 2, ...
+    otherwise) and worker ids under ID_COLUMN. Values that do not fit the
+    schema raise ValueError naming their row. Returns the number of rows
+    written.
+    """
+    cols = batch.prepare_columns(columns)
+    rows = len(cols["safety_training"])
+    source_rows = np.asarray(columns.get(ROW_COLUMN, np.arange(1, rows + 1)), dtype=np.uint64)
+    if len(source_rows) != rows:
+        raise ValueError(f"{ROW_COLUMN} must have one entry per worker")
+    blobs = [(name, kind, _encode(name, kind, cols[name], source_rows)) for name, kind in SCHEMA]
+    blobs.append((ROW_COLUMN, KIND_UINT64, _encode(ROW_COLUMN, KIND_UINT64, source_rows)))
+    ids = columns.get(ID_COLUMN)
+    if ids is not None:
+        if len(ids) != rows:
+            raise ValueError(f"{ID_COLUMN} must have one entry per worker")
+        blobs.append((ID_COLUMN, KIND_TEXT, _encode(ID_COLUMN, KIND_TEXT, ids)))
+
+    offset = _aligned(HEADER.size + DESCRIPTOR.size * len(blobs))
+    descriptors = []
+    for name, kind, blob in blobs:
+        descriptors.append(DESCRIPTOR.pack(name.encode("ascii"), kind, offset, len(blob)))
+        offset = _aligned(offset + len(blob))
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(blobs), rows))
+        f.write(b"".join(descriptors))
+        for (name, kind, blob), descriptor in zip(blobs, descriptors):
+            f.seek(DESCRIPTOR.unpack(descriptor)[2])
+            f.write(blob)
+        f.truncate(offset)
+    return rows
+
+
+class ColumnarRoster:
+    """Read-only view of a columnar roster file backed by mmap"""
+
+    def __init__(self, buffer, close=None):
+        self._buffer = buffer
+        self._close = close
+        magic, version, count, rows = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("not a columnar roster file")
+        if version != VERSION:
+            raise ValueError(f"unsupported columnar roster version {version}")
+        self.version = version
+        self.rows = rows
+        self.schema = {}
+        for i in range(count):
+            raw_name, kind, offset, length = DESCRIPTOR.unpack_from(buffer, HEADER.size + i * DESCRIPTOR.size)
+            self.schema[raw_name.rstrip(b"\0").decode("ascii")] = (kind, offset, length)
+        missing = [name for name, _ in SCHEMA + ((ROW_COLUMN, KIND_UINT64),) if name not in self.schema]
+        if missing:
+            raise ValueError(f"columnar roster is missing columns: {', '.join(missing)}")
+
+    @classmethod
+    def open(cls, path):
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(mapped, mapped.close)
+        except Exception:
+            mapped.close()
+            raise
+
+    def column(self, name):
+        """Return one column as a NumPy array (zero-copy for numeric columns)"""
+        kind, offset, length = self.schema[name]
+        if kind == KIND_BITS:
+            packed = np.frombuffer(self._buffer, dtype=np.uint8, count=length, offset=offset)
+            return np.unpackbits(packed, count=self.rows, bitorder="little").view(np.bool_)
+        dtype = KIND_DTYPES[kind]
+        return np.frombuffer(self._buffer, dtype=dtype, count=length // dtype.itemsize, offset=offset)
+
+    def columns(self):
+        return {name: self.column(name) for name in batch.COLUMNS}
+
+    def source_rows(self):
+        """Row number of each worker in the roster the file was converted from"""
+        return self.column(ROW_COLUMN)
+
+    def worker_ids(self):
+        """List of worker ids (None where a row had none), or None if the file has no ids"""
+        if ID_COLUMN not in self.schema:
+            return None
+        _, offset, length = self.schema[ID_COLUMN]
+        ends = np.frombuffer(self._buffer, dtype=KIND_DTYPES[KIND_UINT64], count=self.rows + 1, offset=offset)
+        text = bytes(self._buffer[offset + ends.nbytes:offset + length])
+        bounds = ends.tolist()
+        return [text[start:end].decode("utf-8") or None for start, end in zip(bounds, bounds[1:])]
+
+    def evaluate(self, planner=None):
+        """Evaluate all five roles with the batch engine and the current constants
+
+        planner is passed on to eligibility.batch.evaluate_columns.
+        """
+        return batch.evaluate_columns(self.columns(), planner=planner)
+
+    def close(self):
+        """Release the mapping; arrays returned by column() must not be used afterwards"""
+        if self._close is not None:
+            try:
+                self._close()
+            except BufferError:
+                # Column views are still alive; the mapping goes away with them
+                pass
+            self._close = None
+
+    def __len__(self):
+        return self.rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_roster(source, in_format="csv"):
+    """Parse a CSV/JSONL text stream into compact column arrays
+
+    Rows that fail to parse or validate are skipped and counted, as in the
+    streaming evaluator; the remaining rows keep their source row numbers
+    under ROW_COLUMN, and their ids under ID_COLUMN when the source has
+    any. Counts too large for the schema raise ValueError. Returns
+    (columns, StreamStats).
+    """
+    stats = stream.StreamStats()
+    # array() keeps the staging buffers at one to four bytes per value
+    values = {name: array("I" if kind == KIND_UINT32 else "B") for name, kind in SCHEMA}
+    limits = {name: np.iinfo(KIND_DTYPES[kind]).max for name, kind in SCHEMA if kind != KIND_BITS}
+    numbers = array("Q")
+    ids = []
+    for number, worker_id, worker in stream.iter_workers(source, in_format, stats):
+        try:
+            stream.validate_worker(worker)
+        except ValueError:
+            stats.errors += 1
+            continue
+        for name, value in zip(stream.FIELDS, worker):
+            if value > limits.get(name, value):
+                raise ValueError(f"row {number}: {name} {value} does not fit in the columnar schema")
+            values[name].append(value)
+        numbers.append(number)
+        ids.append(worker_id)
+        stats.rows += 1
+
+    columns = {}
+    for name, kind in SCHEMA:
+        column = np.frombuffer(values[name], dtype=np.uint32 if kind == KIND_UINT32 else np.uint8)
+        columns[name] = column.astype(np.bool_) if kind == KIND_BITS else column
+    result = {name: columns[name] for name in batch.COLUMNS}
+    result[ROW_COLUMN] = np.frombuffer(numbers, dtype=np.uint64)
+    if any(worker_id is not None for worker_id in ids):
+        result[ID_COLUMN] = ids
+    stats.finish()
+    return result, stats
+
+
+def load_columns(path, in_format=None):
+    """Load a roster file ('-' for stdin) of any supported format as column arrays
+
+    Returns (columns, StreamStats or None for columnar files).
+    """
+    in_format = in_format or stream.detect_format(path)
+    if in_format == "columnar":
+        with ColumnarRoster.open(path) as roster:
+            columns = {name: np.array(column) for name, column in roster.columns().items()}
+            columns[ROW_COLUMN] = np.array(roster.source_rows())
+            ids = roster.worker_ids()
+            if ids is not None:
+                columns[ID_COLUMN] = ids
+            return columns, None
+    if path == "-":
+        return read_roster(sys.stdin, in_format)
+    with open(path, newline="", encoding="utf-8") as source:
+        return read_roster(source, in_format)
+
+
+def convert_roster(input_path, output_path, in_format=None):
+    """Convert a CSV/JSONL roster into a columnar file
+
+    Returns the StreamStats of the conversion.
+    """
+    columns, stats = load_columns(input_path, in_format)
+    write_columnar(output_path, columns)
+    return stats
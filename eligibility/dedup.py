@@ -0,0 +1,76 @@
+"""
+Profile deduplication pre-pass for bulk scalar evaluation.
+
+Rosters repeat the same input profile many times. evaluate_bulk() groups
+workers by profile with a dict (hashing the input tuple), runs each
+distinct profile through the check_* chain once and scatters the verdicts
+back to every row. A small sample estimates the profile cardinality first;
+when most rows are distinct the grouping overhead is skipped and rows are
+evaluated directly.
+
+This targets the per-row Python paths (streaming, parallel shards). The
+vectorized NumPy engines evaluate a row in nanoseconds, which is cheaper
+than any grouping step, so they keep evaluating directly.
+"""
+
+from eligibility import stream
+
+SAMPLE_SIZE = 1024
+# Deduplicate when the sample has at most this fraction of distinct profiles
+MAX_DISTINCT_RATIO = 0.5
+
+
+def profile_key(worker):
+    """Hashable key for a worker tuple
+
+    Value types are part of the key so True and 1 (equal and hash-equal in
+    Python) never share a verdict: the check_* validation treats them
+    differently.
+    """
+    return worker, tuple(map(type, worker))
+
+
+def estimate_distinct_ratio(workers, sample_size=SAMPLE_SIZE):
+    """Fraction of distinct profiles among an evenly spaced sample of workers"""
+    if not workers:
+        return 1.0
+    step = max(len(workers) // sample_size, 1)
+    sample = workers[::step]
+    return len({profile_key(worker) for worker in sample}) / len(sample)
+
+
+def choose_strategy(workers):
+    """Return "dedup" or "direct" for a list of workers"""
+    if len(workers) < 2:
+        return "direct"
+    return "dedup" if estimate_distinct_ratio(workers) <= MAX_DISTINCT_RATIO else "direct"
+
+
+def _safe(evaluate, worker):
+    try:
+        return evaluate(worker)
+    except ValueError:
+        return None
+
+
+def evaluate_bulk(workers, evaluate=stream.run_chain, strategy="auto"):
+    """Evaluate a list of worker tuples; returns one result per worker
+
+    Rows whose inputs fail validation get None. strategy is "auto",
+    "dedup" or "direct".
+    """
+    if strategy == "auto":
+        strategy = choose_strategy(workers)
+    if strategy == "direct":
+        return [_safe(evaluate, worker) for worker in workers]
+    if strategy != "dedup":
+        raise ValueError(f"unknown strategy: {strategy}")
+
+    distinct = {}
+    results = []
+    for worker in workers:
+        key = profile_key(worker)
+        if key not in distinct:
+            distinct[key] = _safe(evaluate, worker)
+        results.append(distinct[key])
+    return results
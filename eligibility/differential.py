@@ -0,0 +1,345 @@
+"""
+Differential testing of every engine against the scalar check_* chain.
+
+    python -m eligibility.differential --rows 10000000 --workers 8
+
+Worker profiles are generated in chunks. Half of each chunk is uniform over
+the valid input ranges. The other half is clustered within a couple of
+points of every threshold constant (and of the fixed 5-year and
+zero-incident rules), where off-by-one bugs live. Every profile is run
+through the scalar reference, and its role mask is compared with each
+vectorised engine. Scalar engines are compared on a sample of every chunk.
+They cost the same per row as the reference, so checking them on every row
+would double the run time for no extra coverage of the branches.
+
+Chunks are generated from (seed, chunk number), so worker processes need
+nothing but their chunk number, and a failing chunk can be replayed alone.
+Any disagreement is shrunk to a minimal counterexample: fields move towards
+zero and flags are cleared for as long as the engines still disagree.
+"""
+
+import argparse
+import itertools
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+import skeleton
+from eligibility import batch, stream
+
+DEFAULT_ROWS = 1_000_000
+DEFAULT_CHUNK_ROWS = 1 << 17
+DEFAULT_SCALAR_SAMPLE = 1024
+MAX_REPORTED = 10
+
+# Generation ranges; experience and incidents stay within the packed roster layout
+UPPER = {"safety_score": 100, "experience": 60, "incidents": 30, "training_score": 100, "attendance": 100}
+ROLE_BITS = tuple(int(bit) for bit in skeleton.ROLE_FLAGS.values())
+# Reference verdict tuple -> role mask, for every combination of verdicts
+VERDICT_MASK = {
+    verdicts: sum(bit for bit, verdict in zip(ROLE_BITS, verdicts) if verdict == skeleton.ELIGIBLE)
+    for verdicts in itertools.product((skeleton.ELIGIBLE, skeleton.NOT_ELIGIBLE), repeat=len(ROLE_BITS))
+}
+
+
+def _masks_from_roles(roles):
+    masks = np.zeros(len(roles[skeleton.ROLES[0]]), dtype=np.uint8)
+    for role, bit in zip(skeleton.ROLES, ROLE_BITS):
+        masks |= roles[role].astype(np.uint8) * np.uint8(bit)
+    return masks
+
+
+def _batch(cols):
+    return _masks_from_roles(batch.evaluate_columns(cols, validate=False))
+
+
+def _tables(cols):
+    from eligibility import tables
+
+    return tables.evaluate_role_masks(cols, validate=False)
+
+
+def _classes(cols):
+    from eligibility import classes
+
+    return classes.evaluate_role_masks(cols, validate=False)
+
+
+def _rules(cols):
+    from eligibility import rules
+
+    return _masks_from_roles(rules.load_rules().evaluate_columns(cols, validate=False))
+
+
+def _planner(cols):
+    from eligibility import planner
+
+    return _masks_from_roles(planner.AdaptiveEngine().evaluate_columns(cols, validate=False))
+
+
+def _index(cols):
+    from eligibility import index
+
+    roster = index.RosterIndex(cols)
+    return _masks_from_roles({role: roster.mask(role) for role in skeleton.ROLES})
+
+
+def _roster(cols):
+    from eligibility import roster
+
+    return roster.WorkerRoster.from_columns(cols).role_masks()
+
+
+def _evaluate_worker(workers):
+    return [int(skeleton.evaluate_worker(*worker).roles) for worker in workers]
+
+
+def _cache(workers):
+    from eligibility import cache
+
+    profiles = cache.ProfileCache()
+    return [int(profiles.evaluate(*worker).roles) for worker in workers]
+
+
+def _incremental(workers):
+    from eligibility import incremental
+
+    engine = incremental.IncrementalEngine()
+    for i, worker in enumerate(workers):
+        engine.add(i, **dict(zip(stream.FIELDS, worker)))
+    return [int(engine.roles(i)) for i in range(len(workers))]
+
+
+# Engines taking a dict of column arrays and returning one role mask per row
+VECTOR_ENGINES = {
+    "batch": _batch,
+    "tables": _tables,
+    "classes": _classes,
+    "rules": _rules,
+    "planner": _planner,
+    "index": _index,
+    "roster": _roster,
+}
+# Engines taking a list of worker tuples and returning a list of role masks
+SCALAR_ENGINES = {
+    "evaluate_worker": _evaluate_worker,
+    "cache": _cache,
+    "incremental": _incremental,
+}
+ENGINES = tuple(VECTOR_ENGINES) + tuple(SCALAR_ENGINES)
+
+
+def _near(rng, size, centre, upper):
+    """Values within two points of centre, with a sprinkling of the range ends"""
+    values = centre + rng.integers(-2, 3, size)
+    ends = rng.random(size) < 0.1
+    values[ends] = np.where(rng.random(int(ends.sum())) < 0.5, 0, upper)
+    return np.clip(values, 0, upper)
+
+
+def generate_profiles(size, seed=0, chunk=0):
+    """Return one chunk of profiles as column arrays (half uniform, half near thresholds)"""
+    rng = np.random.default_rng([seed, chunk])
+    half = size // 2
+    experience_threshold, score_threshold, incidents_threshold, training_threshold, attendance_threshold = (
+        skeleton.current_thresholds())
+    centres = {
+        "safety_score": [score_threshold],
+        "experience": [experience_threshold, skeleton.QUALIFYING_EXPERIENCE],
+        "incidents": [incidents_threshold, 0],
+        "training_score": [training_threshold],
+        "attendance": [attendance_threshold],
+    }
+    cols = {}
+    for name, upper in UPPER.items():
+        uniform = rng.integers(0, upper + 1, half)
+        centre = rng.choice(centres[name], size - half)
+        cols[name] = np.concatenate([uniform, _near(rng, size - half, centre, upper)])
+    for name in batch.FLAG_COLUMNS:
+        # Mostly True so the deeper roles in the chain are reached often
+        cols[name] = rng.random(size) < 0.75
+    return cols
+
+
+def reference_masks(workers):
+    """Role masks from the scalar check_* chain"""
+    run_chain = stream.run_chain
+    return np.fromiter((VERDICT_MASK[run_chain(worker)] for worker in workers), dtype=np.uint8, count=len(workers))
+
+
+def _rows(cols):
+    return list(zip(*(cols[name].tolist() for name in stream.FIELDS)))
+
+
+def _engine_masks(engine, cols, workers):
+    try:
+        if engine in VECTOR_ENGINES:
+            return np.asarray(VECTOR_ENGINES[engine](cols), dtype=np.uint8)
+        return np.asarray(SCALAR_ENGINES[engine](workers), dtype=np.uint8)
+    except Exception as exc:  # an engine crashing is a disagreement too
+        return exc
+
+
+def disagrees(engine, worker):
+    """True if engine's role mask for one worker differs from the reference"""
+    cols = {name: np.array([value]) for name, value in zip(stream.FIELDS, worker)}
+    masks = _engine_masks(engine, cols, [worker])
+    return isinstance(masks, Exception) or int(masks[0]) != VERDICT_MASK[stream.run_chain(worker)]
+
+
+def _simpler(name, value):
+    if name in stream.FLAG_FIELDS:
+        return [False] if value else []
+    return sorted({0, value // 2, value - 1} - {value}) if value > 0 else []
+
+
+def minimize(engine, worker):
+    """Shrink a failing worker while the engine keeps disagreeing with the reference"""
+    worker = list(worker)
+    changed = True
+    while changed:
+        changed = False
+        for i, name in enumerate(stream.FIELDS):
+            for candidate in _simpler(name, worker[i]):
+                trial = worker[:i] + [candidate] + worker[i + 1:]
+                if disagrees(engine, tuple(trial)):
+                    worker = trial
+                    changed = True
+                    break
+    return tuple(worker)
+
+
+def _describe(worker):
+    return dict(zip(stream.FIELDS, worker))
+
+
+def check_chunk(task):
+    """Generate one chunk and compare every engine with the reference
+
+    Returns (rows, comparisons per engine, mismatches).
+    """
+    seed, chunk, size, engines, scalar_sample, thresholds = task
+    _apply_thresholds(thresholds)
+    cols = generate_profiles(size, seed, chunk)
+    workers = _rows(cols)
+    expected = reference_masks(workers)
+    sample = slice(0, min(scalar_sample, size))
+    comparisons = {}
+    mismatches = []
+    for engine in engines:
+        scalar = engine in SCALAR_ENGINES
+        want = expected[sample] if scalar else expected
+        masks = _engine_masks(engine, cols, workers[sample] if scalar else workers)
+        comparisons[engine] = len(want)
+        if isinstance(masks, Exception):
+            bad = np.arange(len(want))
+            error = f"{type(masks).__name__}: {masks}"
+        else:
+            bad = np.flatnonzero(masks != want)
+            error = None
+        if len(bad):
+            first = workers[int(bad[0])]
+            mismatches.append({
+                "engine": engine,
+                "chunk": chunk,
+                "count": int(len(bad)),
+                "error": error,
+                "worker": _describe(first),
+                "expected": int(want[bad[0]]),
+                "actual": None if error else int(masks[bad[0]]),
+                "minimized": _describe(minimize(engine, first)),
+            })
+    return size, comparisons, mismatches
+
+
+def _apply_thresholds(thresholds):
+    for name, value in zip(("MIN_EXPERIENCE", "MIN_SAFETY_SCORE", "MAX_INCIDENTS",
+                            "MIN_TRAINING_SCORE", "MIN_ATTENDANCE", "QUALIFYING_EXPERIENCE"), thresholds):
+        setattr(skeleton, name, value)
+
+
+def run(rows=DEFAULT_ROWS, engines=ENGINES, workers=None, seed=0, chunk_rows=DEFAULT_CHUNK_ROWS,
+        scalar_sample=DEFAULT_SCALAR_SAMPLE):
+    """Run the harness and return a JSON-ready report"""
+    for engine in engines:
+        if engine not in VECTOR_ENGINES and engine not in SCALAR_ENGINES:
+            raise ValueError(f"unknown engine: {engine}")
+    thresholds = skeleton.rule_constants()
+    tasks = [(seed, chunk, min(chunk_rows, rows - start), tuple(engines), scalar_sample, thresholds)
+             for chunk, start in enumerate(range(0, rows, chunk_rows))]
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    if workers == 1 or len(tasks) == 1:
+        results = map(check_chunk, tasks)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(workers)
+        results = pool.imap_unordered(check_chunk, tasks)
+    total = 0
+    comparisons = dict.fromkeys(engines, 0)
+    mismatches = []
+    try:
+        for size, counts, found in results:
+            total += size
+            for engine, count in counts.items():
+                comparisons[engine] += count
+            mismatches.extend(found)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    elapsed = time.perf_counter() - started
+    return {
+        "rows": total,
+        "seed": seed,
+        "elapsed": elapsed,
+        "rows_per_sec": total / elapsed if elapsed > 0 else 0.0,
+        "comparisons": comparisons,
+        "mismatches": sorted(mismatches, key=lambda m: (m["engine"], m["chunk"])),
+    }
+
+
+def format_report(report):
+    lines = [f"{report['rows']:,} profiles in {report['elapsed']:.1f}s "
+             f"({report['rows_per_sec']:,.0f}/sec), seed {report['seed']}"]
+    for engine, count in report["comparisons"].items():
+        failed = sum(m["count"] for m in report["mismatches"] if m["engine"] == engine)
+        lines.append(f"  {engine:<16} {count:>12,} compared  {failed:>8,} disagreements")
+    for m in report["mismatches"][:MAX_REPORTED]:
+        detail = m["error"] or f"expected mask {m['expected']}, got {m['actual']}"
+        lines.append(f"MISMATCH {m['engine']} (chunk {m['chunk']}): {detail}")
+        lines.append(f"  minimized: {m['minimized']}")
+    return "\n".join(lines)
+
+
+def build_parser(parser=None):
+    parser = parser or argparse.ArgumentParser(description="Compare every engine with the check_* reference")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS)
+    parser.add_argument("--engines", type=lambda s: s.split(","), default=list(ENGINES))
+    parser.add_argument("--workers", type=int, help="processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--scalar-sample", type=int, default=DEFAULT_SCALAR_SAMPLE,
+                        help="rows per chunk checked against the scalar engines")
+    return parser
+
+
+def run_from_args(args):
+    """Run the harness for parsed arguments; returns 1 if any engine disagreed"""
+    try:
+        report = run(args.rows, args.engines, args.workers, args.seed, args.chunk_rows, args.scalar_sample)
+    except ValueError as exc:
+        raise SystemExit(str(exc))
+    print(format_report(report))
+    return 1 if report["mismatches"] else 0
+
+
+def main(argv=None):
+    return run_from_args(build_parser().parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""
+Incremental re-evaluation for worker deltas.
+
+The engine keeps every worker's inputs, predicate vector and role mask
+resident, and models the rules as a dependency graph:
+
+    fields -> predicates -> basic -> machine_operator -> safety_supervisor -> trainer
+                                  \\-> night_shift
+
+Each role node is its parent role AND a set of predicates. Updating a field
+recomputes only the predicates it feeds, then only the role nodes whose
+inputs changed, stopping as soon as a node keeps its value. Only verdicts
+that actually flip are emitted.
+"""
+
+from array import array
+
+import skeleton
+from eligibility import stream, tables
+
+BIT = tables.BIT
+ROLE_BIT = tables.ROLE_BIT
+
+# Role nodes in topological order: (role, parent role, predicates it ANDs)
+ROLE_NODES = (
+    ("basic", None, ("safety_training", "has_required_performance", "has_safe_record")),
+    ("machine_operator", "basic", ("certification", "has_sufficient_training")),
+    ("safety_supervisor", "machine_operator", ("first_aid", "has_good_attendance")),
+    ("night_shift", "basic", ("night_approved", "is_qualified")),
+    ("trainer", "safety_supervisor", ("has_trainer_qualification",)),
+)
+# Predicate bits fed by each input field
+FIELD_PREDICATES = {
+    "safety_training": ("safety_training",),
+    "safety_score": ("has_required_performance",),
+    "experience": ("has_required_performance", "is_qualified"),
+    "incidents": ("has_safe_record", "has_trainer_qualification"),
+    "certification": ("certification",),
+    "training_score": ("has_sufficient_training",),
+    "first_aid": ("first_aid",),
+    "attendance": ("has_good_attendance",),
+    "night_approved": ("night_approved",),
+    "team_leader": ("team_leader", "is_qualified", "has_trainer_qualification"),
+}
+FIELD_INDEX = {name: i for i, name in enumerate(stream.FIELDS)}
+# Storage per field; everything not listed fits in one byte
+TYPECODES = {"experience": "H", "incidents": "H"}
+STORAGE_LIMITS = {name: (1 << (8 * array(code).itemsize)) - 1 for name, code in TYPECODES.items()}
+
+_NODES = tuple(
+    (ROLE_BIT[role], ROLE_BIT[parent] if parent else 0, sum(BIT[p] for p in predicates))
+    for role, parent, predicates in ROLE_NODES
+)
+
+
+def _validate(name, value):
+    if name in stream.FLAG_FIELDS:
+        skeleton._validate_flag(name, value)
+    elif name in FIELD_INDEX:
+        skeleton._validate_count(name, value, stream.UPPER_LIMITS.get(name))
+        # Checked up front so a rejected value leaves the columns untouched
+        if value > STORAGE_LIMITS.get(name, value):
+            raise ValueError(f"{name} {value} exceeds the stored maximum {STORAGE_LIMITS[name]}")
+    else:
+        raise ValueError(f"unknown field: {name}")
+
+
+def evaluate_nodes(vector, previous=0, changed_bits=-1):
+    """Return the role mask for vector, recomputing only the dirty nodes
+
+    previous is the old role mask and changed_bits the predicate bits that
+    differ from the vector it was computed from; the default recomputes
+    everything.
+    """
+    mask = previous
+    flipped = 0
+    for role_bit, parent_bit, needs in _NODES:
+        if not (needs & changed_bits or parent_bit & flipped):
+            continue
+        eligible = (parent_bit == 0 or mask & parent_bit) and vector & needs == needs
+        if bool(eligible) != bool(mask & role_bit):
+            mask ^= role_bit
+            flipped |= role_bit
+    return mask
+
+
+class IncrementalEngine:
+    """Resident worker state with delta-driven re-evaluation"""
+
+    def __init__(self):
+        self._index = {}
+        self._ids = []
+        # One compact column per input field, in stream.FIELDS order
+        self._fields = [array(TYPECODES.get(name, "B")) for name in stream.FIELDS]
+        self._vectors = array("H")
+        self._roles = array("B")
+        self._tables = tables.get_tables()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _worker(self, i):
+        return tuple(column[i] for column in self._fields)
+
+    def _compile(self, i):
+        # Flags are stored as 0/1, which compile() treats the same as bools
+        return self._tables.compile(*self._worker(i))
+
+    def add(self, worker_id, **fields):
+        """Add (or replace) a worker and return its role mask"""
+        for name in stream.FIELDS:
+            if name not in fields:
+                raise ValueError(f"missing field {name}")
+            _validate(name, fields[name])
+        self._check_thresholds()
+
+        i = self._index.get(worker_id)
+        if i is None:
+            i = len(self._ids)
+            self._index[worker_id] = i
+            self._ids.append(worker_id)
+            for name, column in zip(stream.FIELDS, self._fields):
+                column.append(int(fields[name]))
+            self._vectors.append(0)
+            self._roles.append(0)
+        else:
+            for name, column in zip(stream.FIELDS, self._fields):
+                column[i] = int(fields[name])
+        vector = self._compile(i)
+        self._vectors[i] = vector
+        self._roles[i] = tables.ROLE_TABLE[vector]
+        return self._roles[i]
+
+    def roles(self, worker_id):
+        """Return the current role mask for a worker"""
+        return self._roles[self._index[worker_id]]
+
+    def verdicts(self, worker_id):
+        """Return {role: "Eligible"/"Not Eligible"} for a worker"""
+        mask = self.roles(worker_id)
+        return {role: skeleton.ELIGIBLE if mask & bit else skeleton.NOT_ELIGIBLE
+                for role, bit in ROLE_BIT.items()}
+
+    def update(self, worker_id, **changes):
+        """Apply a field delta to one worker and return the flipped verdicts
+
+        The result is a list of (role, now_eligible) for roles whose verdict
+        changed. Every field is validated before any is written. Flips of
+        other workers caused by a threshold change are applied but only
+        reported by apply().
+        """
+        for name, value in changes.items():
+            _validate(name, value)
+        self._check_thresholds()
+        return self._update(self._index[worker_id], changes)
+
+    def _update(self, i, changes):
+        touched = 0
+        for name, value in changes.items():
+            column = self._fields[FIELD_INDEX[name]]
+            if column[i] != value:
+                column[i] = int(value)
+                for predicate in FIELD_PREDICATES[name]:
+                    touched |= BIT[predicate]
+        if not touched:
+            return []
+
+        old_vector = self._vectors[i]
+        vector = self._compile(i)
+        changed_bits = (old_vector ^ vector) & touched
+        if not changed_bits:
+            return []
+        self._vectors[i] = vector
+
+        old_mask = self._roles[i]
+        mask = evaluate_nodes(vector, old_mask, changed_bits)
+        if mask == old_mask:
+            return []
+        self._roles[i] = mask
+        flipped = old_mask ^ mask
+        return [(role, bool(mask & bit)) for role, bit in ROLE_BIT.items() if flipped & bit]
+
+    def apply(self, deltas):
+        """Apply (worker_id, {field: value}) deltas; yield (worker_id, role, now_eligible)
+
+        If a threshold constant changed since the last call, every worker is
+        re-evaluated first and its flips are yielded as well.
+        """
+        yield from self._check_thresholds(emit=True)
+        for worker_id, changes in deltas:
+            for name, value in changes.items():
+                _validate(name, value)
+            for role, eligible in self._update(self._index[worker_id], changes):
+                yield worker_id, role, eligible
+
+    def _check_thresholds(self, emit=False):
+        """Recompile every worker if the constants changed; return the flips"""
+        current = tables.get_tables()
+        if current is self._tables:
+            return []
+        self._tables = current
+        flips = []
+        for i, worker_id in enumerate(self._ids):
+            vector = self._compile(i)
+            mask = tables.ROLE_TABLE[vector]
+            self._vectors[i] = vector
+            flipped = self._roles[i] ^ mask
+            self._roles[i] = mask
+            if emit and flipped:
+                flips.extend((worker_id, role, bool(mask & bit))
+                             for role, bit in ROLE_BIT.items() if flipped & bit)
+        return flips
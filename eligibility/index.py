@@ -0,0 +1,121 @@
+"""
+In-memory query layer for "who is eligible for role X".
+
+RosterIndex keeps every numeric column in row order and a packed bitmap
+(1 bit per worker) for every flag. Threshold predicates are one vectorized
+comparison per column packed into a bitmap (a sequential scan beats
+scattering the hits of a sorted index into a bitmap by over an order of
+magnitude), and role queries are bitmap intersections and unions following
+the check_* logic:
+
+    basic      = safety_training & (score >= S | experience >= E) & incidents <= I
+    machine    = basic & certification & training_score >= T
+    supervisor = machine & first_aid & attendance >= A
+    night      = basic & night_approved & (team_leader | experience >= QUALIFYING_EXPERIENCE)
+    trainer    = supervisor & (incidents == 0 | team_leader)
+
+Range bitmaps, role bitmaps and their population counts are cached, and
+role bitmaps are rebuilt when the threshold constants change, so repeated
+count() queries are O(1) and other queries only touch packed bitmaps.
+"""
+
+import numpy as np
+
+import skeleton
+from eligibility import batch
+
+MAX_CACHED_RANGES = 64
+
+
+class RosterIndex:
+    """Packed flag bitmaps and row-order numeric columns over a roster given as column arrays"""
+
+    def __init__(self, columns):
+        cols = batch.prepare_columns(columns)
+        self.rows = len(cols["safety_training"])
+        self._flags = {name: np.packbits(cols[name]) for name in batch.FLAG_COLUMNS}
+        self._numeric = {name: cols[name] for name in batch.NUMERIC_LIMITS}
+        self._ranges = {}
+        self._roles = None
+
+    def flag_bitmap(self, name):
+        """Packed bitmap of workers whose flag is set"""
+        return self._flags[name]
+
+    def range_bitmap(self, column, low=None, high=None):
+        """Packed bitmap of workers with low <= column <= high (bounds optional)"""
+        key = (column, low, high)
+        bitmap = self._ranges.get(key)
+        if bitmap is None:
+            values = self._numeric[column]
+            if low is None and high is None:
+                hits = np.ones(self.rows, dtype=np.bool_)
+            elif high is None:
+                hits = values >= low
+            elif low is None:
+                hits = values <= high
+            elif low == high:
+                hits = values == low
+            else:
+                hits = (values >= low) & (values <= high)
+            bitmap = np.packbits(hits)
+            if len(self._ranges) >= MAX_CACHED_RANGES:
+                self._ranges.clear()
+            self._ranges[key] = bitmap
+        return bitmap
+
+    def predicates(self):
+        """Packed bitmaps for the intermediate predicates under the current constants"""
+        team_leader = self._flags["team_leader"]
+        return {
+            "has_required_performance": self.range_bitmap("safety_score", skeleton.MIN_SAFETY_SCORE)
+                                        | self.range_bitmap("experience", skeleton.MIN_EXPERIENCE),
+            "has_safe_record": self.range_bitmap("incidents", None, skeleton.MAX_INCIDENTS),
+            "has_sufficient_training": self.range_bitmap("training_score", skeleton.MIN_TRAINING_SCORE),
+            "has_good_attendance": self.range_bitmap("attendance", skeleton.MIN_ATTENDANCE),
+            "is_qualified": team_leader | self.range_bitmap("experience", skeleton.QUALIFYING_EXPERIENCE),
+            "has_trainer_qualification": self.range_bitmap("incidents", 0, 0) | team_leader,
+        }
+
+    def role_bitmaps(self):
+        """Packed bitmap per role, cached until a threshold constant changes"""
+        thresholds = skeleton.rule_constants()
+        if self._roles is None or self._roles[0] != thresholds:
+            p = self.predicates()
+            flags = self._flags
+            basic = flags["safety_training"] & p["has_required_performance"] & p["has_safe_record"]
+            machine = basic & flags["certification"] & p["has_sufficient_training"]
+            supervisor = machine & flags["first_aid"] & p["has_good_attendance"]
+            night = basic & flags["night_approved"] & p["is_qualified"]
+            trainer = supervisor & p["has_trainer_qualification"]
+            bitmaps = dict(zip(skeleton.ROLES, (basic, machine, supervisor, night, trainer)))
+            self._roles = (thresholds, bitmaps, {})
+        return self._roles[1]
+
+    def role_bitmap(self, role):
+        return self.role_bitmaps()[role]
+
+    def mask(self, role):
+        """Unpacked bool mask of workers eligible for role"""
+        return np.unpackbits(self.role_bitmap(role), count=self.rows).view(np.bool_)
+
+    def workers(self, role):
+        """Row indexes of workers eligible for role, ascending"""
+        return np.flatnonzero(self.mask(role))
+
+    def count(self, role):
+        """Number of workers eligible for role"""
+        bitmap = self.role_bitmap(role)
+        counts = self._roles[2]
+        if role not in counts:
+            counts[role] = _popcount(bitmap)
+        return counts[role]
+
+
+def _popcount(bitmap):
+    """Set bits in a packed bitmap (padding bits are always clear)"""
+    if not hasattr(np, "bitwise_count"):  # NumPy < 2.0
+        return int(np.unpackbits(bitmap).sum(dtype=np.int64))
+    words = len(bitmap) // 8 * 8
+    return int(np.bitwise_count(bitmap[:words].view(np.uint64)).sum(dtype=np.int64)
+               + np.bitwise_count(bitmap[words:]).sum(dtype=np.int64))
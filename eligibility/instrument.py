@@ -0,0 +1,248 @@
+"""
+Runtime instrumentation for the check_* hot path.
+
+enable() swaps the check_* functions (and evaluate_worker) in the skeleton
+module for wrappers that count calls and errors, record call latency into
+HDR-style histograms and tally the pass rate of each intermediate
+predicate. disable() puts the original functions back, so when
+instrumentation is off the hot path runs the untouched functions at zero
+extra cost.
+
+Only callers that look the functions up on the module (skeleton.check_x,
+as every engine in this package does) see the wrappers; a reference taken
+with "from skeleton import check_x" before enable() keeps the original.
+
+    from eligibility import instrument
+    instrument.enable()
+    ...
+    print(instrument.to_text())
+"""
+
+import functools
+import inspect
+import json
+import threading
+import time
+
+import skeleton
+
+INSTRUMENTED = ("check_basic_eligibility", "check_machine_operator", "check_safety_supervisor",
+                "check_night_shift", "check_trainer", "evaluate_worker")
+PREDICATES = ("has_required_performance", "has_safe_record", "has_sufficient_training",
+              "has_good_attendance", "is_qualified", "has_trainer_qualification")
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+# Predicates each function decides, recomputed from its (already validated)
+# arguments keyed by parameter name; evaluate_worker reports them from its
+# result instead
+PREDICATE_SOURCES = {
+    "check_basic_eligibility": lambda a: (
+        ("has_required_performance",
+         a["safety_score"] >= skeleton.MIN_SAFETY_SCORE or a["experience"] >= skeleton.MIN_EXPERIENCE),
+        ("has_safe_record", a["incidents"] <= skeleton.MAX_INCIDENTS)),
+    "check_machine_operator": lambda a: (
+        ("has_sufficient_training", a["training_score"] >= skeleton.MIN_TRAINING_SCORE),),
+    "check_safety_supervisor": lambda a: (
+        ("has_good_attendance", a["attendance"] >= skeleton.MIN_ATTENDANCE),),
+    "check_night_shift": lambda a: (
+        ("is_qualified", a["team_leader"] or a["experience"] >= skeleton.QUALIFYING_EXPERIENCE),),
+    "check_trainer": lambda a: (
+        ("has_trainer_qualification", a["incidents"] == 0 or a["team_leader"]),),
+}
+
+
+class LatencyHistogram:
+    """Log-linear (HDR-style) histogram of non-negative integer values
+
+    Values below 2**SUB_BITS are recorded exactly; above that each power of
+    two is split into 2**(SUB_BITS - 1) buckets, bounding the relative error
+    of any reported value to about 3%.
+    """
+
+    SUB_BITS = 6
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    @classmethod
+    def bucket(cls, value):
+        if value < (1 << cls.SUB_BITS):
+            return value
+        shift = value.bit_length() - cls.SUB_BITS
+        return (shift << (cls.SUB_BITS - 1)) + (value >> shift)
+
+    @classmethod
+    def bucket_value(cls, index):
+        """Upper bound of the values that fall into bucket index"""
+        if index < (1 << cls.SUB_BITS):
+            return index
+        half = 1 << (cls.SUB_BITS - 1)
+        shift = (index - (1 << cls.SUB_BITS)) // half + 1
+        mantissa = index - (shift << (cls.SUB_BITS - 1))
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, value):
+        index = self.bucket(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        if not self.count:
+            return 0
+        target = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self.bucket_value(index), self.max)
+        return self.max
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min or 0,
+            "max": self.max,
+            "quantiles": {str(q): self.quantile(q) for q in QUANTILES},
+        }
+
+
+class _FunctionStats:
+    __slots__ = ("calls", "errors", "latency")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency = LatencyHistogram()
+
+
+class Registry:
+    """Counters, latency histograms and predicate pass counts"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.functions = {name: _FunctionStats() for name in INSTRUMENTED}
+            self.predicates = {name: [0, 0] for name in PREDICATES}  # [evaluated, passed]
+
+    def record(self, name, elapsed_ns, ok, predicates=()):
+        with self._lock:
+            stats = self.functions[name]
+            stats.calls += 1
+            if not ok:
+                stats.errors += 1
+                return
+            stats.latency.record(elapsed_ns)
+            for predicate, passed in predicates:
+                tally = self.predicates[predicate]
+                tally[0] += 1
+                tally[1] += bool(passed)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "enabled": is_enabled(),
+                "functions": {
+                    name: {"calls": s.calls, "errors": s.errors, "latency_ns": s.latency.snapshot()}
+                    for name, s in self.functions.items()
+                },
+                "predicates": {
+                    name: {"evaluated": evaluated, "passed": passed,
+                           "pass_rate": passed / evaluated if evaluated else 0.0}
+                    for name, (evaluated, passed) in self.predicates.items()
+                },
+            }
+
+
+registry = Registry()
+_originals = {}
+
+
+def _wrap(name, func):
+    sources = PREDICATE_SOURCES.get(name)
+    signature = inspect.signature(func) if sources is not None else None
+    record = registry.record
+    clock = time.perf_counter_ns
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        started = clock()
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            record(name, clock() - started, False)
+            raise
+        elapsed = clock() - started
+        if sources is not None:
+            predicates = sources(signature.bind(*args, **kwargs).arguments)
+        else:
+            predicates = tuple((predicate, bool(result.predicates & skeleton.Predicate[predicate.upper()]))
+                               for predicate in PREDICATES)
+        record(name, elapsed, True, predicates)
+        return result
+
+    wrapper.__wrapped_original__ = func
+    return wrapper
+
+
+def enable():
+    """Install the instrumented wrappers (idempotent)"""
+    for name in INSTRUMENTED:
+        if name not in _originals:
+            _originals[name] = getattr(skeleton, name)
+            setattr(skeleton, name, _wrap(name, _originals[name]))
+
+
+def disable():
+    """Restore the original, uninstrumented functions"""
+    for name, func in list(_originals.items()):
+        setattr(skeleton, name, func)
+        del _originals[name]
+
+
+def is_enabled():
+    return bool(_originals)
+
+
+def snapshot():
+    return registry.snapshot()
+
+
+def reset():
+    registry.reset()
+
+
+def to_json(indent=None):
+    return json.dumps(snapshot(), indent=indent)
+
+
+def to_text():
+    """Snapshot in a Prometheus-style text exposition"""
+    snap = snapshot()
+    lines = [f"eligibility_instrumentation_enabled {int(snap['enabled'])}"]
+    for name, stats in snap["functions"].items():
+        label = f'function="{name}"'
+        lines.append(f"eligibility_calls_total{{{label}}} {stats['calls']}")
+        lines.append(f"eligibility_errors_total{{{label}}} {stats['errors']}")
+        latency = stats["latency_ns"]
+        for q, value in latency["quantiles"].items():
+            lines.append(f'eligibility_latency_ns{{{label},quantile="{q}"}} {value}')
+        lines.append(f"eligibility_latency_ns_count{{{label}}} {latency['count']}")
+    for name, stats in snap["predicates"].items():
+        label = f'predicate="{name}"'
+        lines.append(f"eligibility_predicate_evaluated_total{{{label}}} {stats['evaluated']}")
+        lines.append(f"eligibility_predicate_passed_total{{{label}}} {stats['passed']}")
+    return "\n".join(lines) + "\n"
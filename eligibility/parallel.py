@@ -0,0 +1,139 @@
+"""
+Process-pool evaluation of very large roster files.
+
+The data section of the file is cut into byte-range shards. Each worker
+process aligns its range to line boundaries, runs the same parse and
+check_* chain as the serial streaming path, and returns its results; the
+parent writes them back in input order, so the output is identical to
+eligibility.stream.run_batch.
+
+Shards are split on newlines, so CSV rows must not contain quoted line
+breaks (HR exports are one worker per line).
+"""
+
+import csv
+import multiprocessing
+import os
+import sys
+
+from eligibility import stream
+
+DEFAULT_CHUNK_BYTES = 8 * 1024 * 1024
+
+
+def _iter_shard_lines(f, start, end, data_start):
+    """Yield the decoded lines whose first byte lies in [start, end)"""
+    if start > data_start:
+        # Back up one byte: if the previous shard ended exactly on a newline
+        # this consumes only that newline, otherwise the partial line
+        f.seek(start - 1)
+        position = start - 1 + len(f.readline())
+    else:
+        f.seek(start)
+        position = start
+    while position < end:
+        line = f.readline()
+        if not line:
+            return
+        position += len(line)
+        yield line.decode("utf-8")
+
+
+def _evaluate_shard(task):
+    """Worker process body: evaluate one byte range of the roster
+
+    Returns (rows, errors, results). Every input record ends up either in
+    results or in errors, so rows + errors is the shard's record count.
+    """
+    path, fmt, fieldnames, start, end, data_start = task
+    stats = stream.StreamStats()
+    results = []
+    with open(path, "rb") as f:
+        workers = stream.iter_workers(_iter_shard_lines(f, start, end, data_start), fmt, stats, fieldnames)
+        for chunk in stream.evaluate_workers(workers, stats):
+            results.extend(chunk)
+    return stats.rows, stats.errors, results
+
+
+def plan_shards(path, fmt, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """Return (fieldnames, data_start, [(start, end), ...]) for a roster file"""
+    size = os.path.getsize(path)
+    fieldnames = None
+    data_start = 0
+    if fmt == "csv":
+        with open(path, "rb") as f:
+            header = f.readline()
+        data_start = len(header)
+        fieldnames = next(csv.reader([header.decode("utf-8")]), [])
+    chunk_bytes = max(int(chunk_bytes), 1)
+    ranges = [(start, min(start + chunk_bytes, size)) for start in range(data_start, size, chunk_bytes)]
+    return fieldnames, data_start, ranges
+
+
+def parallel_roster(path, sink, in_format="csv", out_format="csv", workers=None,
+                    chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """Evaluate a roster file across a process pool and write verdicts to sink
+
+    Returns the merged StreamStats.
+    """
+    workers = workers or os.cpu_count() or 1
+    fieldnames, data_start, ranges = plan_shards(path, in_format, chunk_bytes)
+    tasks = [(path, in_format, fieldnames, start, end, data_start) for start, end in ranges]
+
+    stats = stream.StreamStats()
+    writer = stream.VerdictWriter(sink, out_format)
+    offset = 0
+    with multiprocessing.Pool(workers) as pool:
+        # imap keeps shard order while letting later shards run ahead
+        for rows, errors, results in pool.imap(_evaluate_shard, tasks):
+            writer.write_chunk(results, offset)
+            offset += rows + errors
+            stats.rows += rows
+            stats.errors += errors
+    stats.finish()
+    return stats
+
+
+def run_parallel(input_path, output_path="-", in_format=None, out_format=None, workers=None,
+                 chunk_bytes=DEFAULT_CHUNK_BYTES, report=sys.stderr):
+    """File-level entry point used by `batch --workers N`"""
+    if input_path == "-":
+        raise ValueError("parallel mode needs a roster file, not stdin")
+    in_format = in_format or stream.detect_format(input_path)
+    out_format = out_format or (stream.detect_format(output_path) if output_path != "-" else in_format)
+
+    sink, close_sink = stream.open_sink(output_path, out_format)
+    try:
+        stats = parallel_roster(input_path, sink, in_format, out_format, workers, chunk_bytes)
+    finally:
+        if close_sink is not None:
+            close_sink()
+    if report is not None:
+        print(stats.summary(), file=report)
+    return stats
+
+
+def _evaluate_column_slice(columns):
+    from eligibility import batch
+
+    return batch.evaluate_columns(columns, validate=False)
+
+
+def evaluate_columns_parallel(columns, workers=None, chunk_rows=1 << 20):
+    """In-memory counterpart of parallel_roster for NumPy column arrays
+
+    Columns are validated once, cut into row slices and evaluated with the
+    batch engine in a process pool; the masks are concatenated in order.
+    """
+    import numpy as np
+    from eligibility import batch
+
+    cols = batch.prepare_columns(columns)
+    size = len(cols["safety_training"])
+    slices = [{name: column[start:start + chunk_rows] for name, column in cols.items()}
+              for start in range(0, size, chunk_rows)]
+    if len(slices) <= 1 or (workers or os.cpu_count() or 1) == 1:
+        return batch.evaluate_columns(cols, validate=False)
+    with multiprocessing.Pool(workers or os.cpu_count()) as pool:
+        parts = pool.map(_evaluate_column_slice, slices)
+    return {role: np.concatenate([part[role] for part in parts]) for role in parts[0]}
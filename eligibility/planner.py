@@ -0,0 +1,335 @@
+"""
+Selectivity-driven evaluation order for the batch engine.
+
+Each role is an AND of terms (some terms are ORs of leaf comparisons), and
+each role only needs the rows that survived its parent role. On every call
+the adaptive engine first evaluates a strided sample of the rows term by
+term, dropping rows as soon as one term fails, and records the pass rate of
+every term. It then re-plans:
+
+- AND terms run in ascending pass-rate order (most rows eliminated first),
+- OR leaves run in descending pass-rate order (most rows settled first),
+
+and evaluates every chunk of rows in that order. Terms run as whole-column
+passes, exactly like eligibility.batch.evaluate_columns, until the estimated
+surviving fraction drops below COMPACT_BELOW with more than COMPACT_COST
+passes of work left; only then are the survivors gathered and the remaining
+terms evaluated on them alone. On rosters where
+few workers get past the first terms this skips most of the work; otherwise
+the cost stays that of the dense pass plus the sample.
+
+AND/OR are commutative, so the plan changes speed, never results.
+"""
+
+import numpy as np
+
+import skeleton
+from eligibility import batch
+
+DEFAULT_CHUNK_ROWS = 1 << 18
+# Rows per call evaluated term by term to observe pass rates
+DEFAULT_SAMPLE_ROWS = 2048
+# Below this surviving fraction, gathering survivors beats whole-column passes...
+COMPACT_BELOW = 0.02
+# ...provided more whole-column passes than finding and scattering them costs
+COMPACT_COST = 8
+
+# Leaf comparisons, each evaluated on a row view; constants are read live
+LEAVES = {
+    "safety_training": lambda rows: rows["safety_training"],
+    "safety_score >= MIN_SAFETY_SCORE": lambda rows: rows["safety_score"] >= skeleton.MIN_SAFETY_SCORE,
+    "experience >= MIN_EXPERIENCE": lambda rows: rows["experience"] >= skeleton.MIN_EXPERIENCE,
+    "incidents <= MAX_INCIDENTS": lambda rows: rows["incidents"] <= skeleton.MAX_INCIDENTS,
+    "certification": lambda rows: rows["certification"],
+    "training_score >= MIN_TRAINING_SCORE": lambda rows: rows["training_score"] >= skeleton.MIN_TRAINING_SCORE,
+    "first_aid": lambda rows: rows["first_aid"],
+    "attendance >= MIN_ATTENDANCE": lambda rows: rows["attendance"] >= skeleton.MIN_ATTENDANCE,
+    "night_approved": lambda rows: rows["night_approved"],
+    "team_leader": lambda rows: rows["team_leader"],
+    "experience >= QUALIFYING_EXPERIENCE": lambda rows: rows["experience"] >= skeleton.QUALIFYING_EXPERIENCE,
+    "incidents == 0": lambda rows: rows["incidents"] == 0,
+}
+# OR terms, named after the skeleton predicates they implement
+GROUPS = {
+    "has_required_performance": ("safety_score >= MIN_SAFETY_SCORE", "experience >= MIN_EXPERIENCE"),
+    "is_qualified": ("team_leader", "experience >= QUALIFYING_EXPERIENCE"),
+    "has_trainer_qualification": ("incidents == 0", "team_leader"),
+}
+# (role, parent role, AND terms) in evaluation order
+STAGES = (
+    ("basic", None, ("safety_training", "has_required_performance", "incidents <= MAX_INCIDENTS")),
+    ("machine_operator", "basic", ("certification", "training_score >= MIN_TRAINING_SCORE")),
+    ("safety_supervisor", "machine_operator", ("first_aid", "attendance >= MIN_ATTENDANCE")),
+    ("night_shift", "basic", ("night_approved", "is_qualified")),
+    ("trainer", "safety_supervisor", ("has_trainer_qualification",)),
+)
+
+
+
+def _passes(term):
+    """Whole-column passes a term costs densely: one per leaf plus its AND/OR"""
+    return 2 * len(GROUPS.get(term, (term,)))
+
+
+def _subtree_passes():
+    """{role: passes of its own terms and of every role depending on it}"""
+    passes = {}
+    for role, _, terms in reversed(STAGES):
+        children = [child for child, parent, _ in STAGES if parent == role]
+        passes[role] = sum(map(_passes, terms)) + sum(passes[child] for child in children)
+    return passes
+
+
+SUBTREE_PASSES = _subtree_passes()
+
+
+class _Selection:
+    """The rows of a chunk still alive for a role
+
+    While most rows survive, the selection stays dense (a bool mask over the
+    chunk, terms evaluated on whole columns); once survivors drop below
+    COMPACT_BELOW of the chunk it switches to an index array and terms only
+    touch gathered survivor values.
+    """
+
+    __slots__ = ("cols", "size", "alive", "idx", "_cache")
+
+    def __init__(self, cols, size, alive=None, idx=None):
+        self.cols = cols
+        self.size = size
+        self.alive = alive
+        self.idx = idx
+        self._cache = {}
+
+    @property
+    def compact(self):
+        return self.idx is not None
+
+    def __getitem__(self, name):
+        if self.idx is None:
+            return self.cols[name]
+        column = self._cache.get(name)
+        if column is None:
+            column = self._cache[name] = self.cols[name][self.idx]
+        return column
+
+    def count(self):
+        if self.idx is not None:
+            return len(self.idx)
+        return self.size if self.alive is None else int(np.count_nonzero(self.alive))
+
+    def tally(self, values, among=None):
+        """(rows considered, rows passing) for a result aligned to this view
+
+        among optionally narrows the considered rows (a dense mask).
+        """
+        if among is None:
+            among = self.alive if self.idx is None else None
+        if among is None:
+            return len(values), int(np.count_nonzero(values))
+        return int(np.count_nonzero(among)), int(np.count_nonzero(values & among))
+
+    def restrict(self, keep, compact=None):
+        """New selection of the rows where keep (aligned to this view) is true
+
+        compact forces the choice between a dense mask and an index array;
+        by default survivors are counted and compared with COMPACT_BELOW.
+        """
+        if self.idx is not None:
+            return _Selection(self.cols, self.size, idx=self.idx[keep])
+        alive = keep if self.alive is None else self.alive & keep
+        if compact is None:
+            compact = np.count_nonzero(alive) < COMPACT_BELOW * self.size
+        if compact:
+            return _Selection(self.cols, self.size, idx=np.flatnonzero(alive))
+        return _Selection(self.cols, self.size, alive=alive)
+
+    def mask(self):
+        if self.idx is not None:
+            mask = np.zeros(self.size, dtype=np.bool_)
+            mask[self.idx] = True
+            return mask
+        return np.ones(self.size, dtype=np.bool_) if self.alive is None else self.alive
+
+
+class TermStats:
+    """Observed pass counts for one term"""
+
+    __slots__ = ("evaluated", "passed")
+
+    def __init__(self):
+        self.evaluated = 0
+        self.passed = 0
+
+    @property
+    def pass_rate(self):
+        # Unobserved terms sit in the middle until data arrives
+        return self.passed / self.evaluated if self.evaluated else 0.5
+
+
+class AdaptiveEngine:
+    """Batch evaluator that reorders terms by observed selectivity"""
+
+    def __init__(self, chunk_rows=DEFAULT_CHUNK_ROWS, decay=0.5, sample_rows=DEFAULT_SAMPLE_ROWS):
+        self.chunk_rows = chunk_rows
+        self.sample_rows = sample_rows
+        self.decay = decay
+        self.stats = {name: TermStats() for name in list(LEAVES) + list(GROUPS)}
+        self._plan = {role: list(terms) for role, _, terms in STAGES}
+        self._groups = {name: list(leaves) for name, leaves in GROUPS.items()}
+
+    def plan(self):
+        """Current evaluation order with observed pass rates, for inspection
+
+        Returns {role: [(term, pass rate, [(OR leaf, pass rate), ...]), ...]}.
+        """
+        return {
+            role: [(term, self.stats[term].pass_rate,
+                    [(leaf, self.stats[leaf].pass_rate) for leaf in self._groups.get(term, ())])
+                   for term in terms]
+            for role, terms in self._plan.items()
+        }
+
+    def describe_plan(self):
+        compact = {(role, term): gather for role, steps in self.schedule().items() for term, gather in steps}
+        lines = []
+        for role, terms in self.plan().items():
+            lines.append(f"{role}:")
+            for term, rate, leaves in terms:
+                gather = ", then gather survivors" if compact[role, term] else ""
+                lines.append(f"  AND {term}  (pass {rate:.1%}{gather})")
+                for leaf, leaf_rate in leaves:
+                    lines.append(f"      OR {leaf}  (pass {leaf_rate:.1%})")
+        return "\n".join(lines)
+
+    def replan(self):
+        """Reorder terms from the pass rates observed so far"""
+        for terms in self._plan.values():
+            terms.sort(key=lambda term: self.stats[term].pass_rate)
+        for leaves in self._groups.values():
+            leaves.sort(key=lambda leaf: -self.stats[leaf].pass_rate)
+        if self.decay < 1:
+            # Age old observations so the plan follows drifting data
+            for stat in self.stats.values():
+                stat.evaluated = int(stat.evaluated * self.decay)
+                stat.passed = int(stat.passed * self.decay)
+
+    def _record(self, name, tally):
+        stat = self.stats[name]
+        stat.evaluated += tally[0]
+        stat.passed += tally[1]
+
+    def _leaf(self, name, rows):
+        return np.asarray(LEAVES[name](rows), dtype=np.bool_)
+
+    def _term(self, name, rows, record=True):
+        """Evaluate one AND term on a selection; result is aligned to its view"""
+        if name in LEAVES:
+            result = self._leaf(name, rows)
+            if record:
+                self._record(name, rows.tally(result))
+            return result
+        if rows.compact:
+            # OR group: each leaf only sees rows no earlier leaf has settled
+            result = np.zeros(rows.count(), dtype=np.bool_)
+            pending = np.arange(len(result))
+            for leaf in self._groups[name]:
+                if not len(pending):
+                    break
+                view = rows if len(pending) == len(result) else rows.restrict(pending)
+                hit = self._leaf(leaf, view)
+                if record:
+                    self._record(leaf, view.tally(hit))
+                result[pending[hit]] = True
+                pending = pending[~hit]
+        elif not record:
+            result = None
+            for leaf in self._groups[name]:
+                hit = self._leaf(leaf, rows)
+                result = hit if result is None else result | hit
+        else:
+            # Dense: whole-column evaluation, but stats still only count the
+            # rows each leaf would have seen with short-circuiting
+            result = None
+            pending = rows.alive
+            for leaf in self._groups[name]:
+                if pending is not None and not pending.any():
+                    break
+                hit = self._leaf(leaf, rows)
+                self._record(leaf, rows.tally(hit, pending))
+                result = hit if result is None else result | hit
+                pending = ~result if rows.alive is None else rows.alive & ~result
+        if record:
+            self._record(name, rows.tally(result))
+        return result
+
+    def observe(self, cols):
+        """Record term pass rates on a strided sample of the rows and re-plan"""
+        size = len(cols["safety_training"])
+        step = max(1, size // self.sample_rows)
+        sample = {name: column[::step] for name, column in cols.items()}
+        size = len(sample["safety_training"])
+        survivors = {}
+        for role, parent, _ in STAGES:
+            rows = _Selection(sample, size) if parent is None else survivors[parent]
+            for term in self._plan[role]:
+                if not rows.count():
+                    break
+                rows = rows.restrict(self._term(term, rows))
+            survivors[role] = rows
+        self.replan()
+
+    def schedule(self):
+        """{role: [(term, gather the survivors after it), ...]} for the current plan
+
+        Pass rates are observed on the rows surviving earlier terms, so their
+        product estimates the fraction of rows left after each term.
+        """
+        fractions = {}
+        gathered = {}
+        schedule = {}
+        for role, parent, _ in STAGES:
+            fraction = 1.0 if parent is None else fractions[parent]
+            compact = parent is not None and gathered[parent]
+            remaining = SUBTREE_PASSES[role]
+            steps = []
+            for term in self._plan[role]:
+                fraction *= self.stats[term].pass_rate
+                remaining -= _passes(term)
+                gather = not compact and fraction < COMPACT_BELOW and remaining > COMPACT_COST
+                compact = compact or gather
+                steps.append((term, gather))
+            fractions[role] = fraction
+            gathered[role] = compact
+            schedule[role] = steps
+        return schedule
+
+    def _evaluate_chunk(self, cols, schedule):
+        """Evaluate every row of a chunk as scheduled, without recording stats"""
+        size = len(cols["safety_training"])
+        survivors = {}
+        for role, parent, _ in STAGES:
+            rows = _Selection(cols, size) if parent is None else survivors[parent]
+            for term, compact in schedule[role]:
+                if rows.compact and not rows.count():
+                    break
+                rows = rows.restrict(self._term(term, rows, record=False), compact)
+            survivors[role] = rows
+        return {role: survivors[role].mask() for role in skeleton.ROLES}
+
+    def evaluate_columns(self, columns, validate=True):
+        """Same result as eligibility.batch.evaluate_columns, re-planning per call"""
+        cols = batch.prepare_columns(columns, validate)
+        size = len(cols["safety_training"])
+        self.observe(cols)
+        schedule = self.schedule()
+        if not size or not any(compact for steps in schedule.values() for _, compact in steps):
+            # Filtering would not pay off: one fixed whole-column pass is fastest
+            return batch.evaluate_columns(cols, validate=False)
+        parts = []
+        for start in range(0, size, self.chunk_rows):
+            chunk = {name: column[start:start + self.chunk_rows] for name, column in cols.items()}
+            parts.append(self._evaluate_chunk(chunk, schedule))
+        if len(parts) == 1:
+            return parts[0]
+        return {role: np.concatenate([part[role] for part in parts]) for role in skeleton.ROLES}
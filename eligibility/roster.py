@@ -0,0 +1,248 @@
+"""
+Compact in-memory worker roster.
+
+A list of worker dicts costs a couple of hundred bytes per worker. WorkerRoster
+stores the same data as one packed NumPy record per worker:
+
+    flags           uint8   bit i set when FLAG_COLUMNS[i] is True
+    safety_score    uint8   0-100
+    experience      uint8   0-255 years
+    incidents       uint16  0-65535
+    training_score  uint8   0-100
+    attendance      uint8   0-100
+
+That is 7 bytes per worker (plus unused capacity, which append() grows
+geometrically). The numeric ranges are narrower than the columnar file format.
+
+    roster = WorkerRoster()
+    roster.append(True, 90, 6, 0, True, 85, True, 95, True, False)
+    roster.extend_columns(columns)
+    trainers = roster.filter(skeleton.Role.TRAINER)
+    for worker in trainers:
+        print(worker.safety_score, worker.evaluate().as_dict())
+
+evaluate() hands the columns to eligibility.batch; inputs are validated when
+they are added, so evaluation skips re-validation.
+"""
+
+import numpy as np
+
+import skeleton
+from eligibility import batch, stream, tables
+
+ROW_DTYPE = np.dtype([
+    ("flags", "u1"),
+    ("safety_score", "u1"),
+    ("experience", "u1"),
+    ("incidents", "<u2"),
+    ("training_score", "u1"),
+    ("attendance", "u1"),
+])
+FLAG_BIT = {name: 1 << i for i, name in enumerate(batch.FLAG_COLUMNS)}
+NUMERIC_COLUMNS = tuple(name for name in ROW_DTYPE.names if name != "flags")
+MIN_CAPACITY = 16
+
+
+def _role_bits(roles):
+    """Turn a Role flag, a ROLES name or an iterable of names into a mask int"""
+    if isinstance(roles, str):
+        return int(skeleton.ROLE_FLAGS[roles])
+    if isinstance(roles, int):
+        return int(roles)
+    return int(sum(int(skeleton.ROLE_FLAGS[name]) for name in set(roles)))
+
+
+class WorkerView:
+    """Lightweight read-only view of one roster row
+
+    Fields are decoded from the packed record on access; a view holds no
+    copy of the worker.
+    """
+
+    __slots__ = ("_data", "_index")
+
+    def __init__(self, data, index):
+        self._data = data
+        self._index = index
+
+    def as_tuple(self):
+        """Return the worker as a tuple in skeleton argument order"""
+        return tuple(getattr(self, name) for name in stream.FIELDS)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in stream.FIELDS}
+
+    def evaluate(self):
+        """Run skeleton.evaluate_worker for this worker"""
+        return skeleton.evaluate_worker(*self.as_tuple())
+
+    def __repr__(self):
+        return f"WorkerView({self.as_dict()!r})"
+
+
+def _flag_property(name):
+    bit = FLAG_BIT[name]
+    return property(lambda self: bool(self._data["flags"][self._index] & bit))
+
+
+def _count_property(name):
+    return property(lambda self: int(self._data[name][self._index]))
+
+
+for _name in batch.FLAG_COLUMNS:
+    setattr(WorkerView, _name, _flag_property(_name))
+for _name in NUMERIC_COLUMNS:
+    setattr(WorkerView, _name, _count_property(_name))
+del _name
+
+
+class WorkerRoster:
+    """Growable roster of workers stored as packed 7-byte records"""
+
+    def __init__(self, capacity=0):
+        self._data = np.zeros(capacity, dtype=ROW_DTYPE)
+        self._size = 0
+
+    @classmethod
+    def _wrap(cls, data):
+        roster = cls.__new__(cls)
+        roster._data = data
+        roster._size = len(data)
+        return roster
+
+    @classmethod
+    def from_columns(cls, columns):
+        """Build a roster from a mapping of column arrays (see eligibility.batch)"""
+        roster = cls()
+        roster.extend_columns(columns)
+        return roster
+
+    @classmethod
+    def from_workers(cls, workers):
+        """Build a roster from worker tuples in skeleton argument order"""
+        roster = cls()
+        roster.extend(workers)
+        return roster
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def records(self):
+        """The packed records in use (a view; do not hold across appends)"""
+        return self._data[:self._size]
+
+    @property
+    def nbytes(self):
+        return self.records.nbytes
+
+    def _reserve(self, extra):
+        needed = self._size + extra
+        if needed <= len(self._data):
+            return
+        capacity = max(needed, 2 * len(self._data), MIN_CAPACITY)
+        data = np.zeros(capacity, dtype=ROW_DTYPE)
+        data[:self._size] = self._data[:self._size]
+        self._data = data
+
+    def append(self, safety_training, safety_score, experience, incidents, certification,
+               training_score, first_aid, attendance, night_approved, team_leader):
+        """Add one worker; raises ValueError for inputs the check_* functions reject
+
+        Experience above 255 years or more than 65535 incidents do not fit the
+        packed layout and are rejected too.
+        """
+        worker = (safety_training, safety_score, experience, incidents, certification,
+                  training_score, first_aid, attendance, night_approved, team_leader)
+        stream.validate_worker(worker)
+        if experience > 0xFF or incidents > 0xFFFF:
+            raise ValueError("experience or incidents too large for a WorkerRoster")
+        self._reserve(1)
+        flags = 0
+        for name, value in zip(stream.FIELDS, worker):
+            if name in FLAG_BIT and value:
+                flags |= FLAG_BIT[name]
+        self._data[self._size] = (flags, safety_score, experience, incidents, training_score, attendance)
+        self._size += 1
+
+    def extend(self, workers):
+        """Append every worker tuple from an iterable"""
+        for worker in workers:
+            self.append(*worker)
+
+    def extend_columns(self, columns):
+        """Append a whole batch of column arrays at once (validated like evaluate_columns)"""
+        cols = batch.prepare_columns(columns)
+        if cols["experience"].size and (cols["experience"].max() > 0xFF or cols["incidents"].max() > 0xFFFF):
+            raise ValueError("experience or incidents too large for a WorkerRoster")
+        count = len(cols["safety_score"])
+        self._reserve(count)
+        block = self._data[self._size:self._size + count]
+        flags = np.zeros(count, dtype=np.uint8)
+        for name, bit in FLAG_BIT.items():
+            flags |= cols[name].astype(np.uint8) * np.uint8(bit)
+        block["flags"] = flags
+        for name in NUMERIC_COLUMNS:
+            block[name] = cols[name]
+        self._size += count
+
+    def column(self, name):
+        """Return one column as a NumPy array (bools for flags, views for numerics)"""
+        if name in FLAG_BIT:
+            return (self.records["flags"] & FLAG_BIT[name]).astype(np.bool_)
+        return self.records[name]
+
+    def columns(self):
+        """Return {column name: array} in the shape eligibility.batch expects
+
+        Unlike column(), numerics are contiguous copies: NumPy evaluates them
+        several times faster than strided views into the packed records.
+        """
+        records = self.records
+        flags = records["flags"].copy()
+        cols = {name: (flags & np.uint8(bit)) != 0 for name, bit in FLAG_BIT.items()}
+        for name in NUMERIC_COLUMNS:
+            cols[name] = np.ascontiguousarray(records[name])
+        return cols
+
+    def role_masks(self):
+        """Return one skeleton.Role bitmask (uint8) per worker"""
+        masks = np.zeros(self._size, dtype=np.uint8)
+        for role, held in self.evaluate().items():
+            masks |= held.view(np.uint8) * np.uint8(tables.ROLE_BIT[role])
+        return masks
+
+    def evaluate(self):
+        """Return {role: bool array} like eligibility.batch.evaluate_columns"""
+        return batch.evaluate_columns(self.columns(), validate=False)
+
+    def filter(self, roles, any_of=False):
+        """Return a new roster with the workers eligible for roles
+
+        roles is a Role flag, a role name or an iterable of names. By default
+        a worker must hold every role given; any_of=True keeps workers holding
+        at least one.
+        """
+        bits = _role_bits(roles)
+        masks = self.evaluate()
+        selected = [masks[role] for role, bit in tables.ROLE_BIT.items() if bits & bit]
+        if not selected:
+            keep = np.full(self._size, not any_of)
+        else:
+            keep = (np.logical_or if any_of else np.logical_and).reduce(selected)
+        return self._wrap(self.records[keep])
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            # Copied so that appends to either roster never show up in the other
+            return self._wrap(self.records[key].copy())
+        index = range(self._size)[key]
+        return WorkerView(self._data, index)
+
+    def __iter__(self):
+        data = self._data
+        for index in range(self._size):
+            yield WorkerView(data, index)
+
+    def __repr__(self):
+        return f"WorkerRoster({self._size} workers, {self.nbytes} bytes)"
@@ -0,0 +1,282 @@
+"""
+Declarative role rules compiled to Python at load time.
+
+A rule file (JSON) declares the input fields and, per role, its scalar
+function name, argument order, optional parent role and a condition:
+
+    condition := "field"                          flag is set
+               | {"all": [condition, ...]}        AND
+               | {"any": [condition, ...]}        OR
+               | {"not": condition}
+               | {"ge"|"gt"|"le"|"lt"|"eq": [operand, operand]}
+    operand   := "field" | "CONSTANT" | integer
+
+CONSTANT names are module-level constants of skeleton.py, read at call time
+so later changes are honoured. A role with "requires" is eligible only if
+its parent role is; its scalar function receives the parent's verdict
+string under the "as" name, exactly like the check_* chain.
+
+load_rules() generates source for both a scalar function per role (same
+signature, validation and return values as the hand-written check_*) and a
+vectorized kernel per role over NumPy arrays, then compiles it once.
+"""
+
+import json
+import os
+
+import skeleton
+
+DEFAULT_RULES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "default_rules.json")
+COMPARISONS = {"ge": ">=", "gt": ">", "le": "<=", "lt": "<", "eq": "=="}
+FIELD_TYPES = ("flag", "count")
+
+
+class RuleError(ValueError):
+    """Raised for malformed rule files"""
+
+
+class RuleSet:
+    """Compiled rules: scalar functions, batch kernels and the generated source
+
+    fields maps each declared input field to its (type, max) from the rule file.
+    """
+
+    def __init__(self, roles, scalar, kernels, source, fields):
+        self.roles = roles
+        self.scalar = scalar
+        self.kernels = kernels
+        self.source = source
+        self.fields = fields
+
+    def __getattr__(self, name):
+        try:
+            return self.scalar[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def prepare_columns(self, columns, validate=True):
+        """Convert the rule file's fields into 1-D arrays, validated by their type and max"""
+        import numpy as np
+
+        from eligibility.batch import _as_count, _as_flag
+
+        missing = [name for name in self.fields if name not in columns]
+        if missing:
+            raise ValueError(f"missing columns: {', '.join(missing)}")
+        prepared = {}
+        for name, (kind, limit) in self.fields.items():
+            if not validate:
+                prepared[name] = np.asarray(columns[name]).reshape(-1)
+            elif kind == "flag":
+                prepared[name] = _as_flag(name, columns[name])
+            else:
+                prepared[name] = _as_count(name, columns[name], limit)
+        if len({arr.shape[0] for arr in prepared.values()}) > 1:
+            raise ValueError("all columns must have the same length")
+        return prepared
+
+    def evaluate_columns(self, columns, validate=True):
+        """Run every role kernel over column arrays; returns {role: bool array}"""
+        cols = self.prepare_columns(columns, validate)
+        results = {}
+        for role in self.roles:
+            kernel = self.kernels[role["name"]]
+            parent = role.get("requires")
+            args = [results[parent["role"]] if parent and name == parent["as"] else cols[name]
+                    for name in role["inputs"]]
+            results[role["name"]] = kernel(*args)
+        return results
+
+
+def _check_identifier(name, what):
+    if not isinstance(name, str) or not name.isidentifier():
+        raise RuleError(f"invalid {what}: {name!r}")
+    return name
+
+
+class _Generator:
+    """Turns rule conditions into scalar and vectorized Python expressions"""
+
+    def __init__(self, fields):
+        self.fields = fields
+
+    def operand(self, value, inputs):
+        if isinstance(value, bool) or not isinstance(value, (int, str)):
+            raise RuleError(f"invalid operand: {value!r}")
+        if isinstance(value, int):
+            return repr(value)
+        if value in inputs:
+            return value
+        if value.isupper() and value.isidentifier():
+            if not hasattr(skeleton, value):
+                raise RuleError(f"unknown constant: {value}")
+            constant = getattr(skeleton, value)
+            if isinstance(constant, bool) or not isinstance(constant, int):
+                raise RuleError(f"constant {value} is not an integer")
+            return f"_k.{value}"
+        raise RuleError(f"operand {value!r} is neither an input nor a constant")
+
+    def condition(self, node, inputs, vector):
+        if isinstance(node, str):
+            if node not in inputs or self.fields.get(node) != "flag":
+                raise RuleError(f"{node!r} is not a flag input of this role")
+            return node
+        if not isinstance(node, dict) or len(node) != 1:
+            raise RuleError(f"invalid condition: {node!r}")
+        (op, args), = node.items()
+        if op in ("all", "any"):
+            if not isinstance(args, list) or not args:
+                raise RuleError(f"{op} needs a non-empty list")
+            joiner = {"all": (" and ", " & "), "any": (" or ", " | ")}[op][vector]
+            return "(" + joiner.join(self.condition(arg, inputs, vector) for arg in args) + ")"
+        if op == "not":
+            inner = self.condition(args, inputs, vector)
+            return f"(~{inner})" if vector else f"(not {inner})"
+        if op in COMPARISONS:
+            if not isinstance(args, list) or len(args) != 2:
+                raise RuleError(f"{op} needs two operands")
+            lhs, rhs = (self.operand(arg, inputs) for arg in args)
+            return f"({lhs} {COMPARISONS[op]} {rhs})"
+        raise RuleError(f"unknown operator: {op}")
+
+
+def _check_structure(spec):
+    """Reject specs whose shape the generator cannot walk"""
+    if not isinstance(spec, dict):
+        raise RuleError("rule file must be a JSON object")
+    fields = spec.get("fields", {})
+    if not isinstance(fields, dict):
+        raise RuleError("fields must be an object")
+    for name, info in fields.items():
+        if not isinstance(info, dict):
+            raise RuleError(f"field {name}: must be an object")
+        limit = info.get("max")
+        if limit is not None and (isinstance(limit, bool) or not isinstance(limit, int)):
+            raise RuleError(f"field {name}: max must be an integer")
+    roles = spec.get("roles", [])
+    if not isinstance(roles, list):
+        raise RuleError("roles must be a list")
+    for role in roles:
+        if not isinstance(role, dict):
+            raise RuleError(f"role must be an object: {role!r}")
+        if not isinstance(role.get("inputs", []), list):
+            raise RuleError(f"role {role.get('name')!r}: inputs must be a list")
+        parent = role.get("requires")
+        if parent is not None and (not isinstance(parent, dict) or not isinstance(parent.get("role"), str)
+                                   or "as" not in parent):
+            raise RuleError(f"role {role.get('name')!r}: requires needs a role and an as name")
+
+
+def _order_roles(roles):
+    """Return roles sorted so every parent comes before its dependents"""
+    by_name = {}
+    for role in roles:
+        name = _check_identifier(role.get("name"), "role name")
+        if name in by_name:
+            raise RuleError(f"duplicate role: {name}")
+        by_name[name] = role
+
+    ordered, state = [], {}
+
+    def visit(name, path):
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "visiting":
+            raise RuleError(f"circular role dependency: {' -> '.join(path + [name])}")
+        if name not in by_name:
+            raise RuleError(f"unknown parent role: {name}")
+        state[name] = "visiting"
+        parent = by_name[name].get("requires")
+        if parent:
+            visit(parent.get("role"), path + [name])
+        state[name] = "done"
+        ordered.append(by_name[name])
+
+    for role in roles:
+        visit(role["name"], [])
+    return ordered
+
+
+def generate_source(spec):
+    """Return (ordered roles, Python source) for a parsed rule spec"""
+    _check_structure(spec)
+    if spec.get("version") != 1:
+        raise RuleError(f"unsupported rule file version: {spec.get('version')!r}")
+    fields = {}
+    limits = {}
+    for name, info in spec.get("fields", {}).items():
+        _check_identifier(name, "field name")
+        if info.get("type") not in FIELD_TYPES:
+            raise RuleError(f"field {name}: type must be one of {FIELD_TYPES}")
+        fields[name] = info["type"]
+        limits[name] = info.get("max")
+
+    gen = _Generator(fields)
+    roles = _order_roles(spec.get("roles", []))
+    lines = []
+    for role in roles:
+        name = role["name"]
+        function = _check_identifier(role.get("function", f"check_{name}"), "function name")
+        parent = role.get("requires")
+        status = _check_identifier(parent["as"], "parent argument") if parent else None
+        inputs = [_check_identifier(arg, "input") for arg in role.get("inputs", [])]
+        for arg in inputs:
+            if arg != status and arg not in fields:
+                raise RuleError(f"role {name}: unknown input {arg!r}")
+        if parent and status not in inputs:
+            raise RuleError(f"role {name}: parent argument {status!r} missing from inputs")
+
+        condition = gen.condition(role.get("when"), inputs, vector=False)
+        kernel_condition = gen.condition(role.get("when"), inputs, vector=True)
+        args = ", ".join(inputs)
+
+        lines.append(f"def {function}({args}):")
+        for arg in inputs:
+            if arg == status:
+                lines.append(f"    _status({arg!r}, {arg})")
+            elif fields[arg] == "flag":
+                lines.append(f"    _flag({arg!r}, {arg})")
+            else:
+                lines.append(f"    _count({arg!r}, {arg}, {limits[arg]!r})")
+        guard = f"{status} == ELIGIBLE and {condition}" if parent else condition
+        lines.append(f"    if {guard}:")
+        lines.append("        return ELIGIBLE")
+        lines.append("    return NOT_ELIGIBLE")
+        lines.append("")
+        lines.append(f"def kernel_{name}({args}):")
+        body = f"{status} & {kernel_condition}" if parent else kernel_condition
+        lines.append(f"    return {body}")
+        lines.append("")
+    return roles, "\n".join(lines)
+
+
+def compile_rules(spec, filename="<rules>"):
+    """Compile a parsed rule spec into a RuleSet"""
+    roles, source = generate_source(spec)
+    namespace = {
+        "_k": skeleton,
+        "_status": skeleton._validate_status,
+        "_flag": skeleton._validate_flag,
+        "_count": skeleton._validate_count,
+        "ELIGIBLE": skeleton.ELIGIBLE,
+        "NOT_ELIGIBLE": skeleton.NOT_ELIGIBLE,
+    }
+    exec(compile(source, filename, "exec"), namespace)
+    scalar = {}
+    kernels = {}
+    for role in roles:
+        function = role.get("function", f"check_{role['name']}")
+        scalar[function] = namespace[function]
+        kernels[role["name"]] = namespace[f"kernel_{role['name']}"]
+    fields = {name: (info["type"], info.get("max")) for name, info in spec.get("fields", {}).items()}
+    return RuleSet(roles, scalar, kernels, source, fields)
+
+
+def load_rules(path=DEFAULT_RULES):
+    """Load and compile a rule file (the bundled defaults reproduce skeleton.py)"""
+    with open(path, encoding="utf-8") as f:
+        try:
+            spec = json.load(f)
+        except ValueError as exc:
+            raise RuleError(f"{path}: {exc}") from None
+    return compile_rules(spec, path)
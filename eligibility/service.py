@@ -0,0 +1,279 @@
+"""
+Asyncio HTTP eligibility service (stdlib only).
+
+Endpoints (JSON in, JSON out):
+
+    GET  /health          -> {"status": "ok"}
+    GET  /metrics         -> eligibility.instrument snapshot (JSON, or
+                             Prometheus-style text with ?format=text)
+    POST /evaluate        one worker object -> its five verdicts
+    POST /evaluate/bulk   list of worker objects (or {"workers": [...]})
+                          -> list of verdict objects, in request order
+
+Worker objects use the roster field names (yes/no strings or JSON
+booleans for flags). Concurrent /evaluate requests are coalesced into
+micro-batches: a batch is flushed when it reaches max_batch workers or
+max_delay seconds after its first worker arrived, whichever is first.
+
+    python -m eligibility.service --port 8080
+"""
+
+import asyncio
+import json
+
+import skeleton
+from eligibility import stream, tables
+
+try:
+    import numpy as np
+except ImportError:  # fall back to per-worker table lookups
+    np = None
+
+MAX_BODY = 64 * 1024 * 1024
+MAX_HEADERS = 100
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 431: "Request Header Fields Too Large", 500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    """A request that is answered with an error status"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def evaluate_many(workers):
+    """Return one role mask per validated worker tuple"""
+    if np is not None and len(workers) > 1:
+        columns = {name: np.array(values) for name, values in zip(stream.FIELDS, zip(*workers))}
+        # Counts beyond int64 (valid for check_*) only fit object arrays
+        if all(column.dtype != object for column in columns.values()):
+            return tables.evaluate_role_masks(columns, validate=False).tolist()
+    compiled = tables.get_tables()
+    return [tables.ROLE_TABLE[compiled.compile(*worker)] for worker in workers]
+
+
+def verdicts(mask, worker_id=None):
+    result = {} if worker_id is None else {stream.ID_FIELD: worker_id}
+    for role, bit in tables.ROLE_BIT.items():
+        result[role] = skeleton.ELIGIBLE if mask & bit else skeleton.NOT_ELIGIBLE
+    return result
+
+
+def parse_worker(record):
+    """Parse and validate one JSON worker object; raises ValueError"""
+    if not isinstance(record, dict):
+        raise ValueError("worker must be a JSON object")
+    worker = stream.parse_record(record)
+    stream.validate_worker(worker)
+    return worker
+
+
+class MicroBatcher:
+    """Coalesce single-worker evaluations into batches"""
+
+    def __init__(self, max_batch=512, max_delay=0.001):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.batches = 0
+        self.evaluated = 0
+        self._pending = []
+        self._timer = None
+
+    def submit(self, worker):
+        """Queue a validated worker tuple; returns a future for its role mask"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((worker, future))
+        if len(self._pending) >= self.max_batch:
+            self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self.flush)
+        return future
+
+    def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        try:
+            masks = evaluate_many([worker for worker, _ in pending])
+        except Exception:
+            # Evaluate one by one so a failure only reaches its own request
+            masks = []
+            for worker, future in pending:
+                try:
+                    masks.append(evaluate_many([worker])[0])
+                except Exception as exc:
+                    masks.append(None)
+                    if not future.done():
+                        future.set_exception(exc)
+        self.batches += 1
+        self.evaluated += len(pending)
+        for (_, future), mask in zip(pending, masks):
+            if not future.done():
+                future.set_result(mask)
+
+
+class EligibilityService:
+    """HTTP/1.1 server with keep-alive over asyncio streams"""
+
+    def __init__(self, host="127.0.0.1", port=8080, max_batch=512, max_delay=0.001):
+        self.host = host
+        self.port = port
+        self.batcher = MicroBatcher(max_batch, max_delay)
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        # Report the real port when 0 asked the OS to pick one
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, body, keep_alive = request
+                status, payload = await self._dispatch(method, path, body)
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except HTTPError as exc:
+            # The rest of the request cannot be trusted; answer and hang up
+            self._write_response(writer, exc.status, {"error": str(exc)}, False)
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_line(reader, status, what):
+        try:
+            return await reader.readline()
+        except ValueError:
+            # Longer than the reader's limit (asyncio.LimitOverrunError)
+            raise HTTPError(status, f"{what} too long") from None
+
+    async def _read_request(self, reader):
+        line = await self._read_line(reader, 400, "request line")
+        if not line:
+            return None
+        parts = line.decode("latin-1").split()
+        if len(parts) != 3:
+            raise HTTPError(400, "malformed request line")
+        method, path, version = parts
+        headers = {}
+        while True:
+            line = await self._read_line(reader, 431, "header line")
+            if line in (b"\r\n", b"\n", b""):
+                break
+            if len(headers) >= MAX_HEADERS:
+                raise HTTPError(431, f"more than {MAX_HEADERS} headers")
+            name, colon, value = line.decode("latin-1").partition(":")
+            if not colon or not name.strip():
+                raise HTTPError(400, "malformed header line")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", 0) or 0)
+        except ValueError:
+            raise HTTPError(400, "invalid Content-Length") from None
+        if length < 0:
+            raise HTTPError(400, "invalid Content-Length")
+        if length > MAX_BODY:
+            raise HTTPError(413, f"body exceeds {MAX_BODY} bytes")
+        body = await reader.readexactly(length) if length else b""
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        return method, path, body, keep_alive
+
+    @staticmethod
+    def _write_response(writer, status, payload, keep_alive):
+        if isinstance(payload, str):
+            body, content_type = payload.encode("utf-8"), "text/plain; charset=utf-8"
+        else:
+            body, content_type = json.dumps(payload).encode("utf-8"), "application/json"
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+
+    async def _dispatch(self, method, path, body):
+        path, _, query = path.partition("?")
+        if path == "/health":
+            return 200, {"status": "ok"}
+        if path == "/metrics":
+            from eligibility import instrument
+
+            return 200, instrument.to_text() if query == "format=text" else instrument.snapshot()
+        if path not in ("/evaluate", "/evaluate/bulk"):
+            return 404, {"error": f"no such endpoint: {path}"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+        try:
+            data = json.loads(body or b"null")
+            if path == "/evaluate":
+                worker = parse_worker(data)
+                mask = await self.batcher.submit(worker)
+                return 200, verdicts(mask, data.get(stream.ID_FIELD))
+            return 200, self._evaluate_bulk(data)
+        except ValueError as exc:
+            return 400, {"error": str(exc)}
+        except Exception as exc:
+            return 500, {"error": f"{type(exc).__name__}: {exc}"}
+
+    @staticmethod
+    def _evaluate_bulk(data):
+        records = data.get("workers") if isinstance(data, dict) else data
+        if not isinstance(records, list):
+            raise ValueError("bulk body must be a list of workers")
+        workers = []
+        for position, record in enumerate(records):
+            try:
+                workers.append(parse_worker(record))
+            except ValueError as exc:
+                raise ValueError(f"worker {position}: {exc}") from None
+        masks = evaluate_many(workers) if workers else []
+        return [verdicts(mask, record.get(stream.ID_FIELD)) for record, mask in zip(records, masks)]
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Worker eligibility HTTP service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-batch", type=int, default=512)
+    parser.add_argument("--max-delay", type=float, default=0.001, help="seconds")
+    args = parser.parse_args(argv)
+    service = EligibilityService(args.host, args.port, args.max_batch, args.max_delay)
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Publishing verdict bitmasks through named shared memory.
+
+One screening run can feed several consumer processes without each of them
+recomputing or deserialising the verdicts. The publisher owns a
+multiprocessing.shared_memory segment:
+
+    header  magic b"WSSM", uint16 version, uint16 role count,
+            uint64 generation, uint64 rows, uint64 capacity,
+            int64 x 5 threshold constants (skeleton.current_thresholds order)
+    data    at DATA_OFFSET: one skeleton.Role bitmask byte per worker
+
+    with VerdictPublisher("roster-verdicts", capacity=len(roster)) as publisher:
+        publisher.publish_columns(columns)          # runs the batch engine
+
+    with VerdictReader("roster-verdicts") as reader:
+        snapshot = reader.wait(after=0)
+        trainers = snapshot.workers("trainer")
+
+The generation works as a sequence lock. It is odd while the publisher
+writes and even once a generation is complete. Readers only accept a
+snapshot when the generation was even and unchanged before and after they
+read the header. A zero-copy snapshot's masks view keeps pointing at the
+segment, so it shows the next generation once that is published. Check
+reader.is_current(snapshot) or ask for copy=True.
+"""
+
+import os
+import struct
+import sys
+import time
+import weakref
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+import skeleton
+
+MAGIC = b"WSSM"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQQQ5q")
+GENERATION = struct.Struct("<Q")
+GENERATION_OFFSET = 8
+DATA_OFFSET = 128
+DEFAULT_POLL = 0.001
+
+
+def _tracker_name(name):
+    """Name the resource tracker records for a POSIX segment"""
+    return name if name.startswith("/") else "/" + name
+
+
+class Snapshot:
+    """One published generation: role masks plus the constants they were computed with"""
+
+    __slots__ = ("generation", "rows", "thresholds", "masks")
+
+    def __init__(self, generation, rows, thresholds, masks):
+        self.generation = generation
+        self.rows = rows
+        self.thresholds = thresholds
+        self.masks = masks
+
+    def mask(self, role):
+        """Bool array: eligible for role (a ROLES name)"""
+        return (self.masks & int(skeleton.ROLE_FLAGS[role])) != 0
+
+    def workers(self, role):
+        """Row numbers of the workers eligible for role"""
+        return np.flatnonzero(self.mask(role))
+
+    def roles(self):
+        """Return {role: bool array} like eligibility.batch.evaluate_columns"""
+        return {role: self.mask(role) for role in skeleton.ROLES}
+
+
+class VerdictPublisher:
+    """Owner of a verdict segment; publish() writes a new generation"""
+
+    def __init__(self, name=None, capacity=0):
+        if capacity < 0:
+            raise ValueError("capacity must not be negative")
+        self.shm = shared_memory.SharedMemory(name=name, create=True, size=DATA_OFFSET + max(capacity, 1))
+        self.name = self.shm.name
+        self.capacity = capacity
+        self.generation = 0
+        self._write_header(0, 0, skeleton.current_thresholds())
+
+    def _write_header(self, generation, rows, thresholds):
+        HEADER.pack_into(self.shm.buf, 0, MAGIC, VERSION, len(skeleton.ROLES), generation, rows,
+                         self.capacity, *thresholds)
+
+    def publish(self, masks, thresholds=None):
+        """Publish one uint8 role mask per worker as the next generation; returns its number"""
+        masks = np.asarray(masks, dtype=np.uint8).reshape(-1)
+        if len(masks) > self.capacity:
+            raise ValueError(f"{len(masks)} rows do not fit a segment of capacity {self.capacity}")
+        thresholds = skeleton.current_thresholds() if thresholds is None else tuple(thresholds)
+        buf = self.shm.buf
+        # Odd generation: readers retry until the even one below is written
+        odd = 2 * self.generation + 1
+        GENERATION.pack_into(buf, GENERATION_OFFSET, odd)
+        np.frombuffer(buf, dtype=np.uint8, count=len(masks), offset=DATA_OFFSET)[:] = masks
+        self._write_header(odd, len(masks), thresholds)
+        self.generation += 1
+        GENERATION.pack_into(buf, GENERATION_OFFSET, 2 * self.generation)
+        return self.generation
+
+    def publish_columns(self, columns, validate=True):
+        """Evaluate column arrays with the batch engine and publish the role masks"""
+        from eligibility import tables
+
+        return self.publish(tables.evaluate_role_masks(columns, validate))
+
+    def close(self, unlink=True):
+        self.shm.close()
+        if unlink:
+            # A reader sharing our resource tracker may have unregistered the
+            # name; registering again keeps unlink()'s unregister balanced
+            if os.name == "posix":
+                resource_tracker.register(_tracker_name(self.name), "shared_memory")
+            self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class VerdictReader:
+    """Attach to a published segment by name"""
+
+    def __init__(self, name):
+        # Only the publisher may unlink the segment; a tracked attachment
+        # would be removed by the resource tracker when this process exits
+        if sys.version_info >= (3, 13):
+            self.shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            if os.name == "posix":
+                resource_tracker.unregister(_tracker_name(self.shm.name), "shared_memory")
+        self.name = name
+        magic, version = HEADER.unpack_from(self.shm.buf, 0)[:2]
+        if magic != MAGIC or version != VERSION:
+            self.shm.close()
+            raise ValueError(f"{name} is not a verdict segment")
+        # Zero-copy snapshots are slices of this one array
+        self._data = np.frombuffer(self.shm.buf[DATA_OFFSET:], dtype=np.uint8)
+
+    @property
+    def generation(self):
+        """Number of the last complete generation (0 before the first publish)"""
+        return GENERATION.unpack_from(self.shm.buf, GENERATION_OFFSET)[0] // 2
+
+    def is_current(self, snapshot):
+        return GENERATION.unpack_from(self.shm.buf, GENERATION_OFFSET)[0] == 2 * snapshot.generation
+
+    def _try_read(self, copy):
+        buf = self.shm.buf
+        before = GENERATION.unpack_from(buf, GENERATION_OFFSET)[0]
+        if before % 2:
+            return None
+        _, _, _, _, rows, _, *thresholds = HEADER.unpack_from(buf, 0)
+        masks = self._data[:rows]
+        if copy:
+            masks = masks.copy()
+        if GENERATION.unpack_from(buf, GENERATION_OFFSET)[0] != before:
+            return None
+        return Snapshot(before // 2, rows, tuple(thresholds), masks)
+
+    def read(self, copy=False, poll=DEFAULT_POLL):
+        """Return a Snapshot of the latest complete generation"""
+        while True:
+            snapshot = self._try_read(copy)
+            if snapshot is not None:
+                return snapshot
+            time.sleep(poll)
+
+    def wait(self, after=0, timeout=None, copy=False, poll=DEFAULT_POLL):
+        """Block until a generation newer than after is complete and return it
+
+        Raises TimeoutError if none arrives within timeout seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self._try_read(copy)
+            if snapshot is not None and snapshot.generation > after:
+                return snapshot
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"no generation after {after} within {timeout}s")
+            time.sleep(poll)
+
+    def close(self):
+        if self._data is None:
+            return
+        view = weakref.ref(self._data.base)
+        self._data = None
+        try:
+            self.shm.close()
+        except BufferError:
+            # Zero-copy snapshots still reference the mapping; finish closing
+            # once the last of them is freed
+            weakref.finalize(view(), self.shm.close).atexit = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
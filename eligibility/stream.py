@@ -0,0 +1,310 @@
+"""
+Streaming CSV/JSONL roster evaluation with constant memory.
+
+Rows are parsed lazily, pushed through the scalar check_* chain in chunks
+and written out as they are produced, so memory use does not depend on the
+size of the roster. Malformed rows are counted and skipped.
+"""
+
+import csv
+import json
+import struct
+import sys
+import time
+from itertools import islice
+
+import skeleton
+
+FLAG_FIELDS = ("safety_training", "certification", "first_aid", "night_approved", "team_leader")
+INT_FIELDS = ("safety_score", "experience", "incidents", "training_score", "attendance")
+# Positional order of skeleton's inputs; every parsed worker is a tuple in this order
+FIELDS = (
+    "safety_training", "safety_score", "experience", "incidents",
+    "certification", "training_score", "first_aid", "attendance",
+    "night_approved", "team_leader",
+)
+# Fields capped at 100 by the check_* validation; the rest only need to be >= 0
+UPPER_LIMITS = {"safety_score": 100, "training_score": 100, "attendance": 100}
+ID_FIELD = "worker_id"
+OUTPUT_FIELDS = (ID_FIELD,) + skeleton.ROLES
+
+TRUE_WORDS = frozenset(("yes", "y", "true", "t", "1"))
+FALSE_WORDS = frozenset(("no", "n", "false", "f", "0"))
+
+DEFAULT_CHUNK_SIZE = 4096
+
+# Binary verdict output: this header, then one skeleton.Role bitmask byte per row
+BINARY_MAGIC = b"WSEV"
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct("<4sHH")
+OUTPUT_FORMATS = ("csv", "jsonl", "binary")
+
+
+class StreamStats:
+    """Counters reported at the end of a streaming run"""
+
+    __slots__ = ("rows", "errors", "started", "elapsed")
+
+    def __init__(self):
+        self.rows = 0
+        self.errors = 0
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def finish(self):
+        self.elapsed = time.perf_counter() - self.started
+
+    @property
+    def rows_per_sec(self):
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self):
+        return (f"{self.rows} rows in {self.elapsed:.2f}s "
+                f"({self.rows_per_sec:,.0f} rows/sec), {self.errors} parse errors")
+
+
+def parse_flag(name, value):
+    """Parse a yes/no style flag; JSON booleans pass through"""
+    if isinstance(value, bool):
+        return value
+    word = str(value).strip().lower()
+    if word in TRUE_WORDS:
+        return True
+    if word in FALSE_WORDS:
+        return False
+    raise ValueError(f"{name}: not a yes/no value: {value!r}")
+
+
+def parse_int(name, value):
+    """Parse an integer field; JSON numbers must already be integral"""
+    if isinstance(value, bool):
+        raise ValueError(f"{name}: not an integer: {value!r}")
+    if isinstance(value, int):
+        return value
+    try:
+        return int(str(value).strip())
+    except ValueError:
+        raise ValueError(f"{name}: not an integer: {value!r}") from None
+
+
+def parse_record(record):
+    """Turn a raw mapping into a worker tuple in FIELDS order"""
+    try:
+        return tuple(parse_flag(name, record[name]) if name in FLAG_FIELDS
+                     else parse_int(name, record[name])
+                     for name in FIELDS)
+    except KeyError as exc:
+        raise ValueError(f"missing field {exc.args[0]}") from None
+
+
+def validate_worker(worker):
+    """Apply the check_* input validation to a parsed worker tuple
+
+    Raises ValueError exactly when running the scalar chain would.
+    """
+    (safety_training, safety_score, experience, incidents, certification,
+     training_score, first_aid, attendance, night_approved, team_leader) = worker
+    # Plain bools and in-range ints pass without a validator call each; bool
+    # cannot be subclassed, and anything else gets the validators' verdict
+    if (type(safety_training) is bool and type(certification) is bool and type(first_aid) is bool
+            and type(night_approved) is bool and type(team_leader) is bool
+            and type(safety_score) is int and 0 <= safety_score <= 100
+            and type(experience) is int and experience >= 0
+            and type(incidents) is int and incidents >= 0
+            and type(training_score) is int and 0 <= training_score <= 100
+            and type(attendance) is int and 0 <= attendance <= 100):
+        return
+    for name, value in zip(FIELDS, worker):
+        if name in FLAG_FIELDS:
+            skeleton._validate_flag(name, value)
+        else:
+            skeleton._validate_count(name, value, UPPER_LIMITS.get(name))
+
+
+def run_chain(worker):
+    """Run the scalar check_* chain for one worker tuple and return five verdicts"""
+    (safety_training, safety_score, experience, incidents, certification,
+     training_score, first_aid, attendance, night_approved, team_leader) = worker
+    basic_eligible = skeleton.check_basic_eligibility(safety_training, safety_score, experience, incidents)
+    machine_eligible = skeleton.check_machine_operator(basic_eligible, certification, training_score)
+    supervisor_eligible = skeleton.check_safety_supervisor(machine_eligible, first_aid, attendance)
+    night_eligible = skeleton.check_night_shift(basic_eligible, night_approved, team_leader, experience)
+    trainer_eligible = skeleton.check_trainer(supervisor_eligible, incidents, team_leader)
+    return basic_eligible, machine_eligible, supervisor_eligible, night_eligible, trainer_eligible
+
+
+def explicit_worker_id(record):
+    """Return the record's worker_id column, or None if it has none"""
+    value = record.get(ID_FIELD)
+    return None if value in (None, "") else value
+
+
+def iter_records(stream, fmt, fieldnames=None):
+    """Yield (row number, raw mapping or None) for each input row
+
+    Rows are numbered from 1. A None mapping marks a line that could not be
+    decoded at all. fieldnames lets a CSV reader start mid-file without a
+    header line.
+    """
+    if fmt == "csv":
+        records = csv.DictReader(stream, fieldnames=fieldnames)
+    elif fmt == "jsonl":
+        records = _iter_json_lines(stream)
+    else:
+        raise ValueError(f"unsupported format: {fmt}")
+    return enumerate(records, 1)
+
+
+def _iter_json_lines(stream):
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield None
+            continue
+        yield record if isinstance(record, dict) else None
+
+
+def iter_workers(stream, fmt, stats, fieldnames=None):
+    """Yield (row number, worker_id or None, worker tuple) for every parsable row
+
+    Rows that fail to parse are counted in stats and skipped.
+    """
+    for number, record in iter_records(stream, fmt, fieldnames):
+        if record is None:
+            stats.errors += 1
+            continue
+        try:
+            worker = parse_record(record)
+        except ValueError:
+            stats.errors += 1
+            continue
+        yield number, explicit_worker_id(record), worker
+
+
+def evaluate_workers(workers, stats, chunk_size=DEFAULT_CHUNK_SIZE, evaluate=run_chain, strategy="auto"):
+    """Yield lists of (row number, worker_id, verdicts) of at most chunk_size entries
+
+    Each chunk goes through eligibility.dedup, so repeated profiles within a
+    chunk are evaluated once (strategy as in dedup.evaluate_bulk). Workers
+    rejected by the check_* validation are counted as parse errors.
+    """
+    from eligibility.dedup import evaluate_bulk
+
+    workers = iter(workers)
+    while True:
+        chunk = list(islice(workers, chunk_size))
+        if not chunk:
+            return
+        verdicts = evaluate_bulk([worker for _, _, worker in chunk], evaluate, strategy)
+        results = [(number, worker_id, verdict)
+                   for (number, worker_id, _), verdict in zip(chunk, verdicts) if verdict is not None]
+        stats.errors += len(chunk) - len(results)
+        stats.rows += len(results)
+        yield results
+
+
+class VerdictWriter:
+    """Write evaluated rows as CSV, JSONL or binary role masks
+
+    Rows without a worker_id are identified by their row number, shifted by
+    the offset passed to write_chunk (used when merging shards). The binary
+    format needs a byte stream and stores no ids, only rows in input order.
+    """
+
+    def __init__(self, stream, fmt):
+        self.stream = stream
+        self.fmt = fmt
+        if fmt == "csv":
+            self._csv = csv.writer(stream, lineterminator="\n")
+            self._csv.writerow(OUTPUT_FIELDS)
+        elif fmt == "binary":
+            stream.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(skeleton.ROLES)))
+        elif fmt != "jsonl":
+            raise ValueError(f"unsupported format: {fmt}")
+
+    def write_chunk(self, results, offset=0):
+        if self.fmt == "binary":
+            bits = tuple(skeleton.ROLE_FLAGS.values())
+            self.stream.write(bytes(
+                sum(int(bit) for bit, verdict in zip(bits, verdicts) if verdict == skeleton.ELIGIBLE)
+                for _, _, verdicts in results
+            ))
+            return
+        records = (((offset + number if worker_id is None else worker_id),) + tuple(verdicts)
+                   for number, worker_id, verdicts in results)
+        if self.fmt == "csv":
+            self._csv.writerows(records)
+        else:
+            self.stream.writelines(json.dumps(dict(zip(OUTPUT_FIELDS, record))) + "\n"
+                                   for record in records)
+
+
+def detect_format(path):
+    """Guess the format from a file name; stdin defaults to csv"""
+    if path.endswith((".jsonl", ".ndjson", ".json")):
+        return "jsonl"
+    if path.endswith(".wsec"):
+        return "columnar"
+    if path.endswith((".wsev", ".bin")):
+        return "binary"
+    return "csv"
+
+
+def open_sink(path, fmt):
+    """Open an output path ('-' for stdout) in the mode the format needs
+
+    Returns (stream, close) where close is None for stdout.
+    """
+    if fmt == "binary":
+        if path == "-":
+            return sys.stdout.buffer, None
+        sink = open(path, "wb")
+    else:
+        if path == "-":
+            return sys.stdout, None
+        sink = open(path, "w", newline="", encoding="utf-8")
+    return sink, sink.close
+
+
+def read_verdict_masks(data):
+    """Decode a binary verdict output back into a bytes object of role masks"""
+    magic, version, _ = BINARY_HEADER.unpack_from(data, 0)
+    if magic != BINARY_MAGIC or version != BINARY_VERSION:
+        raise ValueError("not a binary verdict file")
+    return bytes(data[BINARY_HEADER.size:])
+
+
+def stream_roster(source, sink, in_format="csv", out_format="csv", chunk_size=DEFAULT_CHUNK_SIZE):
+    """Evaluate every worker read from source and write verdicts to sink
+
+    Returns the StreamStats for the run.
+    """
+    stats = StreamStats()
+    writer = VerdictWriter(sink, out_format)
+    for results in evaluate_workers(iter_workers(source, in_format, stats), stats, chunk_size):
+        writer.write_chunk(results)
+    stats.finish()
+    return stats
+
+
+def run_batch(input_path, output_path="-", in_format=None, out_format=None,
+              chunk_size=DEFAULT_CHUNK_SIZE, report=sys.stderr):
+    """File-level entry point used by the `batch` subcommand"""
+    in_format = in_format or detect_format(input_path)
+    out_format = out_format or (detect_format(output_path) if output_path != "-" else in_format)
+
+    source = sys.stdin if input_path == "-" else open(input_path, newline="", encoding="utf-8")
+    sink, close_sink = open_sink(output_path, out_format)
+    try:
+        stats = stream_roster(source, sink, in_format, out_format, chunk_size)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if close_sink is not None:
+            close_sink()
+    if report is not None:
+        print(stats.summary(), file=report)
+    return stats
@@ -0,0 +1,132 @@
+"""
+What-if sweeps over the threshold constants.
+
+sweep() answers "how many workers would qualify for each role" for every
+combination of candidate thresholds without re-evaluating the roster per
+grid point:
+
+1. Each numeric column is ranked against its sorted candidate thresholds
+   (searchsorted), giving a pass level per worker: the worker passes
+   candidate j exactly when j < level.
+2. Workers are bucketed into a histogram over the five pass levels, one
+   histogram per role after applying the threshold-free flag conditions.
+3. Suffix cumulative sums turn each histogram into "number of workers that
+   pass at least these levels", which is the eligible count for every grid
+   point at once. The OR in has_required_performance is handled by
+   inclusion-exclusion over the experience and safety score axes.
+"""
+
+import numpy as np
+
+import skeleton
+from eligibility import batch
+
+# Axis order of every result grid, matching skeleton.current_thresholds()
+AXES = ("MIN_EXPERIENCE", "MIN_SAFETY_SCORE", "MAX_INCIDENTS", "MIN_TRAINING_SCORE", "MIN_ATTENDANCE")
+
+
+class SweepResult:
+    """Eligible counts per role over a grid of threshold values
+
+    counts[role] has one axis per entry of AXES, indexed like axes[name]
+    (sorted ascending).
+    """
+
+    def __init__(self, axes, counts, total):
+        self.axes = axes
+        self.counts = counts
+        self.total = total
+
+    def at(self, **thresholds):
+        """Return {role: count} for one grid point, e.g. at(MIN_ATTENDANCE=85)
+
+        Thresholds that are not given default to the current constants.
+        """
+        index = []
+        for name, current in zip(AXES, skeleton.current_thresholds()):
+            value = thresholds.get(name, current)
+            try:
+                index.append(self.axes[name].index(value))
+            except ValueError:
+                raise KeyError(f"{name}={value} is not on the sweep grid") from None
+        return {role: int(grid[tuple(index)]) for role, grid in self.counts.items()}
+
+    def rows(self):
+        """Yield (thresholds dict, {role: count}) for every grid point"""
+        shape = tuple(len(self.axes[name]) for name in AXES)
+        for index in np.ndindex(*shape):
+            point = {name: self.axes[name][i] for name, i in zip(AXES, index)}
+            yield point, {role: int(grid[index]) for role, grid in self.counts.items()}
+
+
+def _candidates(values, current):
+    if values is None:
+        return [current]
+    unique = sorted(set(int(v) for v in values))
+    if not unique:
+        raise ValueError("threshold ranges must not be empty")
+    return unique
+
+
+def _suffix_sums(hist):
+    for axis in range(hist.ndim):
+        hist = np.flip(np.cumsum(np.flip(hist, axis), axis=axis), axis)
+    return hist
+
+
+def _grid_counts(levels, mask, shape):
+    """Eligible counts over the grid for the workers selected by mask"""
+    hist = np.zeros(tuple(n + 1 for n in shape), dtype=np.int64)
+    np.add.at(hist, tuple(level[mask] for level in levels), 1)
+    suffix = _suffix_sums(hist)
+    # Passing grid point j on an axis means level >= j + 1
+    both = suffix[1:, 1:, 1:, 1:, 1:]
+    experience_only = suffix[1:, :1, 1:, 1:, 1:]
+    score_only = suffix[:1, 1:, 1:, 1:, 1:]
+    return experience_only + score_only - both
+
+
+def sweep(columns, MIN_EXPERIENCE=None, MIN_SAFETY_SCORE=None, MAX_INCIDENTS=None,
+          MIN_TRAINING_SCORE=None, MIN_ATTENDANCE=None):
+    """Count eligible workers per role for every combination of thresholds
+
+    Each keyword takes an iterable of candidate values; omitted ones are
+    fixed at the current module constant. Returns a SweepResult.
+    """
+    cols = batch.prepare_columns(columns)
+    requested = (MIN_EXPERIENCE, MIN_SAFETY_SCORE, MAX_INCIDENTS, MIN_TRAINING_SCORE, MIN_ATTENDANCE)
+    axes = {name: _candidates(values, current)
+            for name, values, current in zip(AXES, requested, skeleton.current_thresholds())}
+    shape = tuple(len(axes[name]) for name in AXES)
+
+    def at_least(name, column):
+        # Number of ascending candidates c with value >= c
+        return np.searchsorted(np.array(axes[name]), cols[column], side="right")
+
+    # Incidents pass when <= the threshold, so that axis is ranked in
+    # descending candidate order and flipped back at the end
+    incidents_axis = np.array(axes["MAX_INCIDENTS"])
+    incidents_level = len(incidents_axis) - np.searchsorted(incidents_axis, cols["incidents"], side="left")
+
+    full_training = np.full(len(incidents_level), shape[3])
+    full_attendance = np.full(len(incidents_level), shape[4])
+    basic_levels = (at_least("MIN_EXPERIENCE", "experience"), at_least("MIN_SAFETY_SCORE", "safety_score"),
+                    incidents_level, full_training, full_attendance)
+    machine_levels = basic_levels[:3] + (at_least("MIN_TRAINING_SCORE", "training_score"), full_attendance)
+    supervisor_levels = machine_levels[:4] + (at_least("MIN_ATTENDANCE", "attendance"),)
+
+    basic = cols["safety_training"]
+    machine = basic & cols["certification"]
+    supervisor = machine & cols["first_aid"]
+    night = basic & cols["night_approved"] & (cols["team_leader"] | (cols["experience"] >= skeleton.QUALIFYING_EXPERIENCE))
+    trainer = supervisor & ((cols["incidents"] == 0) | cols["team_leader"])
+
+    counts = {
+        "basic": _grid_counts(basic_levels, basic, shape),
+        "machine_operator": _grid_counts(machine_levels, machine, shape),
+        "safety_supervisor": _grid_counts(supervisor_levels, supervisor, shape),
+        "night_shift": _grid_counts(basic_levels, night, shape),
+        "trainer": _grid_counts(supervisor_levels, trainer, shape),
+    }
+    counts = {role: np.flip(grid, axis=2) for role, grid in counts.items()}
+    return SweepResult(axes, counts, len(basic))
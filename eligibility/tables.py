@@ -0,0 +1,265 @@
+"""
+Compiled truth-table engine for the role rules.
+
+Evaluation is split in two steps:
+
+1. compile: each worker is reduced to an 11-bit predicate vector (the five
+   raw flags plus the six intermediate predicates from skeleton.py). Every
+   numeric comparison is itself a lookup into a small per-column table
+   derived from the threshold constants.
+2. lookup: the vector indexes a 2048-byte role table whose bit i is set when
+   the worker is eligible for skeleton.ROLES[i].
+
+The per-column tables are rebuilt automatically whenever
+skeleton.rule_constants() changes; the role table only encodes the
+AND/OR structure of the rules and never changes.
+"""
+
+import skeleton
+from eligibility import stream
+
+try:
+    import numpy as np
+except ImportError:  # the scalar path is stdlib-only
+    np = None
+
+# Bit positions of the predicate vector
+PREDICATES = (
+    "safety_training", "certification", "first_aid", "night_approved", "team_leader",
+    "has_required_performance", "has_safe_record", "has_sufficient_training",
+    "has_good_attendance", "is_qualified", "has_trainer_qualification",
+)
+# Same bit layout as skeleton.Predicate, so vectors convert to it directly
+BIT = {name: int(skeleton.Predicate[name.upper()]) for name in PREDICATES}
+VECTOR_SIZE = 1 << len(PREDICATES)
+
+# Bit i of a role mask is skeleton.ROLES[i] (skeleton.Role)
+ROLE_BIT = {role: int(flag) for role, flag in skeleton.ROLE_FLAGS.items()}
+
+
+def _roles_for(vector):
+    """Role mask for one predicate vector, following the check_* nesting"""
+    def has(name):
+        return bool(vector & BIT[name])
+
+    basic = has("safety_training") and has("has_required_performance") and has("has_safe_record")
+    machine = basic and has("certification") and has("has_sufficient_training")
+    supervisor = machine and has("first_aid") and has("has_good_attendance")
+    night = basic and has("night_approved") and has("is_qualified")
+    trainer = supervisor and has("has_trainer_qualification")
+
+    mask = 0
+    for role, eligible in zip(skeleton.ROLES, (basic, machine, supervisor, night, trainer)):
+        if eligible:
+            mask |= ROLE_BIT[role]
+    return mask
+
+
+ROLE_TABLE = bytes(_roles_for(vector) for vector in range(VECTOR_SIZE))
+
+
+class CompiledTables:
+    """Per-column lookup tables for one set of threshold constants
+
+    Each table maps a (clamped) column value to the predicate bits it
+    contributes, so compiling a worker is a handful of lookups OR-ed together.
+    """
+
+    __slots__ = ("thresholds", "score", "experience", "experience_cap",
+                 "incidents", "incidents_cap", "training", "attendance",
+                 "team_leader", "_arrays")
+
+    def __init__(self, thresholds):
+        (min_experience, min_safety_score, max_incidents, min_training_score, min_attendance,
+         qualifying_experience) = thresholds
+        self.thresholds = thresholds
+
+        self.score = tuple(BIT["has_required_performance"] if s >= min_safety_score else 0
+                           for s in range(101))
+
+        # Every experience above the cap behaves exactly like the cap
+        self.experience_cap = max(min_experience, qualifying_experience)
+        self.experience = tuple(
+            (BIT["has_required_performance"] if e >= min_experience else 0)
+            | (BIT["is_qualified"] if e >= qualifying_experience else 0)
+            for e in range(self.experience_cap + 1)
+        )
+
+        self.incidents_cap = max(max_incidents + 1, 1)
+        self.incidents = tuple(
+            (BIT["has_safe_record"] if i <= max_incidents else 0)
+            | (BIT["has_trainer_qualification"] if i == 0 else 0)
+            for i in range(self.incidents_cap + 1)
+        )
+
+        self.training = tuple(BIT["has_sufficient_training"] if t >= min_training_score else 0
+                              for t in range(101))
+        self.attendance = tuple(BIT["has_good_attendance"] if a >= min_attendance else 0
+                                for a in range(101))
+        self.team_leader = BIT["team_leader"] | BIT["is_qualified"] | BIT["has_trainer_qualification"]
+        self._arrays = None
+
+    def compile(self, safety_training, safety_score, experience, incidents, certification,
+                training_score, first_aid, attendance, night_approved, team_leader):
+        """Return the predicate vector for one worker (inputs assumed valid)"""
+        vector = (self.score[safety_score]
+                  | self.experience[min(experience, self.experience_cap)]
+                  | self.incidents[min(incidents, self.incidents_cap)]
+                  | self.training[training_score]
+                  | self.attendance[attendance])
+        if safety_training:
+            vector |= BIT["safety_training"]
+        if certification:
+            vector |= BIT["certification"]
+        if first_aid:
+            vector |= BIT["first_aid"]
+        if night_approved:
+            vector |= BIT["night_approved"]
+        if team_leader:
+            vector |= self.team_leader
+        return vector
+
+    def arrays(self):
+        """NumPy versions of the column tables, built on first use"""
+        if self._arrays is None:
+            self._arrays = {
+                "score": np.array(self.score, dtype=np.uint16),
+                "experience": np.array(self.experience, dtype=np.uint16),
+                "incidents": np.array(self.incidents, dtype=np.uint16),
+                "training": np.array(self.training, dtype=np.uint16),
+                "attendance": np.array(self.attendance, dtype=np.uint16),
+                "roles": np.frombuffer(ROLE_TABLE, dtype=np.uint8),
+            }
+        return self._arrays
+
+
+_compiled = None
+
+
+def get_tables():
+    """Return the tables for the current constants, rebuilding them if they changed"""
+    global _compiled
+    thresholds = skeleton.rule_constants()
+    if _compiled is None or _compiled.thresholds != thresholds:
+        _compiled = CompiledTables(thresholds)
+    return _compiled
+
+
+def compile_worker(safety_training, safety_score, experience, incidents, certification,
+                   training_score, first_aid, attendance, night_approved, team_leader):
+    """Validate one worker's inputs and return its predicate vector"""
+    worker = (safety_training, safety_score, experience, incidents, certification,
+              training_score, first_aid, attendance, night_approved, team_leader)
+    stream.validate_worker(worker)
+    return get_tables().compile(*worker)
+
+
+def lookup(vector):
+    """Return the role mask for a predicate vector"""
+    return ROLE_TABLE[vector]
+
+
+def evaluate_worker(*args, **kwargs):
+    """Return the role mask for one worker (same arguments as compile_worker)"""
+    return ROLE_TABLE[compile_worker(*args, **kwargs)]
+
+
+def compile_columns(columns, validate=True):
+    """Return a uint16 predicate vector per worker for a mapping of column arrays"""
+    from eligibility.batch import prepare_columns
+
+    cols = prepare_columns(columns, validate)
+    tables = get_tables()
+    t = tables.arrays()
+    vector = (t["score"][cols["safety_score"]]
+              | t["experience"][np.minimum(cols["experience"], tables.experience_cap)]
+              | t["incidents"][np.minimum(cols["incidents"], tables.incidents_cap)]
+              | t["training"][cols["training_score"]]
+              | t["attendance"][cols["attendance"]])
+    for name in ("safety_training", "certification", "first_aid", "night_approved"):
+        vector |= cols[name].astype(np.uint16) * np.uint16(BIT[name])
+    vector |= cols["team_leader"].astype(np.uint16) * np.uint16(tables.team_leader)
+    return vector
+
+
+def evaluate_role_masks(columns, validate=True):
+    """Return one uint8 role mask per worker"""
+    return get_tables().arrays()["roles"][compile_columns(columns, validate)]
+
+
+def evaluate_columns(columns, validate=True):
+    """Table-driven equivalent of eligibility.batch.evaluate_columns"""
+    masks = evaluate_role_masks(columns, validate)
+    return {role: (masks & bit) != 0 for role, bit in ROLE_BIT.items()}
+
+
+# Predicate bits that some role requires; team_leader only matters through
+# is_qualified and has_trainer_qualification
+REQUIRED_BITS = int(skeleton.ROLE_REQUIREMENTS["trainer"] | skeleton.ROLE_REQUIREMENTS["night_shift"])
+ROLE_REQUIREMENTS = {role: int(bits) for role, bits in skeleton.ROLE_REQUIREMENTS.items()}
+
+
+def explain_columns(columns, validate=True):
+    """Return (role masks, failed predicates) for every worker in one pass
+
+    Both come from the same eligibility.batch predicate arrays: role masks
+    are the {role: bool array} of batch.evaluate_columns, and failed is a
+    uint16 of skeleton.Predicate bits for every requirement the worker does
+    not meet. A worker misses role r because of failed & ROLE_REQUIREMENTS[r].
+    """
+    from eligibility import batch
+
+    cols = batch.prepare_columns(columns, validate)
+    p = batch.compute_predicates(cols)
+    return batch.combine_roles(cols, p), _failed_bits(cols, p)
+
+
+def _failed_bits(cols, p):
+    """Pack the required predicates that are false into uint16 Predicate bits
+
+    The bits are gathered in two uint8 planes (bits 0-7 and 8-15) from the
+    bool arrays viewed as 0/1 bytes and widened once at the end; uint8
+    multiply/or is far cheaper per element than shifting into a uint16.
+    """
+    scaled = np.empty(len(cols["team_leader"]), np.uint8)
+    planes = []
+    for shift in (0, 8):
+        plane = np.zeros_like(scaled)
+        for name, bit in BIT.items():
+            byte = (REQUIRED_BITS & bit) >> shift & 0xFF
+            if byte:
+                flags = (p[name] if name in p else cols[name]).astype(np.bool_, copy=False)
+                np.multiply(flags.view(np.uint8), np.uint8(byte), out=scaled)
+                plane |= scaled
+        planes.append(plane)
+    failed = planes[1].astype(np.uint16)
+    failed *= np.uint16(256)
+    failed |= planes[0]
+    failed ^= np.uint16(REQUIRED_BITS)
+    return failed
+
+
+def role_reasons(failed, role):
+    """Reason codes (Predicate bits) that block role, per worker; 0 means eligible"""
+    return failed & np.uint16(ROLE_REQUIREMENTS[role])
+
+
+def reason_counts(failed, role):
+    """Return {predicate name: number of workers failing it} for role
+
+    A worker failing several requirements is counted under each of them.
+    """
+    reasons = role_reasons(failed, role)
+    return {name: int(np.count_nonzero(reasons & np.uint16(bit)))
+            for name, bit in BIT.items() if ROLE_REQUIREMENTS[role] & bit}
+
+
+def reason_histogram(failed, role):
+    """Return {reason code: worker count} over the distinct failure combinations of role"""
+    codes, counts = np.unique(role_reasons(failed, role), return_counts=True)
+    return {int(code): int(count) for code, count in zip(codes, counts) if code}
+
+
+def describe(code):
+    """Names of the predicates in a reason code"""
+    return [name for name, bit in BIT.items() if code & bit]
@@ -0,0 +1,218 @@
+"""
+Rolling attendance and incident aggregates from raw events.
+
+check_safety_supervisor and check_trainer take attendance (a percentage)
+and incidents (a count) as precomputed inputs. WindowAggregator derives
+them from a stream of shift and incident events, over sliding windows of
+whole buckets (days by default):
+
+    attendance  attended shifts * 100 // scheduled shifts, last 30 buckets
+    incidents   incidents recorded in the last 365 buckets
+
+Every worker has a slot in flat array ring buffers with one byte per bucket
+(per-bucket counts saturate at 255), so the default windows cost about
+450 bytes per worker. Running window sums are kept next to the rings, and
+a ring is only rotated when its worker is touched. Each bucket that
+receives a worker's first event is also filed under the bucket in which it
+leaves the window, so advancing the clock only visits the workers whose
+aggregates actually lose events.
+
+The aggregates feed an IncrementalEngine holding the rest of each worker's
+inputs, so only verdicts that actually flip are emitted:
+
+    aggregator = WindowAggregator()
+    aggregator.add_worker("w1", safety_training=True, safety_score=90, ...)
+    for worker_id, role, eligible in aggregator.process(events):
+        ...
+
+Events are ("shift", worker_id, timestamp, attended) and
+("incident", worker_id, timestamp) tuples with timestamps in seconds.
+Events older than the window are counted in late and otherwise ignored.
+"""
+
+from array import array
+
+from eligibility import stream
+from eligibility.incremental import STORAGE_LIMITS, IncrementalEngine
+
+DAY = 86400
+DEFAULT_ATTENDANCE_WINDOW = 30
+DEFAULT_INCIDENT_WINDOW = 365
+# Attendance reported for a worker without scheduled shifts in the window
+NO_SHIFTS_ATTENDANCE = 0
+BUCKET_LIMIT = 255
+# Window incident counts are capped at what the engine stores; far above
+# any MAX_INCIDENTS, so no verdict changes
+INCIDENT_LIMIT = STORAGE_LIMITS["incidents"]
+AGGREGATED_FIELDS = ("attendance", "incidents")
+
+
+class _Ring:
+    """One window of per-bucket counts for every slot, plus their sums"""
+
+    def __init__(self, width):
+        if width < 1:
+            raise ValueError("window must cover at least one bucket")
+        self.width = width
+        self.counts = array("B")
+        self.sums = array("L")
+
+    def add_slot(self):
+        self.counts.extend(bytes(self.width))
+        self.sums.append(0)
+
+    def expire(self, slot, last, bucket):
+        """Drop the buckets after last up to bucket, which leave the window"""
+        base = slot * self.width
+        if bucket - last >= self.width:
+            self.counts[base:base + self.width] = array("B", bytes(self.width))
+            self.sums[slot] = 0
+            return
+        counts = self.counts
+        for b in range(last + 1, bucket + 1):
+            i = base + b % self.width
+            if counts[i]:
+                self.sums[slot] -= counts[i]
+                counts[i] = 0
+
+    def add(self, slot, bucket, count=1):
+        """Add to a bucket's count; returns True if the bucket was empty"""
+        i = slot * self.width + bucket % self.width
+        was_empty = not self.counts[i]
+        count = min(count, BUCKET_LIMIT - self.counts[i])
+        self.counts[i] += count
+        self.sums[slot] += count
+        return was_empty
+
+
+class WindowAggregator:
+    """Windowed attendance and incident counts feeding an IncrementalEngine"""
+
+    def __init__(self, bucket_seconds=DAY, attendance_window=DEFAULT_ATTENDANCE_WINDOW,
+                 incident_window=DEFAULT_INCIDENT_WINDOW, engine=None):
+        if bucket_seconds <= 0:
+            raise ValueError("bucket_seconds must be positive")
+        self.bucket_seconds = bucket_seconds
+        self.engine = engine or IncrementalEngine()
+        self._scheduled = _Ring(attendance_window)
+        self._attended = _Ring(attendance_window)
+        self._incidents = _Ring(incident_window)
+        self._index = {}
+        self._ids = []
+        self._last = array("q")
+        # Bucket in which events leave a window -> slots holding such events
+        self._expiring = {}
+        self.now = None
+        self.late = 0
+        self.unknown = 0
+
+    def __len__(self):
+        return len(self._ids)
+
+    def bucket(self, timestamp):
+        return int(timestamp // self.bucket_seconds)
+
+    def add_worker(self, worker_id, **fields):
+        """Register a worker with its other inputs; returns its role mask
+
+        attendance and incidents come from the windows and must not be given.
+        The worker starts with empty windows.
+        """
+        given = [name for name in AGGREGATED_FIELDS if name in fields]
+        if given:
+            raise ValueError(f"{', '.join(given)} are aggregated from events")
+        if worker_id not in self._index:
+            self._index[worker_id] = len(self._ids)
+            self._ids.append(worker_id)
+            self._last.append(self.now if self.now is not None else 0)
+            for ring in (self._scheduled, self._attended, self._incidents):
+                ring.add_slot()
+        return self.engine.add(worker_id, **fields, **self.aggregates(worker_id))
+
+    def aggregates(self, worker_id):
+        """Return {"attendance": percent, "incidents": count} over the current windows"""
+        slot = self._index[worker_id]
+        self._expire(slot)
+        scheduled = self._scheduled.sums[slot]
+        attendance = self._attended.sums[slot] * 100 // scheduled if scheduled else NO_SHIFTS_ATTENDANCE
+        return {"attendance": attendance, "incidents": min(self._incidents.sums[slot], INCIDENT_LIMIT)}
+
+    def _expire(self, slot):
+        if self.now is None or self._last[slot] >= self.now:
+            return
+        for ring in (self._scheduled, self._attended, self._incidents):
+            ring.expire(slot, self._last[slot], self.now)
+        self._last[slot] = self.now
+
+    def _emit(self, worker_id):
+        return [(worker_id, role, eligible)
+                for role, eligible in self.engine.update(worker_id, **self.aggregates(worker_id))]
+
+    def advance(self, timestamp):
+        """Move the clock to timestamp; return the flips of workers whose windows lost events"""
+        bucket = self.bucket(timestamp)
+        if self.now is not None and bucket <= self.now:
+            return []
+        if self.now is None:
+            self._last = array("q", [bucket]) * len(self._ids)
+            self.now = bucket
+            return []
+        self.now = bucket
+        due = set()
+        for key in [key for key in self._expiring if key <= bucket]:
+            due.update(self._expiring.pop(key))
+        flips = []
+        for slot in sorted(due):
+            flips.extend(self._emit(self._ids[slot]))
+        return flips
+
+    def _record(self, rings, worker_id, timestamp):
+        slot = self._index.get(worker_id)
+        if slot is None:
+            self.unknown += 1
+            return []
+        flips = self.advance(timestamp)
+        bucket = self.bucket(timestamp)
+        if self.now - bucket >= rings[0].width:
+            self.late += 1
+            return flips
+        self._expire(slot)
+        first = rings[0].add(slot, bucket)
+        for ring in rings[1:]:
+            ring.add(slot, bucket)
+        if first:
+            self._expiring.setdefault(bucket + rings[0].width, []).append(slot)
+        return flips + self._emit(worker_id)
+
+    def record_shift(self, worker_id, timestamp, attended):
+        """Record a scheduled shift; return the flipped (worker_id, role, eligible) verdicts"""
+        rings = (self._scheduled, self._attended) if attended else (self._scheduled,)
+        return self._record(rings, worker_id, timestamp)
+
+    def record_incident(self, worker_id, timestamp):
+        """Record one incident; return the flipped (worker_id, role, eligible) verdicts"""
+        return self._record((self._incidents,), worker_id, timestamp)
+
+    def process(self, events):
+        """Apply shift and incident events in order; yield (worker_id, role, now_eligible)
+
+        Thresholds changed since the last call are applied to every worker
+        first, as in IncrementalEngine.apply.
+        """
+        yield from self.engine.apply(())
+        for event in events:
+            kind, worker_id, timestamp = event[:3]
+            if kind == "shift":
+                yield from self.record_shift(worker_id, timestamp, event[3])
+            elif kind == "incident":
+                yield from self.record_incident(worker_id, timestamp)
+            else:
+                raise ValueError(f"unknown event kind: {kind!r}")
+
+    def verdicts(self, worker_id):
+        return self.engine.verdicts(worker_id)
+
+
+def static_fields(row):
+    """The inputs of a worker row that are not aggregated from events"""
+    return {name: row[name] for name in stream.FIELDS if name not in AGGREGATED_FIELDS}
@@ -1,120 +1,273 @@
-"""
-You need to implement the logic for checking worker eligibility for different roles.
-Each function will return "Eligible" or "Not Eligible" based on the conditions.
-
-Required Variables:
-- Constants:
-    MIN_EXPERIENCE = 2
-    MIN_SAFETY_SCORE = 75
-    MAX_INCIDENTS = 3
-    MIN_TRAINING_SCORE = 80
-    MIN_ATTENDANCE = 90
-
-- Intermediate calculation variables:
-    has_required_performance = (safety_score >= MIN_SAFETY_SCORE or experience >= MIN_EXPERIENCE)
-    has_safe_record = (incidents <= MAX_INCIDENTS)
-    has_sufficient_training = (training_score >= MIN_TRAINING_SCORE)
-    has_good_attendance = (attendance >= MIN_ATTENDANCE)
-    is_qualified = (team_leader or experience >= 5)
-    has_trainer_qualification = (incidents == 0 or team_leader)
-
-IMPORTANT: Use logical operators (AND, OR) and comparison operators (>, <, >=, <=, ==)
-"""
-
-# Constants must be defined at module level
-MIN_EXPERIENCE = 2
-MIN_SAFETY_SCORE = 75
-MAX_INCIDENTS = 3
-MIN_TRAINING_SCORE = 80
-MIN_ATTENDANCE = 90
-
-def check_basic_eligibility(safety_training, safety_score, experience, incidents):
-    """Check if worker meets basic work requirements
-    
-    TODO: Implement the logic checking these requirements:
-    1. Must have safety training AND
-    2. Must have either:
-       - Safety score >= MIN_SAFETY_SCORE OR
-       - Experience >= MIN_EXPERIENCE AND
-    3. Must have incidents <= MAX_INCIDENTS
-    
-    Store intermediate results in:
-    - has_required_performance = (safety_score >= MIN_SAFETY_SCORE or experience >= MIN_EXPERIENCE)
-    - has_safe_record = (incidents <= MAX_INCIDENTS)
-    
-    Return "Eligible" if all conditions are met, "Not Eligible" otherwise
-    """
-    return "Not Eligible"  # Replace with your implementation
-
-def check_machine_operator(basic_eligible, certification, training_score):
-    """Check if worker can operate machines
-    
-    TODO: Implement the logic checking these requirements:
-    1. Must be basic eligible ("Eligible") AND
-    2. Must have certification AND
-    3. Must have training score >= MIN_TRAINING_SCORE
-    
-    Example: A worker who is basic eligible, has certification (True),
-            and training score 85 should return "Eligible"
-    """
-    return "Not Eligible"
-
-def check_safety_supervisor(machine_eligible, first_aid, attendance):
-    """Check if worker can be safety supervisor
-    
-    TODO: Implement the logic checking these requirements:
-    1. Must be machine eligible ("Eligible") AND
-    2. Must have first aid certification AND
-    3. Must have attendance >= MIN_ATTENDANCE
-    
-    Example: A worker who is machine eligible, has first aid (True),
-            and attendance 95 should return "Eligible"
-    """
-    return "Not Eligible"
-
-def check_night_shift(basic_eligible, night_approved, team_leader, experience):
-    """Check if worker can do night shifts
-    
-    TODO: Implement the logic checking these requirements:
-    1. Must be basic eligible ("Eligible") AND
-    2. Must be approved for nights AND
-    3. Must either:
-       - Be a team leader OR
-       - Have experience >= 5 years
-    
-    Example: A worker who is basic eligible, night approved (True),
-            not team leader but has 6 years experience should return "Eligible"
-    """
-    return "Not Eligible"
-
-def check_trainer(supervisor_eligible, incidents, team_leader):
-    """Check if worker can be a trainer
-    
-    TODO: Implement the logic checking these requirements:
-    1. Must be supervisor eligible ("Eligible") AND
-    2. Must either:
-       - Have zero incidents OR
-       - Be a team leader
-    
-    Example: A worker who is supervisor eligible and has 0 incidents
-            should return "Eligible" even if not a team leader
-    """
-    return "Not Eligible"
-
-if __name__ == "__main__":
-    print("Worker Safety Eligibility Checker")
-    print("-" * 30)
-    
-    # 1. Get boolean inputs (convert yes/no to True/False)
-    # Example: safety_training = input("Has completed safety training? (yes/no): ").lower() == 'yes'
-    
-    # 2. Get numeric inputs (convert to int)
-    # Example: experience = int(input("Years of experience: "))
-    
-    # 3. Check eligibilities in sequence
-    # Example: basic_eligible = check_basic_eligibility(safety_training, safety_score, experience, incidents)
-    
-    # 4. Display results
-    print("\nEligibility Results:")
-    print("-" * 30)
-    # Print each eligibility result
\ No newline at end of file
+"""
+Logic for checking worker eligibility for different roles.
+Each function returns "Eligible" or "Not Eligible" based on the conditions.
+
+Required Variables:
+- Constants:
+    MIN_EXPERIENCE = 2
+    MIN_SAFETY_SCORE = 75
+    MAX_INCIDENTS = 3
+    MIN_TRAINING_SCORE = 80
+    MIN_ATTENDANCE = 90
+
+- Intermediate calculation variables:
+    has_required_performance = (safety_score >= MIN_SAFETY_SCORE or experience >= MIN_EXPERIENCE)
+    has_safe_record = (incidents <= MAX_INCIDENTS)
+    has_sufficient_training = (training_score >= MIN_TRAINING_SCORE)
+    has_good_attendance = (attendance >= MIN_ATTENDANCE)
+    is_qualified = (team_leader or experience >= 5)
+    has_trainer_qualification = (incidents == 0 or team_leader)
+
+IMPORTANT: Use logical operators (AND, OR) and comparison operators (>, <, >=, <=, ==)
+"""
+
+# Constants must be defined at module level
+MIN_EXPERIENCE = 2
+MIN_SAFETY_SCORE = 75
+MAX_INCIDENTS = 3
+MIN_TRAINING_SCORE = 80
+MIN_ATTENDANCE = 90
+# Experience that qualifies a non-leader for night shifts. Part of the rule
+# rather than a tunable threshold: not in current_thresholds(), but cached
+# results are keyed on rule_constants(), which includes it
+QUALIFYING_EXPERIENCE = 5
+
+ELIGIBLE = "Eligible"
+NOT_ELIGIBLE = "Not Eligible"
+
+# Role names in chain order; batch engines key their results by these
+ROLES = ("basic", "machine_operator", "safety_supervisor", "night_shift", "trainer")
+
+
+def current_thresholds():
+    """Return the live threshold constants as a tuple
+
+    Engines read this at call time (never at import time) so that changing
+    a module-level constant takes effect on the next evaluation.
+    """
+    return (MIN_EXPERIENCE, MIN_SAFETY_SCORE, MAX_INCIDENTS, MIN_TRAINING_SCORE, MIN_ATTENDANCE)
+
+
+def rule_constants():
+    """Return current_thresholds() plus QUALIFYING_EXPERIENCE, every constant a verdict depends on"""
+    return current_thresholds() + (QUALIFYING_EXPERIENCE,)
+
+
+def _validate_flag(name, value):
+    """Raise ValueError unless value is a real bool"""
+    if not isinstance(value, bool):
+        raise ValueError(f"{name} must be True or False")
+
+
+def _validate_count(name, value, upper=None):
+    """Raise ValueError unless value is a non-negative int (optionally <= upper)"""
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f"{name} must be an integer")
+    if value < 0 or (upper is not None and value > upper):
+        raise ValueError(f"{name} out of range: {value}")
+
+
+def _validate_status(name, value):
+    """Raise ValueError unless value is a valid eligibility status string"""
+    if value != ELIGIBLE and value != NOT_ELIGIBLE:
+        raise ValueError(f"{name} must be \"{ELIGIBLE}\" or \"{NOT_ELIGIBLE}\"")
+
+
+def check_basic_eligibility(safety_training, safety_score, experience, incidents):
+    """Check if worker meets basic work requirements
+
+    Requirements:
+    1. Must have safety training AND
+    2. Must have either:
+       - Safety score >= MIN_SAFETY_SCORE OR
+       - Experience >= MIN_EXPERIENCE AND
+    3. Must have incidents <= MAX_INCIDENTS
+
+    Return "Eligible" if all conditions are met, "Not Eligible" otherwise
+    """
+    _validate_flag("safety_training", safety_training)
+    _validate_count("safety_score", safety_score, 100)
+    _validate_count("experience", experience)
+    _validate_count("incidents", incidents)
+
+    has_required_performance = (safety_score >= MIN_SAFETY_SCORE or experience >= MIN_EXPERIENCE)
+    has_safe_record = (incidents <= MAX_INCIDENTS)
+
+    if safety_training and has_required_performance and has_safe_record:
+        return ELIGIBLE
+    return NOT_ELIGIBLE
+
+def check_machine_operator(basic_eligible, certification, training_score):
+    """Check if worker can operate machines
+
+    Requirements:
+    1. Must be basic eligible ("Eligible") AND
+    2. Must have certification AND
+    3. Must have training score >= MIN_TRAINING_SCORE
+
+    Example: A worker who is basic eligible, has certification (True),
+            and training score 85 should return "Eligible"
+    """
+    _validate_status("basic_eligible", basic_eligible)
+    _validate_flag("certification", certification)
+    _validate_count("training_score", training_score, 100)
+
+    has_sufficient_training = (training_score >= MIN_TRAINING_SCORE)
+
+    if basic_eligible == ELIGIBLE and certification and has_sufficient_training:
+        return ELIGIBLE
+    return NOT_ELIGIBLE
+
+def check_safety_supervisor(machine_eligible, first_aid, attendance):
+    """Check if worker can be safety supervisor
+
+    Requirements:
+    1. Must be machine eligible ("Eligible") AND
+    2. Must have first aid certification AND
+    3. Must have attendance >= MIN_ATTENDANCE
+
+    Example: A worker who is machine eligible, has first aid (True),
+            and attendance 95 should return "Eligible"
+    """
+    _validate_status("machine_eligible", machine_eligible)
+    _validate_flag("first_aid", first_aid)
+    _validate_count("attendance", attendance, 100)
+
+    has_good_attendance = (attendance >= MIN_ATTENDANCE)
+
+    if machine_eligible == ELIGIBLE and first_aid and has_good_attendance:
+        return ELIGIBLE
+    return NOT_ELIGIBLE
+
+def check_night_shift(basic_eligible, night_approved, team_leader, experience):
+    """Check if worker can do night shifts
+
+    Requirements:
+    1. Must be basic eligible ("Eligible") AND
+    2. Must be approved for nights AND
+    3. Must either:
+       - Be a team leader OR
+       - Have experience >= 5 years
+
+    Example: A worker who is basic eligible, night approved (True),
+            not team leader but has 6 years experience should return "Eligible"
+    """
+    _validate_status("basic_eligible", basic_eligible)
+    _validate_flag("night_approved", night_approved)
+    _validate_flag("team_leader", team_leader)
+    _validate_count("experience", experience)
+
+    is_qualified = (team_leader or experience >= QUALIFYING_EXPERIENCE)
+
+    if basic_eligible == ELIGIBLE and night_approved and is_qualified:
+        return ELIGIBLE
+    return NOT_ELIGIBLE
+
+def check_trainer(supervisor_eligible, incidents, team_leader):
+    """Check if worker can be a trainer
+
+    Requirements:
+    1. Must be supervisor eligible ("Eligible") AND
+    2. Must either:
+       - Have zero incidents OR
+       - Be a team leader
+
+    Example: A worker who is supervisor eligible and has 0 incidents
+            should return "Eligible" even if not a team leader
+    """
+    _validate_status("supervisor_eligible", supervisor_eligible)
+    _validate_count("incidents", incidents)
+    _validate_flag("team_leader", team_leader)
+
+    has_trainer_qualification = (incidents == 0 or team_leader)
+
+    if supervisor_eligible == ELIGIBLE and has_trainer_qualification:
+        return ELIGIBLE
+    return NOT_ELIGIBLE
+
+# Everything beyond the scalar check_* API is loaded on first attribute
+# access (PEP 562), so importing this module stays standard-library only.
+_LAZY = {
+    "Role": "eligibility.results",
+    "Predicate": "eligibility.results",
+    "ROLE_FLAGS": "eligibility.results",
+    "ROLE_ORDER": "eligibility.results",
+    "BASIC_NEEDS": "eligibility.results",
+    "MACHINE_OPERATOR_NEEDS": "eligibility.results",
+    "SAFETY_SUPERVISOR_NEEDS": "eligibility.results",
+    "NIGHT_SHIFT_NEEDS": "eligibility.results",
+    "ROLE_REQUIREMENTS": "eligibility.results",
+    "EligibilityResult": "eligibility.results",
+    "evaluate_worker": "eligibility.results",
+    "evaluate_batch": "eligibility.batch",
+    "ColumnarRoster": "eligibility.columnar",
+    "WorkerRoster": "eligibility.roster",
+    "IncrementalEngine": "eligibility.incremental",
+    "WindowAggregator": "eligibility.windows",
+    "RosterIndex": "eligibility.index",
+    "ProfileCache": "eligibility.cache",
+    "load_rules": "eligibility.rules",
+    "sweep": "eligibility.sweep",
+}
+
+
+def __getattr__(name):
+    try:
+        module = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(__import__(module, fromlist=[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
+
+def _run_interactive():
+    """Prompt for one worker and print every role verdict"""
+    print("Worker Safety Eligibility Checker")
+    print("-" * 30)
+
+    def ask_flag(prompt):
+        return input(f"{prompt} (yes/no): ").strip().lower() == "yes"
+
+    def ask_int(prompt):
+        return int(input(f"{prompt}: "))
+
+    safety_training = ask_flag("Has completed safety training?")
+    safety_score = ask_int("Safety score (0-100)")
+    experience = ask_int("Years of experience")
+    incidents = ask_int("Number of safety incidents")
+    certification = ask_flag("Has machine certification?")
+    training_score = ask_int("Training score (0-100)")
+    first_aid = ask_flag("Has first aid certification?")
+    attendance = ask_int("Attendance percentage (0-100)")
+    night_approved = ask_flag("Approved for night shifts?")
+    team_leader = ask_flag("Is a team leader?")
+
+    basic_eligible = check_basic_eligibility(safety_training, safety_score, experience, incidents)
+    machine_eligible = check_machine_operator(basic_eligible, certification, training_score)
+    supervisor_eligible = check_safety_supervisor(machine_eligible, first_aid, attendance)
+    night_eligible = check_night_shift(basic_eligible, night_approved, team_leader, experience)
+    trainer_eligible = check_trainer(supervisor_eligible, incidents, team_leader)
+
+    print("\nEligibility Results:")
+    print("-" * 30)
+    print(f"Basic Eligibility: {basic_eligible}")
+    print(f"Machine Operator: {machine_eligible}")
+    print(f"Safety Supervisor: {supervisor_eligible}")
+    print(f"Night Shift: {night_eligible}")
+    print(f"Trainer: {trainer_eligible}")
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1:
+        # Subcommands and the older --batch form live in eligibility.cli
+        from eligibility.cli import main
+
+        sys.exit(main(sys.argv[1:]))
+    _run_interactive()
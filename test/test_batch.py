@@ -0,0 +1,81 @@
+import unittest
+import random
+
+import skeleton
+
+try:
+    import numpy as np
+    from eligibility import batch
+except ImportError:
+    np = None
+
+
+def scalar_roles(row):
+    """Run the scalar reference chain and return a tuple of booleans per role"""
+    basic = skeleton.check_basic_eligibility(row["safety_training"], row["safety_score"], row["experience"], row["incidents"])
+    machine = skeleton.check_machine_operator(basic, row["certification"], row["training_score"])
+    supervisor = skeleton.check_safety_supervisor(machine, row["first_aid"], row["attendance"])
+    night = skeleton.check_night_shift(basic, row["night_approved"], row["team_leader"], row["experience"])
+    trainer = skeleton.check_trainer(supervisor, row["incidents"], row["team_leader"])
+    return tuple(v == skeleton.ELIGIBLE for v in (basic, machine, supervisor, night, trainer))
+
+
+def random_rows(count, seed=7):
+    """Generate worker rows clustered around the threshold constants"""
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        rows.append({
+            "safety_training": rng.random() < 0.8,
+            "safety_score": rng.randint(60, 100),
+            "experience": rng.randint(0, 8),
+            "incidents": rng.randint(0, 5),
+            "certification": rng.random() < 0.7,
+            "training_score": rng.randint(70, 100),
+            "first_aid": rng.random() < 0.7,
+            "attendance": rng.randint(80, 100),
+            "night_approved": rng.random() < 0.6,
+            "team_leader": rng.random() < 0.3,
+        })
+    return rows
+
+
+def to_columns(rows):
+    return {name: np.array([row[name] for row in rows]) for name in batch.COLUMNS}
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestBatchEvaluator(unittest.TestCase):
+    def setUp(self):
+        self.rows = random_rows(3000)
+
+    def test_matches_scalar_reference(self):
+        masks = batch.evaluate_columns(to_columns(self.rows))
+        for i, row in enumerate(self.rows):
+            expected = scalar_roles(row)
+            actual = tuple(bool(masks[role][i]) for role in skeleton.ROLES)
+            self.assertEqual(expected, actual, row)
+
+    def test_follows_constant_changes(self):
+        original = skeleton.MIN_ATTENDANCE
+        try:
+            skeleton.MIN_ATTENDANCE = 85
+            masks = batch.evaluate_columns(to_columns(self.rows))
+            expected = [scalar_roles(row)[2] for row in self.rows]
+            self.assertEqual(expected, masks["safety_supervisor"].tolist())
+        finally:
+            skeleton.MIN_ATTENDANCE = original
+
+    def test_rejects_invalid_columns(self):
+        cols = to_columns(self.rows[:10])
+        cols["safety_score"] = cols["safety_score"] + 100
+        with self.assertRaises(ValueError):
+            batch.evaluate_columns(cols)
+        cols = to_columns(self.rows[:10])
+        cols["team_leader"] = cols["team_leader"].astype(int)
+        with self.assertRaises(ValueError):
+            batch.evaluate_columns(cols)
+
+
+if __name__ == '__main__':
+    unittest.main()
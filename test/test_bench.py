@@ -0,0 +1,51 @@
+import unittest
+
+import skeleton
+
+try:
+    import numpy as np
+    from eligibility import batch, bench
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestBenchmarkSuite(unittest.TestCase):
+    def test_adversarial_distributions(self):
+        passing = batch.evaluate_columns(bench.generate_roster(100, "all_pass"))
+        failing = batch.evaluate_columns(bench.generate_roster(100, "all_fail"))
+        for role in skeleton.ROLES:
+            self.assertTrue(passing[role].all(), role)
+            self.assertFalse(failing[role].any(), role)
+
+    def test_generated_rosters_are_valid(self):
+        for distribution in bench.DISTRIBUTIONS:
+            cols = bench.generate_roster(500, distribution, seed=3)
+            batch.prepare_columns(cols)
+            self.assertEqual(cols["attendance"].dtype, np.uint8)
+
+    def test_suite_report_and_regressions(self):
+        report = bench.run_suite([200], ["scalar", "batch"], ["skewed"], repeat=1)
+        self.assertEqual(len(report["results"]), 2)
+        for result in report["results"]:
+            self.assertGreater(result["ns_per_worker"], 0)
+            self.assertGreater(result["peak_rss_bytes"], 0)
+            self.assertGreater(result["traced_peak_bytes"], 0)
+        self.assertEqual(bench.compare(report, report), [])
+        faster = {"results": [dict(r, ns_per_worker=r["ns_per_worker"] / 2) for r in report["results"]]}
+        self.assertEqual(len(bench.compare(report, faster, threshold=0.5)), 2)
+
+    def test_in_process_runs_report_no_rss(self):
+        report = bench.run_suite([50], ["batch"], ["uniform"], isolate=False, repeat=1)
+        self.assertIsNone(report["results"][0]["peak_rss_bytes"])
+        self.assertIn(" - ", bench.format_report(report))
+
+    def test_options_are_checked_before_running(self):
+        with self.assertRaises(ValueError):
+            bench.run_suite([50], ["batch"], ["uniform", "gaussian"])
+        with self.assertRaises(SystemExit):
+            bench.main(["--sizes", "50", "--distributions", "gaussian"])
+
+
+if __name__ == '__main__':
+    unittest.main()
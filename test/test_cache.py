@@ -0,0 +1,68 @@
+import unittest
+
+import skeleton
+from eligibility import stream
+from eligibility.cache import ProfileCache
+from test.test_batch import random_rows
+
+
+class TestProfileCache(unittest.TestCase):
+    def setUp(self):
+        self.rows = random_rows(300, seed=91)
+
+    def test_results_match_and_repeat_hits(self):
+        cache = ProfileCache()
+        for _ in range(2):
+            for row in self.rows:
+                self.assertEqual(cache.evaluate_record(row), skeleton.evaluate_worker(**row))
+        stats = cache.stats()
+        self.assertEqual(stats["hits"] + stats["misses"], 600)
+        self.assertGreaterEqual(stats["hits"], 300)
+
+    def test_lru_eviction(self):
+        cache = ProfileCache(maxsize=2)
+        a, b, c = (tuple(row[name] for name in stream.FIELDS) for row in self.rows[:3])
+        cache.evaluate(*a)
+        cache.evaluate(*b)
+        cache.evaluate(*a)          # a becomes most recent
+        cache.evaluate(*c)          # evicts b
+        self.assertEqual(cache.stats()["evictions"], 1)
+        misses = cache.misses
+        cache.evaluate(*a)
+        self.assertEqual(cache.misses, misses)
+        cache.evaluate(*b)
+        self.assertEqual(cache.misses, misses + 1)
+
+    def test_invalidated_by_constant_change(self):
+        cache = ProfileCache()
+        row = dict(self.rows[0], safety_training=True, safety_score=90, incidents=0, certification=True,
+                   training_score=85, first_aid=True, attendance=92)
+        self.assertTrue(cache.evaluate_record(row).is_eligible("safety_supervisor"))
+        original = skeleton.MIN_ATTENDANCE
+        try:
+            skeleton.MIN_ATTENDANCE = 95
+            self.assertFalse(cache.evaluate_record(row).is_eligible("safety_supervisor"))
+            self.assertEqual(cache.stats()["invalidations"], 1)
+        finally:
+            skeleton.MIN_ATTENDANCE = original
+
+    def test_invalid_inputs_are_not_cached(self):
+        cache = ProfileCache()
+        row = dict(self.rows[0], team_leader=True)
+        cache.evaluate_record(row)
+        with self.assertRaises(ValueError):
+            cache.evaluate_record(dict(row, team_leader=1))
+        self.assertEqual(len(cache), 1)
+
+    def test_equal_values_of_other_types_miss(self):
+        cache = ProfileCache()
+        row = dict(self.rows[0], safety_score=80, experience=1)
+        cache.evaluate_record(row)
+        for bad in ({"safety_score": 80.0}, {"experience": True}):
+            with self.assertRaises(ValueError):
+                cache.evaluate_record(dict(row, **bad))
+        self.assertEqual((len(cache), cache.hits), (1, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
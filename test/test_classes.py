@@ -0,0 +1,78 @@
+import unittest
+import json
+
+import skeleton
+from eligibility import classes, rules
+
+try:
+    import numpy as np
+    from eligibility import batch
+except ImportError:
+    np = None
+
+from test.test_batch import random_rows, scalar_roles
+from test.test_roster import as_worker
+
+
+def role_bits(roles):
+    return sum(int(bit) for bit, ok in zip(skeleton.ROLE_FLAGS.values(), roles) if ok)
+
+
+def default_spec():
+    with open(rules.DEFAULT_RULES, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class TestEquivalenceClasses(unittest.TestCase):
+    def test_cut_points_follow_constants(self):
+        cuts = classes.cut_points(default_spec())
+        self.assertEqual(cuts["safety_score"], [skeleton.MIN_SAFETY_SCORE])
+        self.assertEqual(cuts["experience"], [skeleton.MIN_EXPERIENCE, 5])
+        self.assertEqual(cuts["incidents"], [1, skeleton.MAX_INCIDENTS + 1])
+        self.assertEqual(classes.get_space().size, 2 * 3 * 3 * 2 * 2 * 2 ** 5)
+
+    def test_threshold_change_rebuilds_space(self):
+        original = skeleton.MIN_EXPERIENCE
+        try:
+            skeleton.MIN_EXPERIENCE = 5
+            space = classes.get_space()
+            self.assertEqual(space.starts["experience"], [0, 5])
+            self.assertEqual(space.size, 2 * 2 * 3 * 2 * 2 * 2 ** 5)
+        finally:
+            skeleton.MIN_EXPERIENCE = original
+        self.assertEqual(classes.get_space().starts["experience"], [0, original, 5])
+
+    def test_classify_matches_scalar_chain(self):
+        for row in random_rows(2000, seed=5):
+            self.assertEqual(classes.classify(*as_worker(row)), role_bits(scalar_roles(row)))
+        with self.assertRaises(ValueError):
+            classes.classify(True, 101, 1, 0, True, 80, True, 90, True, False)
+
+    def test_reference_is_constant_within_classes(self):
+        report = classes.verify()
+        self.assertEqual(report["classes"], classes.get_space().size)
+        self.assertEqual(report["inconsistent_classes"], [])
+
+    def test_field_comparisons_are_rejected(self):
+        spec = default_spec()
+        spec["roles"][0]["when"] = {"ge": ["safety_score", "experience"]}
+        with self.assertRaises(rules.RuleError):
+            classes.cut_points(spec)
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_engines_agree_on_every_class(self):
+        report = classes.verify(engines=("batch", "tables", "classes", "rules"))
+        self.assertEqual(report["engines"], {"batch": [], "tables": [], "classes": [], "rules": []})
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_column_lookup_matches_batch(self):
+        rows = random_rows(3000, seed=8)
+        columns = {name: np.array([row[name] for row in rows]) for name in batch.COLUMNS}
+        expected = batch.evaluate_columns(columns)
+        masks = classes.evaluate_role_masks(columns)
+        for role, bit in skeleton.ROLE_FLAGS.items():
+            self.assertTrue(np.array_equal((masks & int(bit)) != 0, expected[role]), role)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+import contextlib
+import csv
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import skeleton
+from eligibility import cli, stream
+from test.test_batch import random_rows
+from test.test_stream import ROOT, rows_to_csv, expected_verdicts
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def run_cli(argv):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(io.StringIO()):
+        status = cli.main(argv)
+    return status, out.getvalue()
+
+
+class TestCommandLine(unittest.TestCase):
+    def setUp(self):
+        self.rows = random_rows(200, seed=11)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.roster = os.path.join(self.tmp.name, "roster.csv")
+        with open(self.roster, "w") as f:
+            f.write(rows_to_csv(self.rows))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_evaluate_flags_and_json(self):
+        row = self.rows[0]
+        argv = ["evaluate"]
+        for name in stream.FIELDS:
+            value = row[name]
+            argv += [cli._option(name), ("yes" if value else "no") if isinstance(value, bool) else str(value)]
+        status, text = run_cli(argv)
+        self.assertEqual(status, 0)
+        verdicts = [line.split(": ", 1)[1] for line in text.splitlines()]
+        self.assertEqual(tuple(verdicts), expected_verdicts(row))
+
+        status, text = run_cli(["evaluate", "--json", json.dumps(dict(row, worker_id="W1")), "--format", "jsonl"])
+        record = json.loads(text)
+        self.assertEqual(record["worker_id"], "W1")
+        self.assertEqual(tuple(record[r] for r in skeleton.ROLES), expected_verdicts(row))
+
+    def test_evaluate_rejects_invalid_worker(self):
+        status, _ = run_cli(["evaluate", "--json", json.dumps(dict(self.rows[0], attendance=101))])
+        self.assertEqual(status, 2)
+
+    def test_batch_binary_output(self):
+        path = os.path.join(self.tmp.name, "verdicts.wsev")
+        status, _ = run_cli(["batch", self.roster, "-o", path, "--quiet"])
+        self.assertEqual(status, 0)
+        with open(path, "rb") as f:
+            masks = stream.read_verdict_masks(f.read())
+        self.assertEqual(len(masks), len(self.rows))
+        bits = tuple(skeleton.ROLE_FLAGS.values())
+        for mask, row in zip(masks, self.rows):
+            self.assertEqual(tuple(skeleton.ELIGIBLE if mask & bit else skeleton.NOT_ELIGIBLE for bit in bits),
+                             expected_verdicts(row))
+
+    def test_legacy_batch_option(self):
+        status, text = run_cli(["--batch", self.roster, "--output-format", "csv"])
+        self.assertEqual(status, 0)
+        lines = list(csv.reader(io.StringIO(text)))
+        self.assertEqual(tuple(lines[0]), stream.OUTPUT_FIELDS)
+        self.assertEqual(tuple(lines[1][1:]), expected_verdicts(self.rows[0]))
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_sweep_matches_batch(self):
+        status, text = run_cli(["sweep", self.roster, "--min-attendance", "80,90", "--format", "jsonl"])
+        self.assertEqual(status, 0)
+        points = [json.loads(line) for line in text.splitlines()]
+        self.assertEqual([p["MIN_ATTENDANCE"] for p in points], [80, 90])
+        supervisors = sum(expected_verdicts(row)[2] == skeleton.ELIGIBLE for row in self.rows)
+        at_current = next(p for p in points if p["MIN_ATTENDANCE"] == skeleton.MIN_ATTENDANCE)
+        self.assertEqual(at_current["safety_supervisor"], supervisors)
+
+    def test_stdin_pipe_without_heavy_imports(self):
+        code = ("import sys; from eligibility import cli; status = cli.main(['batch', '-', '--quiet']); "
+                "sys.stderr.write(str('numpy' in sys.modules))")
+        proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT, input=rows_to_csv(self.rows[:10]),
+                              capture_output=True, text=True, check=True)
+        self.assertEqual(len(proc.stdout.splitlines()), 11)
+        self.assertEqual(proc.stderr, "False")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import io
+import os
+import tempfile
+
+import skeleton
+
+try:
+    import numpy as np
+    from eligibility import batch, columnar
+except ImportError:
+    np = None
+
+from test.test_batch import random_rows
+from test.test_stream import rows_to_csv
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestColumnarStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.rows = random_rows(1001, seed=9)
+        self.columns = {name: np.array([row[name] for row in self.rows]) for name in batch.COLUMNS}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip_and_evaluate(self):
+        path = os.path.join(self.tmp.name, "roster.wsec")
+        self.assertEqual(columnar.write_columnar(path, self.columns), len(self.rows))
+        expected = batch.evaluate_columns(self.columns)
+        with columnar.ColumnarRoster.open(path) as roster:
+            self.assertEqual(len(roster), len(self.rows))
+            self.assertEqual(roster.version, columnar.VERSION)
+            for name in batch.COLUMNS:
+                self.assertTrue(np.array_equal(roster.column(name), self.columns[name]), name)
+            self.assertEqual(roster.column("attendance").dtype, np.uint8)
+            masks = roster.evaluate()
+            for role in skeleton.ROLES:
+                self.assertTrue(np.array_equal(masks[role], expected[role]), role)
+
+    def test_convert_from_csv(self):
+        src = os.path.join(self.tmp.name, "roster.csv")
+        with open(src, "w", newline="") as f:
+            f.write(rows_to_csv(self.rows) + "yes,1000,1,1,yes,90,yes,95,yes,no\n")
+        dst = os.path.join(self.tmp.name, "roster.wsec")
+        stats = columnar.convert_roster(src, dst)
+        self.assertEqual((stats.rows, stats.errors), (len(self.rows), 1))
+        with columnar.ColumnarRoster.open(dst) as roster:
+            self.assertTrue(np.array_equal(roster.column("team_leader"), self.columns["team_leader"]))
+
+    def test_keeps_worker_ids_and_source_rows(self):
+        text = ("worker_id," + ",".join(columnar.stream.FIELDS) + "\n"
+                "A17,yes,90,6,0,yes,85,yes,95,yes,no\n"
+                "B22,yes,90,300,70000,yes,85,yes,95,yes,no\n"
+                "bad,yes,900,6,0,yes,85,yes,95,yes,no\n"
+                "C05,no,90,6,0,yes,85,yes,95,yes,no\n")
+        columns, stats = columnar.read_roster(io.StringIO(text))
+        self.assertEqual((stats.rows, stats.errors), (3, 1))
+        path = os.path.join(self.tmp.name, "ids.wsec")
+        columnar.write_columnar(path, columns)
+        with columnar.ColumnarRoster.open(path) as roster:
+            self.assertEqual(roster.worker_ids(), ["A17", "B22", "C05"])
+            self.assertEqual(roster.source_rows().tolist(), [1, 2, 4])
+            self.assertEqual(roster.column("experience").tolist(), [6, 300, 6])
+            self.assertEqual(roster.column("incidents").tolist(), [0, 70000, 0])
+        with self.assertRaisesRegex(ValueError, "row 2"):
+            columnar.read_roster(io.StringIO(text.replace("300", str(2 ** 40))))
+
+    def test_rejects_foreign_file(self):
+        path = os.path.join(self.tmp.name, "junk.bin")
+        with open(path, "wb") as f:
+            f.write(b"\0" * 128)
+        with self.assertRaises(ValueError):
+            columnar.ColumnarRoster.open(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
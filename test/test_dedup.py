@@ -0,0 +1,46 @@
+import unittest
+
+from eligibility import dedup, stream
+from test.test_batch import random_rows
+
+
+def as_workers(rows):
+    return [tuple(row[name] for name in stream.FIELDS) for row in rows]
+
+
+class TestProfileDedup(unittest.TestCase):
+    def setUp(self):
+        self.distinct = as_workers(random_rows(200, seed=101))
+        self.repeated = self.distinct[:20] * 100
+
+    def test_strategies_agree(self):
+        workers = self.repeated + self.distinct
+        direct = dedup.evaluate_bulk(workers, strategy="direct")
+        self.assertEqual(direct, [stream.run_chain(worker) for worker in workers])
+        self.assertEqual(dedup.evaluate_bulk(workers, strategy="dedup"), direct)
+        self.assertEqual(dedup.evaluate_bulk(workers), direct)
+
+    def test_each_profile_evaluated_once(self):
+        calls = []
+
+        def counting(worker):
+            calls.append(worker)
+            return stream.run_chain(worker)
+
+        dedup.evaluate_bulk(self.repeated, counting)
+        self.assertEqual(len(calls), 20)
+
+    def test_auto_choice(self):
+        self.assertEqual(dedup.choose_strategy(self.repeated), "dedup")
+        self.assertEqual(dedup.choose_strategy(self.distinct), "direct")
+
+    def test_invalid_rows_and_types(self):
+        good = self.distinct[0]
+        bad = (1,) + good[1:]       # equal to True, but not a bool
+        results = dedup.evaluate_bulk([good, bad, good, bad], strategy="dedup")
+        self.assertIsNotNone(results[0])
+        self.assertEqual(results[1::2], [None, None])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+from unittest import mock
+
+import skeleton
+
+try:
+    import numpy as np
+    from eligibility import batch, differential
+except ImportError:
+    np = None
+
+
+def off_by_one_attendance(cols):
+    """A deliberately broken engine: attendance passes one point early"""
+    shifted = dict(cols, attendance=cols["attendance"] + 1)
+    return differential._masks_from_roles(batch.evaluate_columns(shifted, validate=False))
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestDifferentialHarness(unittest.TestCase):
+    def test_engines_agree_with_reference(self):
+        report = differential.run(rows=40_000, workers=1, chunk_rows=10_000, scalar_sample=256)
+        self.assertEqual(report["rows"], 40_000)
+        self.assertEqual(report["mismatches"], [])
+        self.assertEqual(report["comparisons"]["tables"], 40_000)
+        self.assertEqual(report["comparisons"]["cache"], 4 * 256)
+
+    def test_engines_follow_qualifying_experience(self):
+        differential.run(rows=10_000, workers=1)
+        with mock.patch.object(skeleton, "QUALIFYING_EXPERIENCE", 7):
+            report = differential.run(rows=20_000, workers=1, chunk_rows=10_000, scalar_sample=256)
+        self.assertEqual(report["mismatches"], [])
+
+    def test_profiles_cover_threshold_boundaries(self):
+        cols = differential.generate_profiles(20_000, seed=1)
+        attendance = set(cols["attendance"].tolist())
+        self.assertTrue({skeleton.MIN_ATTENDANCE - 1, skeleton.MIN_ATTENDANCE, skeleton.MIN_ATTENDANCE + 1}
+                        <= attendance)
+        self.assertTrue({0, skeleton.MAX_INCIDENTS, skeleton.MAX_INCIDENTS + 1} <= set(cols["incidents"].tolist()))
+
+    def test_reports_minimized_counterexample(self):
+        with mock.patch.dict(differential.VECTOR_ENGINES, broken=off_by_one_attendance):
+            report = differential.run(rows=20_000, engines=("tables", "broken"), workers=1, chunk_rows=10_000)
+        self.assertEqual({m["engine"] for m in report["mismatches"]}, {"broken"})
+        minimized = report["mismatches"][0]["minimized"]
+        self.assertEqual(minimized["attendance"], skeleton.MIN_ATTENDANCE - 1)
+        self.assertEqual(minimized["safety_score"], 0)
+        self.assertEqual(minimized["experience"], skeleton.MIN_EXPERIENCE)
+        self.assertFalse(minimized["night_approved"])
+        self.assertIn("MISMATCH broken", differential.format_report(report))
+
+    def test_parallel_matches_serial(self):
+        serial = differential.run(rows=30_000, engines=("batch",), workers=1, chunk_rows=10_000)
+        parallel = differential.run(rows=30_000, engines=("batch",), workers=2, chunk_rows=10_000)
+        self.assertEqual(serial["comparisons"], parallel["comparisons"])
+        self.assertEqual(parallel["mismatches"], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+import random
+
+import skeleton
+from eligibility import incremental
+from test.test_batch import scalar_roles, random_rows
+
+
+def eligible_roles(row):
+    return dict(zip(skeleton.ROLES, scalar_roles(row)))
+
+
+class TestIncrementalEngine(unittest.TestCase):
+    def setUp(self):
+        self.rows = random_rows(300, seed=21)
+        self.engine = incremental.IncrementalEngine()
+        for i, row in enumerate(self.rows):
+            self.engine.add(i, **row)
+
+    def assert_state_matches(self):
+        for i, row in enumerate(self.rows):
+            expected = {role: skeleton.ELIGIBLE if ok else skeleton.NOT_ELIGIBLE
+                        for role, ok in eligible_roles(row).items()}
+            self.assertEqual(expected, self.engine.verdicts(i), row)
+
+    def test_initial_state(self):
+        self.assertEqual(len(self.engine), len(self.rows))
+        self.assert_state_matches()
+
+    def test_deltas_emit_only_flips(self):
+        rng = random.Random(4)
+        source = random_rows(2000, seed=22)
+        for n in range(2000):
+            i = rng.randrange(len(self.rows))
+            field = rng.choice(list(incremental.FIELD_PREDICATES))
+            value = source[n][field]
+            before = eligible_roles(self.rows[i])
+            self.rows[i] = dict(self.rows[i], **{field: value})
+            after = eligible_roles(self.rows[i])
+            expected = sorted((role, after[role]) for role in skeleton.ROLES if before[role] != after[role])
+            self.assertEqual(expected, sorted(self.engine.update(i, **{field: value})))
+        self.assert_state_matches()
+
+    def test_apply_reevaluates_after_constant_change(self):
+        original = skeleton.MIN_TRAINING_SCORE
+        try:
+            skeleton.MIN_TRAINING_SCORE = 95
+            flips = list(self.engine.apply([(0, {"incidents": 0})]))
+            self.assertTrue(any(role == "machine_operator" for _, role, _ in flips))
+            self.rows[0] = dict(self.rows[0], incidents=0)
+            self.assert_state_matches()
+        finally:
+            skeleton.MIN_TRAINING_SCORE = original
+
+    def test_out_of_storage_values_change_nothing(self):
+        with self.assertRaises(ValueError):
+            self.engine.add("big", **dict(self.rows[0], experience=70000))
+        self.assertEqual(len(self.engine), len(self.rows))
+        self.engine.add("next", **self.rows[1])
+        self.assertEqual(self.engine.verdicts("next"), self.engine.verdicts(1))
+        with self.assertRaises(ValueError):
+            self.engine.update(0, safety_score=10, experience=70000)
+        self.assert_state_matches()
+
+    def test_invalid_delta_raises(self):
+        with self.assertRaises(ValueError):
+            self.engine.update(0, attendance=120)
+        with self.assertRaises(ValueError):
+            self.engine.update(0, shoe_size=9)
+
+
+if __name__ == '__main__':
+    unittest.main()
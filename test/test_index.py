@@ -0,0 +1,52 @@
+import unittest
+
+import skeleton
+
+try:
+    import numpy as np
+    from eligibility import batch
+    from eligibility.index import RosterIndex
+except ImportError:
+    np = None
+
+from test.test_batch import random_rows
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestRosterIndex(unittest.TestCase):
+    def setUp(self):
+        rows = random_rows(2003, seed=41)
+        self.columns = {name: np.array([row[name] for row in rows]) for name in batch.COLUMNS}
+        self.index = RosterIndex(self.columns)
+
+    def assert_matches_batch(self):
+        expected = batch.evaluate_columns(self.columns)
+        for role in skeleton.ROLES:
+            self.assertTrue(np.array_equal(self.index.workers(role), np.flatnonzero(expected[role])), role)
+            self.assertEqual(self.index.count(role), int(expected[role].sum()))
+
+    def test_role_queries_match_batch(self):
+        self.assert_matches_batch()
+
+    def test_follows_constant_changes(self):
+        self.index.role_bitmaps()
+        original = skeleton.MIN_EXPERIENCE
+        try:
+            skeleton.MIN_EXPERIENCE = 4
+            self.assert_matches_batch()
+        finally:
+            skeleton.MIN_EXPERIENCE = original
+
+    def test_range_bitmap(self):
+        hits = np.unpackbits(self.index.range_bitmap("attendance", 85, 90), count=self.index.rows)
+        attendance = self.columns["attendance"]
+        self.assertTrue(np.array_equal(hits.view(np.bool_), (attendance >= 85) & (attendance <= 90)))
+        incidents = self.columns["incidents"]
+        for (low, high), expected in (((None, 2), incidents <= 2), ((3, None), incidents >= 3),
+                                      ((0, 0), incidents == 0), ((None, None), incidents >= 0)):
+            hits = np.unpackbits(self.index.range_bitmap("incidents", low, high), count=self.index.rows)
+            self.assertTrue(np.array_equal(hits.view(np.bool_), expected), (low, high))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+
+import skeleton
+from eligibility import instrument, stream
+from eligibility.instrument import LatencyHistogram
+from test.test_batch import random_rows
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        instrument.reset()
+
+    def tearDown(self):
+        instrument.disable()
+        instrument.reset()
+
+    def test_disabled_leaves_functions_untouched(self):
+        original = skeleton.check_trainer
+        instrument.enable()
+        self.assertIsNot(skeleton.check_trainer, original)
+        instrument.disable()
+        self.assertIs(skeleton.check_trainer, original)
+        skeleton.check_trainer(skeleton.ELIGIBLE, 0, False)
+        self.assertEqual(instrument.snapshot()["functions"]["check_trainer"]["calls"], 0)
+
+    def test_counts_latency_and_predicates(self):
+        rows = random_rows(200, seed=111)
+        instrument.enable()
+        instrument.enable()  # idempotent
+        for row in rows:
+            stream.run_chain(tuple(row[name] for name in stream.FIELDS))
+        with self.assertRaises(ValueError):
+            skeleton.check_machine_operator("maybe", True, 90)
+        snap = instrument.snapshot()
+        self.assertTrue(snap["enabled"])
+        basic = snap["functions"]["check_basic_eligibility"]
+        self.assertEqual(basic["calls"], 200)
+        self.assertEqual(basic["latency_ns"]["count"], 200)
+        self.assertEqual(snap["functions"]["check_machine_operator"]["errors"], 1)
+        attendance = snap["predicates"]["has_good_attendance"]
+        self.assertEqual(attendance["evaluated"], 200)
+        self.assertEqual(attendance["passed"], sum(row["attendance"] >= skeleton.MIN_ATTENDANCE for row in rows))
+
+    def test_evaluate_worker_predicates(self):
+        row = random_rows(1, seed=112)[0]
+        instrument.enable()
+        skeleton.evaluate_worker(**row)
+        snap = instrument.snapshot()
+        self.assertEqual(snap["functions"]["evaluate_worker"]["calls"], 1)
+        self.assertEqual(snap["predicates"]["has_safe_record"]["passed"],
+                         int(row["incidents"] <= skeleton.MAX_INCIDENTS))
+
+    def test_keyword_calls(self):
+        instrument.enable()
+        self.assertEqual(skeleton.check_machine_operator(basic_eligible=skeleton.ELIGIBLE, certification=True,
+                                                         training_score=90), skeleton.ELIGIBLE)
+        skeleton.check_trainer(supervisor_eligible=skeleton.ELIGIBLE, incidents=2, team_leader=False)
+        skeleton.check_night_shift(skeleton.ELIGIBLE, True, experience=1, team_leader=False)
+        with self.assertRaises(TypeError):
+            skeleton.check_trainer(skeleton.ELIGIBLE, 0)
+        snap = instrument.snapshot()
+        self.assertEqual(snap["functions"]["check_machine_operator"]["calls"], 1)
+        self.assertEqual(snap["functions"]["check_trainer"]["calls"], 2)
+        self.assertEqual(snap["functions"]["check_trainer"]["errors"], 1)
+        self.assertEqual(snap["predicates"]["has_sufficient_training"]["passed"], 1)
+        self.assertEqual(snap["predicates"]["has_trainer_qualification"]["passed"], 0)
+        self.assertEqual(snap["predicates"]["is_qualified"]["evaluated"], 1)
+
+    def test_text_export(self):
+        instrument.enable()
+        skeleton.check_trainer(skeleton.ELIGIBLE, 0, False)
+        text = instrument.to_text()
+        self.assertIn('eligibility_calls_total{function="check_trainer"} 1', text)
+        self.assertIn('quantile="0.99"', text)
+
+    def test_histogram_precision(self):
+        hist = LatencyHistogram()
+        for value in range(1, 100001):
+            hist.record(value)
+        for q in (0.5, 0.9, 0.99):
+            self.assertAlmostEqual(hist.quantile(q) / (q * 100000), 1.0, delta=0.04)
+        for index in range(2000):
+            self.assertEqual(LatencyHistogram.bucket(LatencyHistogram.bucket_value(index)), index)
+
+
+if __name__ == '__main__':
+    unittest.main()
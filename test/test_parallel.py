@@ -0,0 +1,58 @@
+import unittest
+import io
+import json
+import os
+import tempfile
+
+from eligibility import parallel, stream
+from test.test_batch import random_rows
+from test.test_stream import rows_to_csv
+
+
+class TestParallelSharding(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.rows = random_rows(400, seed=5)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w", newline="") as f:
+            f.write(text)
+        return path
+
+    def assert_same_as_serial(self, path, fmt, chunk_bytes):
+        serial = io.StringIO()
+        with open(path, newline="") as f:
+            expected = stream.stream_roster(f, serial, fmt, fmt)
+        merged = io.StringIO()
+        actual = parallel.parallel_roster(path, merged, fmt, fmt, workers=2, chunk_bytes=chunk_bytes)
+        self.assertEqual(serial.getvalue(), merged.getvalue())
+        self.assertEqual((expected.rows, expected.errors), (actual.rows, actual.errors))
+
+    def test_csv_shards_match_serial(self):
+        text = rows_to_csv(self.rows).replace("\n", "\nbroken,row\n", 1) + "\n"
+        path = self.write("roster.csv", text)
+        for chunk_bytes in (1, 37, 512, 1 << 20):
+            self.assert_same_as_serial(path, "csv", chunk_bytes)
+
+    def test_jsonl_shards_match_serial(self):
+        lines = [json.dumps(row) for row in self.rows]
+        lines[10] = "{oops"
+        lines.insert(20, "")
+        path = self.write("roster.jsonl", "\n".join(lines))
+        for chunk_bytes in (53, 4096):
+            self.assert_same_as_serial(path, "jsonl", chunk_bytes)
+
+    def test_shard_plan_covers_file(self):
+        path = self.write("roster.csv", rows_to_csv(self.rows))
+        fieldnames, data_start, ranges = parallel.plan_shards(path, "csv", 1000)
+        self.assertEqual(tuple(fieldnames), stream.FIELDS)
+        self.assertEqual(ranges[0][0], data_start)
+        self.assertEqual(ranges[-1][1], os.path.getsize(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
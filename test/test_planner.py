@@ -0,0 +1,68 @@
+import unittest
+
+import skeleton
+
+try:
+    import numpy as np
+    from eligibility import batch, planner
+except ImportError:
+    np = None
+
+from test.test_batch import random_rows
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestAdaptivePlanner(unittest.TestCase):
+    def setUp(self):
+        rows = random_rows(5000, seed=81)
+        # Skew the data: most workers lack safety training, trainers fail on incidents
+        for i, row in enumerate(rows):
+            row["safety_training"] = i % 5 < 2
+            row["incidents"] = 1 if i % 7 else 0
+        self.columns = {name: np.array([row[name] for row in rows]) for name in batch.COLUMNS}
+
+    def test_results_never_change(self):
+        engine = planner.AdaptiveEngine(chunk_rows=512)
+        expected = batch.evaluate_columns(self.columns)
+        for _ in range(3):
+            actual = engine.evaluate_columns(self.columns)
+            for role in skeleton.ROLES:
+                self.assertTrue(np.array_equal(expected[role], actual[role]), role)
+
+    def test_plan_puts_selective_terms_first(self):
+        engine = planner.AdaptiveEngine(chunk_rows=1000)
+        engine.evaluate_columns(self.columns)
+        plan = engine.plan()
+        self.assertEqual(plan["basic"][0][0], "safety_training")
+        self.assertAlmostEqual(plan["basic"][0][1], 0.4, places=2)
+        trainer_leaves = [leaf for leaf, _ in plan["trainer"][0][2]]
+        self.assertEqual(trainer_leaves, ["team_leader", "incidents == 0"])
+        self.assertIn("AND safety_training", engine.describe_plan())
+
+    def test_gathers_only_when_few_rows_survive(self):
+        engine = planner.AdaptiveEngine()
+        batch.evaluate_columns(self.columns, planner=engine)
+        self.assertFalse(any(gather for steps in engine.schedule().values() for _, gather in steps))
+
+        cols = {name: column.copy() for name, column in self.columns.items()}
+        cols["safety_training"][:] = False
+        cols["safety_training"][::100] = True
+        engine = planner.AdaptiveEngine()
+        masks = batch.evaluate_columns(cols, planner=engine)
+        self.assertTrue(any(gather for _, gather in engine.schedule()["basic"]))
+        self.assertIn("then gather survivors", engine.describe_plan())
+        expected = batch.evaluate_columns(cols)
+        for role in skeleton.ROLES:
+            self.assertTrue(np.array_equal(expected[role], masks[role]), role)
+
+    def test_sparse_and_empty_inputs(self):
+        engine = planner.AdaptiveEngine(chunk_rows=100)
+        cols = {name: column[:0] for name, column in self.columns.items()}
+        self.assertEqual(len(engine.evaluate_columns(cols)["trainer"]), 0)
+        cols = {name: column.copy() for name, column in self.columns.items()}
+        cols["safety_training"][:] = False
+        self.assertFalse(engine.evaluate_columns(cols)["night_shift"].any())
+
+
+if __name__ == '__main__':
+    unittest.main()
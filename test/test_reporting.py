@@ -0,0 +1,142 @@
+import unittest
+import contextlib
+import io
+import json
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from test.TestUtils import ResultReporter, TestUtils
+
+
+class StandInServer:
+    """Local stand-in for the results endpoint
+
+    Records every posted body and the client port it came from; the first
+    `failures` requests are answered with 503.
+    """
+
+    def __init__(self, failures=0):
+        self.bodies = []
+        self.ports = set()
+        self.failures = failures
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                with server.lock:
+                    server.ports.add(self.client_address[1])
+                    fail = server.failures > 0
+                    if fail:
+                        server.failures -= 1
+                    else:
+                        server.bodies.append(json.loads(body))
+                self.send_response(503 if fail else 200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/push"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def result_of(body):
+    return next(iter(json.loads(body["testCaseResults"]).values()))
+
+
+class TestResultReporter(unittest.TestCase):
+    def setUp(self):
+        self.server = StandInServer()
+        self.addCleanup(self.server.close)
+
+    def reporter(self, **options):
+        options.setdefault("backoff", 0.01)
+        reporter = ResultReporter(self.server.url, "custom", "host", "attempt", TestUtils.GUID, **options)
+        self.addCleanup(reporter.close)
+        return reporter
+
+    def test_batches_share_one_connection(self):
+        reporter = self.reporter(batch_size=8)
+        for i in range(30):
+            reporter.submit({"methodName": f"t{i}", "status": "Passed"})
+        reporter.flush()
+        self.assertEqual([result_of(b)["methodName"] for b in self.server.bodies], [f"t{i}" for i in range(30)])
+        self.assertEqual(self.server.bodies[0]["customData"], "custom")
+        self.assertEqual(len(self.server.ports), 1)
+        self.assertEqual((reporter.sent, reporter.failed), (30, 0))
+
+    def test_retries_server_errors(self):
+        self.server.failures = 2
+        reporter = self.reporter(retries=3)
+        reporter.submit({"methodName": "flaky"})
+        reporter.flush()
+        self.assertEqual(len(self.server.bodies), 1)
+        self.assertEqual(reporter.sent, 1)
+
+    def test_gives_up_after_retries(self):
+        self.server.failures = 10
+        reporter = self.reporter(retries=1)
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            reporter.submit({"methodName": "down"})
+            reporter.flush()
+        self.assertEqual(reporter.failed, 1)
+        self.assertIn("Unable to push", out.getvalue())
+
+    def test_unexpected_errors_keep_the_thread_alive(self):
+        reporter = self.reporter()
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            reporter.submit({"methodName": object()})  # not JSON serializable
+            reporter.submit({"methodName": "after"})
+            reporter.flush()
+        self.assertEqual((reporter.sent, reporter.failed), (1, 1))
+        self.assertIn("Unable to push", out.getvalue())
+        self.assertEqual(result_of(self.server.bodies[0])["methodName"], "after")
+
+
+class TestYakshaAssert(unittest.TestCase):
+    def setUp(self):
+        self.server = StandInServer()
+        self.addCleanup(self.server.close)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        path = os.path.join(self.tmp.name, "custom.ih")
+        with open(path, "w") as f:
+            f.write("first")
+        saved = (TestUtils.URL, TestUtils.CUSTOM_DATA_PATH, TestUtils._custom_data, TestUtils._reporter)
+        TestUtils.URL, TestUtils.CUSTOM_DATA_PATH = self.server.url, path
+        TestUtils._custom_data = TestUtils._reporter = None
+
+        def restore():
+            if TestUtils._reporter is not None:
+                TestUtils._reporter.close()
+            TestUtils.URL, TestUtils.CUSTOM_DATA_PATH, TestUtils._custom_data, TestUtils._reporter = saved
+        self.addCleanup(restore)
+        self.path = path
+
+    def test_custom_data_read_once_and_results_flushed(self):
+        TestUtils.yakshaAssert("test_one", True, "functional")
+        with open(self.path, "w") as f:
+            f.write("second")
+        TestUtils.yakshaAssert("test_two", False, "boundary")
+        TestUtils.flushResults()
+        self.assertEqual([b["customData"] for b in self.server.bodies], ["first", "first"])
+        results = [result_of(b) for b in self.server.bodies]
+        self.assertEqual([(r["methodName"], r["status"], r["earnedScore"]) for r in results],
+                         [("test_one", "Passed", 1), ("test_two", "Failed", 0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
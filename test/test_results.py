@@ -0,0 +1,69 @@
+import unittest
+
+import skeleton
+from eligibility import tables
+from test.test_batch import scalar_roles, random_rows
+
+
+class TestStructuredResults(unittest.TestCase):
+    def setUp(self):
+        self.rows = random_rows(1000, seed=61)
+
+    def test_matches_string_chain(self):
+        for row in self.rows:
+            result = skeleton.evaluate_worker(**row)
+            expected = dict(zip(skeleton.ROLES, scalar_roles(row)))
+            self.assertEqual({role: result.is_eligible(role) for role in skeleton.ROLES}, expected, row)
+            self.assertEqual(result.as_dict(), {role: skeleton.ELIGIBLE if ok else skeleton.NOT_ELIGIBLE
+                                                for role, ok in expected.items()})
+
+    def test_predicates_match_truth_tables(self):
+        for row in self.rows:
+            result = skeleton.evaluate_worker(**row)
+            self.assertEqual(int(result.predicates), tables.compile_worker(**row))
+            self.assertEqual(int(result.roles), tables.evaluate_worker(**row))
+
+    def test_flags(self):
+        row = dict(self.rows[0], safety_training=True, safety_score=90, incidents=0,
+                   certification=True, training_score=90, first_aid=True, attendance=95,
+                   night_approved=False, team_leader=False)
+        result = skeleton.evaluate_worker(**row)
+        self.assertTrue(result.is_eligible(skeleton.Role.TRAINER))
+        self.assertEqual(result.verdict("night_shift"), skeleton.NOT_ELIGIBLE)
+        self.assertIn(skeleton.Predicate.HAS_TRAINER_QUALIFICATION, result.predicates)
+        self.assertFalse(hasattr(result, "__dict__"))
+
+    def test_failed_requirements(self):
+        row = dict(self.rows[0], safety_training=True, safety_score=90, incidents=2,
+                   certification=True, training_score=90, first_aid=True, attendance=80,
+                   night_approved=True, team_leader=False, experience=1)
+        result = skeleton.evaluate_worker(**row)
+        self.assertEqual(result.failed("basic"), skeleton.Predicate(0))
+        self.assertEqual(result.failed("safety_supervisor"), skeleton.Predicate.HAS_GOOD_ATTENDANCE)
+        self.assertEqual(result.failed(skeleton.Role.TRAINER),
+                         skeleton.Predicate.HAS_GOOD_ATTENDANCE | skeleton.Predicate.HAS_TRAINER_QUALIFICATION)
+        self.assertEqual(result.failed("night_shift"), skeleton.Predicate.IS_QUALIFIED)
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            skeleton.evaluate_worker(**dict(self.rows[0], first_aid="yes"))
+        for bad in ({"safety_score": 101}, {"incidents": -1}, {"attendance": True}, {"experience": 2.0}):
+            row = dict(self.rows[0], **bad)
+            with self.assertRaises(ValueError) as chain:
+                scalar_roles(row)
+            with self.assertRaises(ValueError) as structured:
+                skeleton.evaluate_worker(**row)
+            self.assertEqual(str(structured.exception), str(chain.exception))
+
+    def test_int_subclasses_are_valid(self):
+        class Count(int):
+            pass
+
+        row = dict(self.rows[0], safety_score=Count(80), experience=Count(3))
+        self.assertEqual(skeleton.evaluate_worker(**row).as_dict(),
+                         dict(zip(skeleton.ROLES, (skeleton.ELIGIBLE if ok else skeleton.NOT_ELIGIBLE
+                                                   for ok in scalar_roles(row)))))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+
+import skeleton
+from eligibility import stream
+
+try:
+    import numpy as np
+    from eligibility import batch
+    from eligibility.roster import WorkerRoster
+except ImportError:
+    np = None
+
+from test.test_batch import random_rows, scalar_roles
+
+
+def as_worker(row):
+    return tuple(row[name] for name in stream.FIELDS)
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestWorkerRoster(unittest.TestCase):
+    def setUp(self):
+        self.rows = random_rows(1500, seed=21)
+        self.roster = WorkerRoster.from_workers(as_worker(row) for row in self.rows)
+
+    def test_rows_round_trip(self):
+        self.assertEqual(len(self.roster), len(self.rows))
+        for view, row in zip(self.roster, self.rows):
+            self.assertEqual(view.as_dict(), row)
+        self.assertEqual(self.roster[-1].as_tuple(), as_worker(self.rows[-1]))
+        with self.assertRaises(IndexError):
+            self.roster[len(self.rows)]
+
+    def test_compact_storage(self):
+        self.assertLess(self.roster.nbytes / len(self.roster), 12)
+
+    def test_evaluate_matches_scalar_chain(self):
+        results = self.roster.evaluate()
+        for i, row in enumerate(self.rows):
+            self.assertEqual(tuple(bool(results[role][i]) for role in skeleton.ROLES), scalar_roles(row))
+        masks = self.roster.role_masks()
+        for role, flag in skeleton.ROLE_FLAGS.items():
+            self.assertTrue(np.array_equal((masks & int(flag)) != 0, results[role]), role)
+        self.assertEqual(self.roster[5].evaluate(), skeleton.evaluate_worker(**self.rows[5]))
+
+    def test_extend_columns_matches_append(self):
+        columns = {name: np.array([row[name] for row in self.rows]) for name in batch.COLUMNS}
+        roster = WorkerRoster.from_columns(columns)
+        self.assertTrue(np.array_equal(roster.records, self.roster.records))
+        for name in batch.COLUMNS:
+            self.assertTrue(np.array_equal(roster.column(name), columns[name]), name)
+            self.assertTrue(np.array_equal(roster.columns()[name], columns[name]), name)
+
+    def test_filter_by_role_mask(self):
+        wanted = skeleton.Role.TRAINER | skeleton.Role.NIGHT_SHIFT
+        both = self.roster.filter(wanted)
+        expected = [row for row in self.rows if scalar_roles(row)[4] and scalar_roles(row)[3]]
+        self.assertEqual([view.as_dict() for view in both], expected)
+        either = self.roster.filter(("trainer", "night_shift"), any_of=True)
+        self.assertEqual(len(either), sum(1 for row in self.rows if scalar_roles(row)[4] or scalar_roles(row)[3]))
+
+    def test_slices_are_independent(self):
+        head = self.roster[:10]
+        self.assertEqual(len(head), 10)
+        head.append(*as_worker(self.rows[0]))
+        self.assertEqual(len(head), 11)
+        self.assertEqual(self.roster[10].as_dict(), self.rows[10])
+        self.assertEqual([v.as_dict() for v in self.roster[::500]], self.rows[::500])
+
+    def test_append_rejects_invalid_and_oversized(self):
+        worker = list(as_worker(self.rows[0]))
+        worker[1] = 101
+        with self.assertRaises(ValueError):
+            self.roster.append(*worker)
+        worker[1], worker[2] = 80, 300
+        with self.assertRaises(ValueError):
+            self.roster.append(*worker)
+        self.assertEqual(len(self.roster), len(self.rows))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import unittest
+import copy
+import json
+
+import skeleton
+from eligibility import rules
+from test.test_batch import random_rows
+
+try:
+    import numpy as np
+    from eligibility import batch
+except ImportError:
+    np = None
+
+CHECKS = ("check_basic_eligibility", "check_machine_operator", "check_safety_supervisor",
+          "check_night_shift", "check_trainer")
+
+
+def outcome(func, *args):
+    try:
+        return func(*args)
+    except ValueError:
+        return ValueError
+
+
+class TestRuleDsl(unittest.TestCase):
+    def setUp(self):
+        self.ruleset = rules.load_rules()
+        with open(rules.DEFAULT_RULES) as f:
+            self.spec = json.load(f)
+
+    def test_default_rules_reproduce_skeleton(self):
+        statuses = (skeleton.ELIGIBLE, skeleton.NOT_ELIGIBLE, "eligible", True)
+        for row in random_rows(400, seed=71) + [dict(random_rows(1)[0], safety_score=101, incidents=-1)]:
+            args = {
+                "check_basic_eligibility": (row["safety_training"], row["safety_score"], row["experience"], row["incidents"]),
+                "check_machine_operator": (row["certification"], row["training_score"]),
+                "check_safety_supervisor": (row["first_aid"], row["attendance"]),
+                "check_night_shift": (row["night_approved"], row["team_leader"], row["experience"]),
+                "check_trainer": (row["incidents"], row["team_leader"]),
+            }
+            for name in CHECKS:
+                prefixes = [()] if name == "check_basic_eligibility" else [(s,) for s in statuses]
+                for prefix in prefixes:
+                    self.assertEqual(outcome(getattr(skeleton, name), *prefix, *args[name]),
+                                     outcome(getattr(self.ruleset, name), *prefix, *args[name]), (name, row))
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_kernels_match_batch(self):
+        rows = random_rows(2000, seed=72)
+        cols = {name: np.array([row[name] for row in rows]) for name in batch.COLUMNS}
+        expected = batch.evaluate_columns(cols)
+        actual = self.ruleset.evaluate_columns(cols)
+        for role in skeleton.ROLES:
+            self.assertTrue(np.array_equal(expected[role], actual[role]), role)
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_kernels_use_the_rule_file_fields(self):
+        spec = copy.deepcopy(self.spec)
+        spec["fields"]["attendance"]["max"] = 200
+        spec["fields"]["shift_hours"] = {"type": "count", "max": 24}
+        supervisor = spec["roles"][2]
+        supervisor["inputs"].append("shift_hours")
+        supervisor["when"]["all"].append({"le": ["shift_hours", 12]})
+        ruleset = rules.compile_rules(spec)
+        rows = random_rows(500, seed=73)
+        cols = {name: np.array([row[name] for row in rows]) for name in batch.COLUMNS}
+        cols["attendance"] = cols["attendance"] * 2
+        cols["shift_hours"] = np.arange(500) % 25
+        masks = ruleset.evaluate_columns(cols)
+        for i, row in enumerate(rows):
+            basic = ruleset.check_basic_eligibility(row["safety_training"], row["safety_score"],
+                                                    row["experience"], row["incidents"])
+            machine = ruleset.check_machine_operator(basic, row["certification"], row["training_score"])
+            expected = ruleset.check_safety_supervisor(machine, row["first_aid"], int(cols["attendance"][i]),
+                                                       int(cols["shift_hours"][i]))
+            self.assertEqual(bool(masks["safety_supervisor"][i]), expected == skeleton.ELIGIBLE, i)
+        with self.assertRaisesRegex(ValueError, "shift_hours out of range"):
+            ruleset.evaluate_columns(dict(cols, shift_hours=cols["shift_hours"] + 1))
+        with self.assertRaisesRegex(ValueError, "missing columns: shift_hours"):
+            ruleset.evaluate_columns({name: cols[name] for name in batch.COLUMNS})
+
+    def test_constants_are_live(self):
+        original = skeleton.MIN_TRAINING_SCORE
+        try:
+            skeleton.MIN_TRAINING_SCORE = 95
+            self.assertEqual(self.ruleset.check_machine_operator(skeleton.ELIGIBLE, True, 90), skeleton.NOT_ELIGIBLE)
+        finally:
+            skeleton.MIN_TRAINING_SCORE = original
+
+    def test_custom_policy(self):
+        spec = copy.deepcopy(self.spec)
+        spec["roles"][4]["when"] = {"all": [{"eq": ["incidents", 0]}, "team_leader"]}
+        strict = rules.compile_rules(spec)
+        self.assertEqual(strict.check_trainer(skeleton.ELIGIBLE, 0, False), skeleton.NOT_ELIGIBLE)
+        self.assertEqual(strict.check_trainer(skeleton.ELIGIBLE, 0, True), skeleton.ELIGIBLE)
+
+    def test_malformed_rules(self):
+        bad_constant = copy.deepcopy(self.spec)
+        bad_constant["roles"][0]["when"] = {"ge": ["safety_score", "MIN_BOGUS"]}
+        cycle = copy.deepcopy(self.spec)
+        cycle["roles"][0]["requires"] = {"role": "trainer", "as": "trainer_eligible"}
+        injection = copy.deepcopy(self.spec)
+        injection["roles"][0]["inputs"] = ["__import__('os')"]
+        not_int = copy.deepcopy(self.spec)
+        not_int["roles"][0]["when"] = {"ge": ["safety_score", "ROLES"]}
+        no_as = copy.deepcopy(self.spec)
+        del no_as["roles"][1]["requires"]["as"]
+        role_list = copy.deepcopy(self.spec)
+        role_list["roles"][2] = ["safety_supervisor"]
+        field_str = copy.deepcopy(self.spec)
+        field_str["fields"]["attendance"] = "count"
+        malformed = (bad_constant, cycle, injection, not_int, no_as, role_list, field_str,
+                     dict(self.spec, version=2), [self.spec])
+        for spec in malformed:
+            with self.assertRaises(rules.RuleError):
+                rules.compile_rules(spec)
+
+
+if __name__ == '__main__':
+    unittest.main()
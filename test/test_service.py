@@ -0,0 +1,117 @@
+import unittest
+import asyncio
+import http.client
+import json
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import skeleton
+from eligibility import service
+from eligibility.service import EligibilityService
+from test.test_batch import scalar_roles, random_rows
+
+
+def expected_verdicts(row):
+    return {role: skeleton.ELIGIBLE if ok else skeleton.NOT_ELIGIBLE
+            for role, ok in zip(skeleton.ROLES, scalar_roles(row))}
+
+
+class TestEligibilityService(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.loop = asyncio.new_event_loop()
+        cls.thread = threading.Thread(target=cls.loop.run_forever, daemon=True)
+        cls.thread.start()
+        cls.service = asyncio.run_coroutine_threadsafe(
+            EligibilityService(port=0, max_delay=0.005).start(), cls.loop).result()
+
+    @classmethod
+    def tearDownClass(cls):
+        asyncio.run_coroutine_threadsafe(cls.service.stop(), cls.loop).result()
+        cls.loop.call_soon_threadsafe(cls.loop.stop)
+        cls.thread.join()
+
+    def request(self, method, path, payload=None, conn=None):
+        conn = conn or http.client.HTTPConnection("127.0.0.1", self.service.port, timeout=5)
+        body = None if payload is None else json.dumps(payload)
+        conn.request(method, path, body, {"Content-Type": "application/json"})
+        response = conn.getresponse()
+        return response.status, json.loads(response.read())
+
+    def test_health(self):
+        self.assertEqual(self.request("GET", "/health"), (200, {"status": "ok"}))
+
+    def test_metrics_endpoint(self):
+        status, body = self.request("GET", "/metrics")
+        self.assertEqual(status, 200)
+        self.assertIn("check_trainer", body["functions"])
+
+    def test_single_requests_are_coalesced(self):
+        rows = random_rows(64, seed=51)
+
+        def call(row):
+            return self.request("POST", "/evaluate", row)
+
+        batches_before = self.service.batcher.batches
+        with ThreadPoolExecutor(16) as pool:
+            results = list(pool.map(call, rows))
+        for row, (status, body) in zip(rows, results):
+            self.assertEqual(status, 200)
+            self.assertEqual(body, expected_verdicts(row))
+        self.assertLess(self.service.batcher.batches - batches_before, len(rows))
+
+    def test_bulk_keeps_order_and_ids(self):
+        rows = [dict(row, worker_id=f"W{i}") for i, row in enumerate(random_rows(100, seed=52))]
+        conn = http.client.HTTPConnection("127.0.0.1", self.service.port, timeout=5)
+        status, body = self.request("POST", "/evaluate/bulk", {"workers": rows}, conn)
+        self.assertEqual(status, 200)
+        for row, result in zip(rows, body):
+            self.assertEqual(result, dict(expected_verdicts(row), worker_id=row["worker_id"]))
+        # Same keep-alive connection serves a second request
+        self.assertEqual(self.request("POST", "/evaluate/bulk", rows[:1], conn)[0], 200)
+
+    def test_bad_requests(self):
+        row = dict(random_rows(1)[0], attendance=150)
+        self.assertEqual(self.request("POST", "/evaluate", row)[0], 400)
+        self.assertEqual(self.request("POST", "/evaluate/bulk", {"workers": 3})[0], 400)
+        self.assertEqual(self.request("GET", "/evaluate")[0], 405)
+        self.assertEqual(self.request("GET", "/nope")[0], 404)
+
+    def raw_status(self, head):
+        with socket.create_connection(("127.0.0.1", self.service.port), timeout=5) as sock:
+            sock.sendall(head)
+            return sock.makefile("rb").readline().split()[1]
+
+    def test_malformed_and_oversized_bodies(self):
+        self.assertEqual(self.raw_status(b"POST /evaluate HTTP/1.1\r\nContent-Length: ten\r\n\r\n"), b"400")
+        length = service.MAX_BODY + 1
+        self.assertEqual(self.raw_status(f"POST /evaluate HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode()),
+                         b"413")
+
+    def test_bad_framing_gets_an_answer(self):
+        self.assertEqual(self.raw_status(b"GARBAGE\r\n\r\n"), b"400")
+        self.assertEqual(self.raw_status(b"GET /health HTTP/1.1\r\nno colon here\r\n\r\n"), b"400")
+        self.assertEqual(self.raw_status(b"GET /" + b"a" * 70_000 + b" HTTP/1.1\r\n\r\n"), b"400")
+        self.assertEqual(self.raw_status(b"GET /health HTTP/1.1\r\nX-Big: " + b"a" * 70_000 + b"\r\n\r\n"),
+                         b"431")
+        many = b"".join(b"X-%d: 1\r\n" % i for i in range(service.MAX_HEADERS + 1))
+        self.assertEqual(self.raw_status(b"GET /health HTTP/1.1\r\n" + many + b"\r\n"), b"431")
+
+    def test_huge_counts_do_not_fail_the_batch(self):
+        rows = random_rows(8, seed=53)
+        rows[0] = dict(rows[0], experience=2 ** 64, incidents=2 ** 70)
+
+        def call(row):
+            return self.request("POST", "/evaluate", row)
+
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(call, rows))
+        for row, (status, body) in zip(rows, results):
+            self.assertEqual((status, body), (200, expected_verdicts(row)))
+        status, body = self.request("POST", "/evaluate/bulk", rows)
+        self.assertEqual((status, body), (200, [expected_verdicts(row) for row in rows]))
+
+
+if __name__ == '__main__':
+    unittest.main()
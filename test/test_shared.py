@@ -0,0 +1,99 @@
+import unittest
+import multiprocessing
+import subprocess
+import sys
+
+import skeleton
+
+try:
+    import numpy as np
+    from eligibility import batch, bench, tables
+    from eligibility.shared import VerdictPublisher, VerdictReader
+    from test.test_stream import ROOT
+except ImportError:
+    np = None
+
+
+def consume(name, results):
+    """Consumer process: wait for two generations and report what it saw"""
+    with VerdictReader(name) as reader:
+        first = reader.wait(after=0, timeout=10, copy=True)
+        results.put((first.generation, first.thresholds, int(first.masks.sum()), len(first.workers("trainer"))))
+        second = reader.wait(after=first.generation, timeout=10, copy=True)
+        results.put((second.generation, second.thresholds, int(second.masks.sum()), len(second.workers("trainer"))))
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestSharedVerdicts(unittest.TestCase):
+    def setUp(self):
+        self.columns = bench.generate_roster(5000, seed=4)
+        self.publisher = VerdictPublisher(capacity=5000)
+        self.addCleanup(self.publisher.close)
+
+    def test_zero_copy_snapshot_tracks_generations(self):
+        with VerdictReader(self.publisher.name) as reader:
+            self.assertEqual(reader.generation, 0)
+            with self.assertRaises(TimeoutError):
+                reader.wait(after=0, timeout=0.01)
+            self.assertEqual(self.publisher.publish_columns(self.columns), 1)
+            snapshot = reader.wait(after=0, timeout=1)
+            expected = batch.evaluate_columns(self.columns)
+            for role in skeleton.ROLES:
+                self.assertTrue(np.array_equal(snapshot.mask(role), expected[role]), role)
+            self.assertEqual(snapshot.thresholds, skeleton.current_thresholds())
+            self.assertTrue(reader.is_current(snapshot))
+
+            self.publisher.publish(np.zeros(5000, dtype=np.uint8))
+            self.assertFalse(reader.is_current(snapshot))
+            self.assertEqual(int(snapshot.masks.sum()), 0)  # the view sees the new generation
+            self.assertEqual(reader.read().generation, 2)
+
+    def test_close_with_live_snapshot(self):
+        self.publisher.publish_columns(self.columns)
+        reader = VerdictReader(self.publisher.name)
+        snapshot = reader.read()
+        reader.close()
+        reader.close()
+        self.assertEqual(int(snapshot.masks.sum()), int(tables.evaluate_role_masks(self.columns).sum()))
+        del snapshot
+        # A snapshot still alive at interpreter exit must not produce noise either
+        script = ("from eligibility.shared import VerdictReader\n"
+                  f"reader = VerdictReader({self.publisher.name!r})\n"
+                  "snapshot = reader.read()\n"
+                  "reader.close()\n")
+        result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, timeout=60)
+        self.assertEqual((result.returncode, result.stderr), (0, ""))
+
+    def test_rejects_oversized_publish(self):
+        with self.assertRaises(ValueError):
+            self.publisher.publish(np.zeros(5001, dtype=np.uint8))
+
+    def test_consumer_process_sees_new_generation(self):
+        results = multiprocessing.Queue()
+        consumer = multiprocessing.Process(target=consume, args=(self.publisher.name, results))
+        consumer.start()
+        masks = tables.evaluate_role_masks(self.columns)
+        self.publisher.publish(masks)
+        first = results.get(timeout=10)
+        original = skeleton.MIN_ATTENDANCE
+        try:
+            skeleton.MIN_ATTENDANCE = 95
+            stricter = tables.evaluate_role_masks(self.columns)
+            self.publisher.publish(stricter)
+        finally:
+            skeleton.MIN_ATTENDANCE = original
+        second = results.get(timeout=10)
+        consumer.join(10)
+        trainer = int(skeleton.ROLE_FLAGS["trainer"])
+        self.assertEqual(first, (1, skeleton.current_thresholds(), int(masks.sum()),
+                                 int(np.count_nonzero(masks & trainer))))
+        self.assertEqual(second[0], 2)
+        self.assertEqual(second[1][4], 95)
+        self.assertEqual(second[2], int(stricter.sum()))
+        # Still attachable after the consumer exited
+        with VerdictReader(self.publisher.name) as reader:
+            self.assertEqual(reader.generation, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import os
+import subprocess
+import sys
+import tempfile
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from test.test_stream import ROOT
+
+# Cumulative import time budgets in milliseconds (bytecode cached, best of
+# RUNS); override on slow CI machines with the environment variables
+SKELETON_BUDGET_MS = float(os.environ.get("ELIGIBILITY_IMPORT_BUDGET_MS", 5))
+CLI_BUDGET_MS = float(os.environ.get("ELIGIBILITY_CLI_BUDGET_MS", 30))
+RUNS = 5
+
+
+def import_profile(module, cache_dir):
+    """Import module in a fresh interpreter; return {module name: cumulative microseconds}"""
+    env = dict(os.environ, PYTHONPYCACHEPREFIX=cache_dir)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    profile = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def new_modules(module):
+    """Modules a fresh interpreter loads while importing module"""
+    code = (f"import sys; before = set(sys.modules); import {module}; "
+            f"print(' '.join(sorted(set(sys.modules) - before)))")
+    proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return set(proc.stdout.split())
+
+
+class TestStartup(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def best_import_ms(self, module):
+        import_profile(module, self.tmp.name)  # warm the bytecode cache
+        return min(import_profile(module, self.tmp.name)[module] for _ in range(RUNS)) / 1000
+
+    def test_skeleton_imports_stdlib_only(self):
+        imported = {name.split(".")[0] for name in new_modules("skeleton")} - {"skeleton"}
+        self.assertEqual(imported - set(sys.stdlib_module_names), set())
+
+    def test_cli_defers_numpy(self):
+        imported = new_modules("eligibility.cli")
+        self.assertNotIn("numpy", imported)
+        self.assertNotIn("eligibility.batch", imported)
+
+    def test_skeleton_import_time(self):
+        self.assertLess(self.best_import_ms("skeleton"), SKELETON_BUDGET_MS)
+
+    def test_cli_import_time(self):
+        self.assertLess(self.best_import_ms("eligibility.cli"), CLI_BUDGET_MS)
+
+    def test_lazy_attributes(self):
+        import skeleton
+        from eligibility import results
+        self.assertIs(skeleton.evaluate_worker, results.evaluate_worker)
+        self.assertIs(skeleton.Role, results.Role)
+        self.assertIn("EligibilityResult", dir(skeleton))
+        with self.assertRaises(AttributeError):
+            skeleton.not_a_name
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_lazy_numpy_attributes(self):
+        import skeleton
+        from eligibility import batch
+        self.assertIs(skeleton.evaluate_batch, batch.evaluate_batch)
+
+
+if __name__ == '__main__':
+    unittest.main()
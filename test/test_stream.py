@@ -0,0 +1,71 @@
+import unittest
+import io
+import csv
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import skeleton
+from eligibility import stream
+from test.test_batch import scalar_roles, random_rows
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def rows_to_csv(rows):
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(stream.FIELDS)
+    for row in rows:
+        writer.writerow(["yes" if row[f] is True else "no" if row[f] is False else row[f]
+                         for f in stream.FIELDS])
+    return buf.getvalue()
+
+
+def expected_verdicts(row):
+    return tuple(skeleton.ELIGIBLE if ok else skeleton.NOT_ELIGIBLE for ok in scalar_roles(row))
+
+
+class TestStreamingEvaluator(unittest.TestCase):
+    def setUp(self):
+        self.rows = random_rows(500, seed=3)
+
+    def test_csv_round_trip(self):
+        out = io.StringIO()
+        stats = stream.stream_roster(io.StringIO(rows_to_csv(self.rows)), out, chunk_size=64)
+        self.assertEqual(stats.rows, len(self.rows))
+        self.assertEqual(stats.errors, 0)
+        result = list(csv.reader(io.StringIO(out.getvalue())))
+        self.assertEqual(tuple(result[0]), stream.OUTPUT_FIELDS)
+        for number, (row, line) in enumerate(zip(self.rows, result[1:]), 1):
+            self.assertEqual(line[0], str(number))
+            self.assertEqual(tuple(line[1:]), expected_verdicts(row))
+
+    def test_jsonl_with_parse_errors(self):
+        lines = [json.dumps(dict(row, worker_id=f"W{i}")) for i, row in enumerate(self.rows[:20])]
+        lines.insert(3, "{not json")
+        lines.insert(7, json.dumps(dict(self.rows[0], safety_score=150)))
+        lines.insert(9, json.dumps({"safety_training": True}))
+        out = io.StringIO()
+        stats = stream.stream_roster(io.StringIO("\n".join(lines)), out, "jsonl", "jsonl", chunk_size=4)
+        self.assertEqual((stats.rows, stats.errors), (20, 3))
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(records[5]["worker_id"], "W5")
+        self.assertEqual(tuple(records[5][r] for r in skeleton.ROLES), expected_verdicts(self.rows[5]))
+
+    def test_command_line_batch(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "roster.csv")
+            with open(path, "w") as f:
+                f.write(rows_to_csv(self.rows[:50]))
+            proc = subprocess.run([sys.executable, "skeleton.py", "--batch", path],
+                                  cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(len(proc.stdout.splitlines()), 51)
+        self.assertIn("rows/sec", proc.stderr)
+        self.assertIn("0 parse errors", proc.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
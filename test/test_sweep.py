@@ -0,0 +1,51 @@
+import unittest
+
+import skeleton
+
+try:
+    import numpy as np
+    from eligibility import batch, sweep
+except ImportError:
+    np = None
+
+from test.test_batch import random_rows
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestThresholdSweep(unittest.TestCase):
+    def setUp(self):
+        rows = random_rows(1500, seed=31)
+        self.columns = {name: np.array([row[name] for row in rows]) for name in batch.COLUMNS}
+        self.grid = {
+            "MIN_EXPERIENCE": [1, 2, 4],
+            "MIN_SAFETY_SCORE": [70, 75, 90],
+            "MAX_INCIDENTS": [3, 0, 1],
+            "MIN_TRAINING_SCORE": [80, 85],
+            "MIN_ATTENDANCE": [85, 90, 95],
+        }
+
+    def test_every_grid_point_matches_batch(self):
+        result = sweep.sweep(self.columns, **self.grid)
+        originals = {name: getattr(skeleton, name) for name in sweep.AXES}
+        try:
+            for point, counts in result.rows():
+                for name, value in point.items():
+                    setattr(skeleton, name, value)
+                masks = batch.evaluate_columns(self.columns)
+                self.assertEqual({role: int(mask.sum()) for role, mask in masks.items()}, counts, point)
+        finally:
+            for name, value in originals.items():
+                setattr(skeleton, name, value)
+
+    def test_defaults_to_current_constants(self):
+        result = sweep.sweep(self.columns, MIN_ATTENDANCE=range(80, 101))
+        masks = batch.evaluate_columns(self.columns)
+        current = result.at()
+        self.assertEqual(current["safety_supervisor"], int(masks["safety_supervisor"].sum()))
+        self.assertGreaterEqual(result.at(MIN_ATTENDANCE=85)["safety_supervisor"], current["safety_supervisor"])
+        with self.assertRaises(KeyError):
+            result.at(MIN_EXPERIENCE=7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+
+import skeleton
+from eligibility import tables
+from test.test_batch import scalar_roles, random_rows
+
+try:
+    import numpy as np
+    from eligibility import batch
+except ImportError:
+    np = None
+
+
+def mask_to_roles(mask):
+    return tuple(bool(mask & tables.ROLE_BIT[role]) for role in skeleton.ROLES)
+
+
+class TestTruthTables(unittest.TestCase):
+    def setUp(self):
+        self.rows = random_rows(2000, seed=11)
+
+    def test_table_sizes(self):
+        self.assertEqual(len(tables.ROLE_TABLE), 2048)
+
+    def test_scalar_lookup_matches_reference(self):
+        for row in self.rows:
+            self.assertEqual(scalar_roles(row), mask_to_roles(tables.evaluate_worker(**row)), row)
+
+    def test_rebuilds_when_constants_change(self):
+        before = tables.get_tables()
+        original = skeleton.MAX_INCIDENTS
+        try:
+            skeleton.MAX_INCIDENTS = 1
+            self.assertIsNot(before, tables.get_tables())
+            for row in self.rows:
+                self.assertEqual(scalar_roles(row), mask_to_roles(tables.evaluate_worker(**row)), row)
+        finally:
+            skeleton.MAX_INCIDENTS = original
+
+    def test_invalid_input_raises(self):
+        row = dict(self.rows[0], attendance=101)
+        with self.assertRaises(ValueError):
+            tables.evaluate_worker(**row)
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_columns_match_batch(self):
+        cols = {name: np.array([row[name] for row in self.rows]) for name in batch.COLUMNS}
+        expected = batch.evaluate_columns(cols)
+        actual = tables.evaluate_columns(cols)
+        for role in skeleton.ROLES:
+            self.assertTrue(np.array_equal(expected[role], actual[role]), role)
+
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_explain_reasons_match_scalar(self):
+        cols = {name: np.array([row[name] for row in self.rows]) for name in batch.COLUMNS}
+        roles, failed = tables.explain_columns(cols)
+        self.assertEqual(failed.dtype, np.uint16)
+        verdicts = batch.evaluate_columns(cols)
+        for role in skeleton.ROLES:
+            self.assertTrue(np.array_equal(roles[role], verdicts[role]), role)
+            reasons = tables.role_reasons(failed, role)
+            # A role is granted exactly when no requirement failed
+            self.assertTrue(np.array_equal(reasons == 0, roles[role]), role)
+            for i in range(0, len(self.rows), 97):
+                expected = skeleton.evaluate_worker(**self.rows[i]).failed(role)
+                self.assertEqual(int(reasons[i]), int(expected))
+        counts = tables.reason_counts(failed, "safety_supervisor")
+        self.assertEqual(counts["has_good_attendance"],
+                         sum(row["attendance"] < skeleton.MIN_ATTENDANCE for row in self.rows))
+        histogram = tables.reason_histogram(failed, "trainer")
+        self.assertEqual(sum(histogram.values()), int(np.count_nonzero(tables.role_reasons(failed, "trainer"))))
+        self.assertEqual(tables.describe(tables.BIT["has_safe_record"]), ["has_safe_record"])
+
+
+if __name__ == '__main__':
+    unittest.main()
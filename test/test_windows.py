@@ -0,0 +1,117 @@
+import unittest
+import random
+
+import skeleton
+from eligibility import windows
+from test.test_batch import scalar_roles, random_rows
+
+DAY = windows.DAY
+
+
+def window_aggregates(events, now, attendance_window, incident_window):
+    """Recompute a worker's aggregates from its raw (kind, timestamp, attended) events"""
+    scheduled = attended = incidents = 0
+    for kind, timestamp, present in events:
+        age = now - timestamp // DAY
+        if kind == "shift" and 0 <= age < attendance_window:
+            scheduled += 1
+            attended += present
+        elif kind == "incident" and 0 <= age < incident_window:
+            incidents += 1
+    attendance = attended * 100 // scheduled if scheduled else windows.NO_SHIFTS_ATTENDANCE
+    return {"attendance": attendance, "incidents": incidents}
+
+
+class TestWindowAggregator(unittest.TestCase):
+    def setUp(self):
+        self.rows = random_rows(40, seed=31)
+        self.aggregator = windows.WindowAggregator(attendance_window=7, incident_window=20)
+        for i, row in enumerate(self.rows):
+            self.aggregator.add_worker(i, **windows.static_fields(row))
+
+    def roles(self, i, events, now):
+        row = dict(self.rows[i], **window_aggregates(events, now, 7, 20))
+        return dict(zip(skeleton.ROLES, scalar_roles(row)))
+
+    def test_windows_match_recomputation_and_emit_only_flips(self):
+        rng = random.Random(7)
+        history = {i: [] for i in range(len(self.rows))}
+        state = {i: self.roles(i, [], 0) for i in history}
+        timestamp = 0
+        for _ in range(3000):
+            timestamp += rng.randrange(0, DAY // 4)
+            i = rng.randrange(len(self.rows))
+            if rng.random() < 0.8:
+                event = ("shift", i, timestamp, rng.random() < 0.9)
+                history[i].append(("shift", timestamp, event[3]))
+            else:
+                event = ("incident", i, timestamp)
+                history[i].append(("incident", timestamp, False))
+            for worker_id, role, eligible in self.aggregator.process([event]):
+                self.assertNotEqual(state[worker_id][role], eligible)
+                state[worker_id][role] = eligible
+            now = timestamp // DAY
+            for j in history:
+                self.assertEqual(state[j], self.roles(j, history[j], now))
+            self.assertEqual(self.aggregator.aggregates(i), window_aggregates(history[i], now, 7, 20))
+
+    def test_clock_advance_expires_old_events(self):
+        row = dict(self.rows[0], safety_training=True, safety_score=90, experience=6, incidents=0,
+                   certification=True, training_score=90, first_aid=True, attendance=100,
+                   night_approved=True, team_leader=False)
+        self.aggregator.add_worker("lead", **windows.static_fields(row))
+        shift = self.aggregator.record_shift
+        self.assertEqual(shift("lead", 0, True), [("lead", "safety_supervisor", True), ("lead", "trainer", True)])
+        self.assertEqual(self.aggregator.record_incident("lead", DAY), [("lead", "trainer", False)])
+        self.assertEqual(self.aggregator.advance(8 * DAY), [("lead", "safety_supervisor", False)])
+        self.assertEqual(self.aggregator.aggregates("lead"), {"attendance": 0, "incidents": 1})
+        # The incident has left its 20-day window by day 21
+        self.assertEqual(shift("lead", 21 * DAY, True), [("lead", "safety_supervisor", True), ("lead", "trainer", True)])
+
+    def test_advance_only_visits_expiring_workers(self):
+        for i in range(len(self.rows)):
+            self.aggregator.record_shift(i, (i % 5) * DAY, True)
+        self.aggregator.record_incident(0, 0)
+        touched = []
+        update = self.aggregator.engine.update
+        self.aggregator.engine.update = lambda worker_id, **changes: touched.append(worker_id) or update(
+            worker_id, **changes)
+        self.aggregator.advance(6 * DAY)
+        self.assertEqual(touched, [])
+        # Shifts from buckets 0 and 1 leave the 7-bucket window by bucket 8
+        self.aggregator.advance(8 * DAY)
+        self.assertEqual(sorted(touched), [i for i in range(len(self.rows)) if i % 5 < 2])
+        touched.clear()
+        self.aggregator.advance(8 * DAY + 1)
+        self.assertEqual(touched, [])
+        self.aggregator.advance(20 * DAY)
+        self.assertIn(0, touched)
+        self.assertEqual(self.aggregator.aggregates(0), {"attendance": 0, "incidents": 0})
+
+    def test_late_and_unknown_events_are_counted(self):
+        self.aggregator.advance(30 * DAY)
+        self.assertEqual(self.aggregator.record_shift(0, 20 * DAY, True), [])
+        self.assertEqual(self.aggregator.record_incident("nobody", 30 * DAY), [])
+        self.assertEqual((self.aggregator.late, self.aggregator.unknown), (1, 1))
+        self.assertEqual(self.aggregator.aggregates(0)["attendance"], windows.NO_SHIFTS_ATTENDANCE)
+
+    def test_aggregated_fields_are_rejected(self):
+        with self.assertRaises(ValueError):
+            self.aggregator.add_worker("x", **self.rows[0])
+        with self.assertRaises(ValueError):
+            windows.WindowAggregator(attendance_window=0)
+
+    def test_threshold_change_is_applied(self):
+        self.aggregator.record_shift(0, 0, True)
+        original = skeleton.MIN_ATTENDANCE
+        try:
+            skeleton.MIN_ATTENDANCE = 101
+            flips = list(self.aggregator.process([]))
+        finally:
+            skeleton.MIN_ATTENDANCE = original
+        self.assertTrue(all(role in ("safety_supervisor", "trainer") and not eligible
+                            for _, role, eligible in flips))
+
+
+if __name__ == '__main__':
+    unittest.main()